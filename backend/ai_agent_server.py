@@ -11,13 +11,22 @@ Set GOOGLE_APPLICATION_CREDENTIALS to your service account JSON file path.
 import os
 import json
 import asyncio
-from typing import Dict, Any, List
+import heapq
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from opentelemetry import propagate
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Gauge, Histogram, generate_latest
 from pydantic import BaseModel
 
+from telemetry import Tracing
+
 # Google ADK imports
 try:
     from google import genai
@@ -29,6 +38,103 @@ except ImportError:
 
 app = FastAPI(title="AI Agent Server (ADK)")
 
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "16"))
+
+# Bounds concurrent Gemini calls; callers beyond the limit wait in the queue
+gemini_slots = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+gemini_stats = {"queued": 0, "in_flight": 0, "completed": 0, "failed": 0}
+
+# Only the k best candidates go into the assignment prompt (0 disables filtering)
+ASSIGNMENT_TOP_K = int(os.getenv("ASSIGNMENT_TOP_K", "15"))
+prefilter_stats = {"requests": 0, "prompt_tokens_before": 0, "prompt_tokens_after": 0}
+
+# Tasks packed into one prompt by /assignment/batch
+ASSIGNMENT_BATCH_SIZE = int(os.getenv("ASSIGNMENT_BATCH_SIZE", "10"))
+batch_stats = {"requests": 0, "tasks": 0, "batches": 0, "fallbacks": 0, "prompt_tokens": 0, "prompt_tokens_single": 0}
+
+# Prometheus metrics, served on GET /metrics; own registry so the API can run in the same process
+METRICS_REGISTRY = CollectorRegistry()
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Agent request latency by route and status.",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS, registry=METRICS_REGISTRY,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Agent requests currently being served.", registry=METRICS_REGISTRY
+)
+GEMINI_SECONDS = Histogram(
+    "gemini_call_duration_seconds", "generate_content latency, excluding the wait for a slot.",
+    ["endpoint", "outcome"], buckets=LATENCY_BUCKETS, registry=METRICS_REGISTRY,
+)
+GEMINI_QUEUE_SECONDS = Histogram(
+    "gemini_queue_wait_seconds", "Time spent waiting for one of the GEMINI_MAX_CONCURRENCY slots.",
+    ["endpoint"], buckets=LATENCY_BUCKETS, registry=METRICS_REGISTRY,
+)
+GEMINI_PROMPT_TOKENS = Histogram(
+    "gemini_prompt_tokens", "Estimated prompt size per call.",
+    ["endpoint"], buckets=TOKEN_BUCKETS, registry=METRICS_REGISTRY,
+)
+GEMINI_RESPONSE_TOKENS = Histogram(
+    "gemini_response_tokens", "Estimated response size per call.",
+    ["endpoint"], buckets=TOKEN_BUCKETS, registry=METRICS_REGISTRY,
+)
+Gauge("gemini_calls_in_flight", "Gemini calls holding a slot.", registry=METRICS_REGISTRY).set_function(
+    lambda: gemini_stats["in_flight"]
+)
+Gauge("gemini_calls_queued", "Gemini calls waiting for a slot.", registry=METRICS_REGISTRY).set_function(
+    lambda: gemini_stats["queued"]
+)
+
+# Tracing: same TRACING_* settings and provider setup as the API (telemetry.py); the API's
+# traceparent header joins our spans to its trace
+tracing = Tracing.from_env("ai-agent-server")
+
+
+# Endpoint being served, so Gemini metrics can be labelled without threading it through every call
+current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="unknown")
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = current_endpoint.set(scope["path"])
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        server_span = nullcontext()
+        if tracing.enabled:
+            carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+            server_span = tracing.tracer.start_as_current_span(
+                f"{scope['method']} {scope['path']}", context=propagate.extract(carrier), kind=SpanKind.SERVER
+            )
+        with server_span as current:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                REQUESTS_IN_FLIGHT.dec()
+                current_endpoint.reset(token)
+                route = getattr(scope.get("route"), "path", "unmatched")
+                REQUEST_SECONDS.labels(scope["method"], route, str(status)).observe(time.perf_counter() - start)
+                if current is not None:
+                    current.set_attribute("http.response.status_code", status)
+                    if status >= 500:
+                        current.set_status(Status(StatusCode.ERROR))
+
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -37,6 +143,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestMetricsMiddleware)
 
 # Initialize Google GenAI client via ADK using Application Default Credentials
 client = None
@@ -72,9 +179,17 @@ class AssignmentRequest(BaseModel):
     instructions: str
 
 
+class BatchAssignmentRequest(BaseModel):
+    tasks: List[Dict[str, Any]]
+    team: List[Dict[str, Any]]
+    instructions: str
+    batch_size: Optional[int] = None
+
+
 class SummarizeRequest(BaseModel):
     messages: List[Dict[str, Any]]
     instructions: str
+    previous_summary: Optional[Dict[str, Any]] = None
 
 
 class OverloadRequest(BaseModel):
@@ -92,34 +207,64 @@ class FlowchartRequest(BaseModel):
     instructions: str
 
 
-async def call_gemini_adk(prompt: str, system_instruction: str = None) -> str:
-    """Call Gemini using Google ADK client."""
+async def call_gemini_adk(prompt: str, system_instruction: str = None, max_output_tokens: int = 2048) -> str:
+    """Call Gemini using the ADK client's async API, bounded by GEMINI_MAX_CONCURRENCY."""
     if not client:
         raise HTTPException(
             status_code=503, 
             detail="ADK client not configured. Set GEMINI_API_KEY environment variable."
         )
     
+    gemini_stats["queued"] += 1
+    queued = True
     try:
         # Use ADK's generate_content method
         config = types.GenerateContentConfig(
             temperature=0.7,
-            max_output_tokens=2048,
+            max_output_tokens=max_output_tokens,
         )
         
         if system_instruction:
             config.system_instruction = system_instruction
         
-        response = client.models.generate_content(
-            model="gemini-2.0-flash",
-            contents=prompt,
-            config=config
-        )
+        endpoint = current_endpoint.get()
+        GEMINI_PROMPT_TOKENS.labels(endpoint).observe(estimate_tokens(prompt))
+        waited = time.perf_counter()
+        async with gemini_slots:
+            gemini_stats["queued"] -= 1
+            queued = False
+            gemini_stats["in_flight"] += 1
+            started = time.perf_counter()
+            GEMINI_QUEUE_SECONDS.labels(endpoint).observe(started - waited)
+            outcome = "error"
+            with tracing.span(
+                "gemini.generate_content", model=GEMINI_MODEL, queue_wait_seconds=started - waited,
+                prompt_tokens=estimate_tokens(prompt), max_output_tokens=max_output_tokens,
+            ) as current:
+                try:
+                    response = await client.aio.models.generate_content(
+                        model=GEMINI_MODEL,
+                        contents=prompt,
+                        config=config
+                    )
+                    outcome = "ok"
+                finally:
+                    gemini_stats["in_flight"] -= 1
+                    GEMINI_SECONDS.labels(endpoint, outcome).observe(time.perf_counter() - started)
+                response_tokens = estimate_tokens(response.text or "")
+                if current is not None:
+                    current.set_attribute("response_tokens", response_tokens)
+        GEMINI_RESPONSE_TOKENS.labels(endpoint).observe(response_tokens)
         
+        gemini_stats["completed"] += 1
         return response.text
     except Exception as e:
+        gemini_stats["failed"] += 1
         print(f"ADK Error: {e}")
         raise HTTPException(status_code=500, detail=f"ADK/Gemini error: {str(e)}")
+    finally:
+        if queued:
+            gemini_stats["queued"] -= 1
 
 
 def parse_json_response(text: str) -> Dict[str, Any]:
@@ -138,51 +283,83 @@ def parse_json_response(text: str) -> Dict[str, Any]:
     return {"raw_response": text}
 
 
-@app.post("/assignment")
-async def predict_assignment(request: AssignmentRequest):
-    """Predict task assignment using ADK/Gemini AI."""
-    team_summary = "\n".join([
-        f"- {member.get('name', 'Unknown')} (ID: {member.get('id')}): {', '.join(member.get('skills', []))} "
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt token estimate (~4 characters per token)."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def format_team_summary(team: List[Dict[str, Any]]) -> str:
+    return "\n".join([
+        f"- {member.get('name', 'Unknown')} (ID: {member.get('id')}): {', '.join(member.get('skills') or [])} "
         f"[Capacity: {member.get('capacity_hours', 0)}h, Assigned: {member.get('assigned_hours', 0)}h]"
-        for member in request.team
+        for member in team
     ])
-    
-    system_instruction = """You are an AI task assignment engine for a workspace management system.
+
+
+def select_candidates(task: Dict[str, Any], team: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+    """Narrow the team to the k best candidates by skill overlap, then remaining capacity."""
+    available = [member for member in team if member.get("status") != "on_leave"] or team
+    if k <= 0 or len(available) <= k:
+        return available
+    tags = {tag.lower() for tag in task.get("tags") or []}
+
+    def score(member: Dict[str, Any]):
+        skills = {skill.lower() for skill in member.get("skills") or []}
+        capacity = member.get("capacity_hours") or 40
+        remaining = (capacity - (member.get("assigned_hours") or 0)) / max(capacity, 1)
+        return (len(tags & skills), remaining)
+
+    return heapq.nlargest(k, available, key=score)
+
+
+ASSIGNMENT_SYSTEM_INSTRUCTION = """You are an AI task assignment engine for a workspace management system.
 Always respond with valid JSON only, no markdown formatting or explanation."""
-    
-    prompt = f"""Analyze this task and team to make an optimal assignment:
+
+ASSIGNMENT_FIELDS = "\n".join([
+    '  "predicted_hours": <float>,',
+    '  "best_member_id": "<string>",',
+    '  "priority": <int 1-5>,',
+    '  "deadline": "<YYYY-MM-DD>",',
+    '  "flowchart_next_step": "<Requirements|Design|Development|Testing|Review|Deployment>",',
+    '  "required_meeting": <boolean>,',
+    '  "meeting_suggestion": {"attendees": ["<id>"], "duration": <minutes>, "day": "<YYYY-MM-DD>"} or null,',
+    '  "reason": "<brief explanation>"',
+])
+
+
+def format_task_details(task: Dict[str, Any]) -> str:
+    return f"""- Title: {task.get('title', 'N/A')}
+- Description: {task.get('description', 'N/A')}
+- Complexity: {task.get('complexity', 'medium')}
+- Tags: {', '.join(task.get('tags') or [])}
+- Customer: {task.get('customer_name', 'N/A')}
+- Project: {task.get('project_name', 'N/A')}"""
+
+
+def build_assignment_prompt(task: Dict[str, Any], team_summary: str, instructions: str) -> str:
+    return f"""Analyze this task and team to make an optimal assignment:
 
 Task Details:
-- Title: {request.task.get('title', 'N/A')}
-- Description: {request.task.get('description', 'N/A')}
-- Complexity: {request.task.get('complexity', 'medium')}
-- Tags: {', '.join(request.task.get('tags', []))}
-- Customer: {request.task.get('customer_name', 'N/A')}
-- Project: {request.task.get('project_name', 'N/A')}
+{format_task_details(task)}
 
 Team Members:
 {team_summary}
 
-{request.instructions}
+{instructions}
 
 Return a JSON object with these exact fields:
 {{
-  "predicted_hours": <float>,
-  "best_member_id": "<string>",
-  "priority": <int 1-5>,
-  "deadline": "<YYYY-MM-DD>",
-  "flowchart_next_step": "<Requirements|Design|Development|Testing|Review|Deployment>",
-  "required_meeting": <boolean>,
-  "meeting_suggestion": {{"attendees": ["<id>"], "duration": <minutes>, "day": "<YYYY-MM-DD>"}} or null,
-  "reason": "<brief explanation>"
+{ASSIGNMENT_FIELDS}
 }}"""
 
-    response_text = await call_gemini_adk(prompt, system_instruction)
-    result = parse_json_response(response_text)
-    
-    # Ensure required fields exist with defaults
-    if "best_member_id" not in result and request.team:
-        result["best_member_id"] = request.team[0].get("id")
+
+def fill_assignment_defaults(result: Dict[str, Any], candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Ensure required fields exist with defaults."""
+    if "best_member_id" not in result and candidates:
+        result["best_member_id"] = candidates[0].get("id")
     if "predicted_hours" not in result:
         result["predicted_hours"] = 8.0
     if "priority" not in result:
@@ -193,12 +370,179 @@ Return a JSON object with these exact fields:
         result["flowchart_next_step"] = "Development"
     if "required_meeting" not in result:
         result["required_meeting"] = False
+    if "meeting_suggestion" not in result:
+        result["meeting_suggestion"] = None
     if "reason" not in result:
         result["reason"] = "AI assignment based on team skills and workload"
-    
     return result
 
 
+async def assign_one(task: Dict[str, Any], team: List[Dict[str, Any]], instructions: str) -> Dict[str, Any]:
+    with tracing.span("assignment.build_prompt", team_size=len(team)):
+        candidates = select_candidates(task, team, ASSIGNMENT_TOP_K)
+        team_summary = format_team_summary(candidates)
+        prompt = build_assignment_prompt(task, team_summary, instructions)
+
+    tokens_after = estimate_tokens(prompt)
+    tokens_before = tokens_after - estimate_tokens(team_summary) + estimate_tokens(format_team_summary(team))
+    prefilter_stats["requests"] += 1
+    prefilter_stats["prompt_tokens_before"] += tokens_before
+    prefilter_stats["prompt_tokens_after"] += tokens_after
+
+    response_text = await call_gemini_adk(prompt, ASSIGNMENT_SYSTEM_INSTRUCTION)
+    result = fill_assignment_defaults(parse_json_response(response_text), candidates)
+    result["team_filter"] = {
+        "candidates_before": len(team),
+        "candidates_after": len(candidates),
+        "prompt_tokens_before": tokens_before,
+        "prompt_tokens_after": tokens_after,
+    }
+    return result
+
+
+@app.post("/assignment")
+async def predict_assignment(request: AssignmentRequest):
+    """Predict task assignment using ADK/Gemini AI."""
+    return await assign_one(request.task, request.team, request.instructions)
+
+
+def parse_json_items(text: str) -> List[Dict[str, Any]]:
+    """Extract every complete JSON object from a batched response.
+
+    Accepts a bare array, an object wrapping an ``assignments`` array, or
+    objects scattered through prose; objects cut off by a truncated
+    response are skipped rather than failing the whole batch.
+    """
+    decoder = json.JSONDecoder()
+    items: List[Dict[str, Any]] = []
+    position = 0
+    while True:
+        start = text.find("{", position)
+        if start < 0:
+            return items
+        try:
+            value, position = decoder.raw_decode(text, start)
+        except json.JSONDecodeError:
+            position = start + 1
+            continue
+        if isinstance(value.get("assignments"), list):
+            items.extend(item for item in value["assignments"] if isinstance(item, dict))
+        else:
+            items.append(value)
+
+
+def build_batch_prompt(tasks: List[Dict[str, Any]], team_summary: str, instructions: str) -> str:
+    task_blocks = "\n\n".join(f"[{index}]\n{format_task_details(task)}" for index, task in enumerate(tasks))
+    return f"""Analyze these tasks and the team to make an optimal assignment for each task:
+
+Tasks:
+{task_blocks}
+
+Team Members:
+{team_summary}
+
+{instructions}
+
+Return a JSON array with one object per task, each with these exact fields:
+[
+{{
+  "task_index": <int, the number in brackets before the task>,
+{ASSIGNMENT_FIELDS}
+}}
+]"""
+
+
+def map_batch_results(items: List[Dict[str, Any]], size: int) -> Dict[int, Dict[str, Any]]:
+    """Map parsed objects to task positions; duplicates and malformed items are dropped."""
+    mapped: Dict[int, Dict[str, Any]] = {}
+    for item in items:
+        index = item.pop("task_index", None)
+        if isinstance(index, str) and index.isdigit():
+            index = int(index)
+        if not isinstance(index, int) or not 0 <= index < size or index in mapped:
+            continue
+        if not isinstance(item.get("best_member_id"), str):
+            continue
+        mapped[index] = item
+    return mapped
+
+
+async def assign_batch(
+    tasks: List[Dict[str, Any]], team: List[Dict[str, Any]], instructions: str
+) -> Dict[str, Any]:
+    """One prompt for a chunk of tasks; items the response doesn't cover go through assign_one."""
+    with tracing.span("assignment.build_batch_prompt", tasks=len(tasks), team_size=len(team)):
+        candidates: Dict[Any, Dict[str, Any]] = {}
+        # Characters each task's candidate list would add to a single-task prompt, for the
+        # comparison metric; member lines are formatted once per unique candidate
+        line_chars: Dict[Any, int] = {}
+        single_tokens = 0
+        for task in tasks:
+            task_candidates = select_candidates(task, team, ASSIGNMENT_TOP_K)
+            summary_chars = max(len(task_candidates) - 1, 0)
+            for member in task_candidates:
+                member_id = member.get("id")
+                candidates.setdefault(member_id, member)
+                if member_id not in line_chars:
+                    line_chars[member_id] = len(format_team_summary([member]))
+                summary_chars += line_chars[member_id]
+            single_tokens += max(
+                1, (len(build_assignment_prompt(task, "", instructions)) + summary_chars) // CHARS_PER_TOKEN
+            )
+        shared = list(candidates.values())
+        team_summary = format_team_summary(shared)
+        prompt = build_batch_prompt(tasks, team_summary, instructions)
+        prompt_tokens = estimate_tokens(prompt)
+
+    mapped: Dict[int, Dict[str, Any]] = {}
+    try:
+        response_text = await call_gemini_adk(
+            prompt, ASSIGNMENT_SYSTEM_INSTRUCTION, max_output_tokens=256 + 256 * len(tasks)
+        )
+        mapped = map_batch_results(parse_json_items(response_text), len(tasks))
+    except HTTPException as e:
+        print(f"Batch assignment failed, falling back to single calls: {e.detail}")
+
+    results: List[Dict[str, Any]] = [None] * len(tasks)
+    for index, result in mapped.items():
+        results[index] = {**fill_assignment_defaults(result, shared), "batched": True}
+
+    async def fallback(index: int) -> int:
+        try:
+            result = await assign_one(tasks[index], team, instructions)
+            results[index] = {**result, "batched": False}
+            return result["team_filter"]["prompt_tokens_after"]
+        except HTTPException as e:
+            results[index] = {"error": e.detail, "batched": False}
+            return 0
+
+    missing = [index for index in range(len(tasks)) if results[index] is None]
+    prompt_tokens += sum(await asyncio.gather(*(fallback(index) for index in missing)))
+    return {"results": results, "fallbacks": len(missing), "prompt_tokens": prompt_tokens, "prompt_tokens_single": single_tokens}
+
+
+@app.post("/assignment/batch")
+async def predict_assignment_batch(request: BatchAssignmentRequest):
+    """Predict assignments for many tasks, packing up to ASSIGNMENT_BATCH_SIZE tasks per prompt."""
+    size = max(1, request.batch_size or ASSIGNMENT_BATCH_SIZE)
+    chunks = [request.tasks[start:start + size] for start in range(0, len(request.tasks), size)]
+    outcomes = await asyncio.gather(*(assign_batch(chunk, request.team, request.instructions) for chunk in chunks))
+
+    batch = {
+        "tasks": len(request.tasks),
+        "batches": len(chunks),
+        "batch_size": size,
+        "fallbacks": sum(outcome["fallbacks"] for outcome in outcomes),
+        "prompt_tokens": sum(outcome["prompt_tokens"] for outcome in outcomes),
+        "prompt_tokens_single": sum(outcome["prompt_tokens_single"] for outcome in outcomes),
+    }
+    batch_stats["requests"] += 1
+    for key in ("tasks", "batches", "fallbacks", "prompt_tokens", "prompt_tokens_single"):
+        batch_stats[key] += batch[key]
+    return {"results": [result for outcome in outcomes for result in outcome["results"]], "batch": batch}
+
+
+
 @app.post("/summarize")
 async def summarize_chat(request: SummarizeRequest):
     """Summarize chat messages using ADK/Gemini."""
@@ -209,10 +553,22 @@ async def summarize_chat(request: SummarizeRequest):
     
     system_instruction = "You are a chat summarizer. Always respond with valid JSON only."
     
-    prompt = f"""Summarize this conversation:
+    if request.previous_summary:
+        prompt_head = f"""Update this summary of an ongoing conversation with the new messages below.
+
+Previous summary:
+{json.dumps(request.previous_summary)}
+
+New messages:
+{messages_text}
+"""
+    else:
+        prompt_head = f"""Summarize this conversation:
 
 {messages_text}
+"""
 
+    prompt = f"""{prompt_head}
 {request.instructions}
 
 Return JSON:
@@ -332,6 +688,12 @@ Return JSON:
     return result
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    return Response(generate_latest(METRICS_REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/health")
 async def health():
     """Health check endpoint."""
@@ -340,8 +702,14 @@ async def health():
         "adk_available": ADK_AVAILABLE,
         "client_configured": client is not None,
         "auth_method": AUTH_METHOD,
-        "model": "gemini-2.0-flash",
+        "model": GEMINI_MODEL,
         "framework": "Google ADK",
+        "gemini_max_concurrency": GEMINI_MAX_CONCURRENCY,
+        "gemini": gemini_stats,
+        "assignment_top_k": ASSIGNMENT_TOP_K,
+        "assignment_prefilter": prefilter_stats,
+        "assignment_batch_size": ASSIGNMENT_BATCH_SIZE,
+        "assignment_batch": batch_stats,
         "gcp_project": os.getenv("GCP_PROJECT", "not_set")
     }
 
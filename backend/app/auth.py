@@ -1,11 +1,20 @@
+import asyncio
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from functools import lru_cache
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from fastapi import Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel
 
+from app.config import get_settings
+from app.services.metrics import observe
+
 security = HTTPBearer(auto_error=False)
 
 
@@ -17,6 +26,68 @@ class AuthUser(BaseModel):
     role: Optional[str] = None
 
 
+class TokenCache:
+    """Bounded LRU of decoded ID tokens, keyed by token hash and expiring at the token's ``exp``."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self._key(token)
+        with self._lock:
+            decoded = self._entries.get(key)
+            if decoded is None:
+                self.misses += 1
+                return None
+            if decoded.get("exp", 0) <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return decoded
+
+    def put(self, token: str, decoded: Dict[str, Any]) -> None:
+        if self._max_entries <= 0 or "exp" not in decoded:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = decoded
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+@lru_cache
+def get_token_cache() -> TokenCache:
+    return TokenCache(get_settings().auth_token_cache_size)
+
+
 # Lazy initialization of Firebase Admin
 _firebase_initialized = False
 
@@ -27,7 +98,7 @@ def _init_firebase():
     try:
         import firebase_admin
         from firebase_admin import credentials
-        
+
         if not firebase_admin._apps:
             # Try default credentials (works in Cloud Run)
             firebase_admin.initialize_app()
@@ -39,25 +110,71 @@ def _init_firebase():
         return False
 
 
+def _certificate_fetch():
+    """firebase_admin's cache-control transport for ID token certificates, and the URL it fetches them from.
+
+    These are SDK internals (``Client._token_verifier``), but going through the
+    same transport is what puts the certificates in the HTTP cache that
+    ``verify_id_token`` reads.
+    """
+    import firebase_admin
+    from firebase_admin import auth
+
+    verifier = auth._get_client(firebase_admin.get_app())._token_verifier
+    return verifier.request, verifier.id_token_verifier.cert_url
+
+
+def warm_public_keys() -> bool:
+    """Fetch the Firebase signing certificates into firebase_admin's HTTP cache."""
+    if os.getenv("FIREBASE_AUTH_EMULATOR_HOST"):
+        return True  # emulator tokens are unsigned; there is nothing to fetch
+    if not _init_firebase():
+        return False
+    try:
+        request, cert_url = _certificate_fetch()
+        response = request(cert_url, method="GET")
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status} from {cert_url}")
+        return True
+    except Exception as e:
+        print(f"⚠️ Public key pre-warm failed: {e}")
+        return False
+
+
+async def refresh_public_keys_forever() -> None:
+    """Keep the signing certificates warm so key rotation never lands on a request."""
+    interval = max(get_settings().auth_cert_refresh_seconds, 60)
+    while True:
+        try:
+            await run_in_threadpool(warm_public_keys)
+        except Exception as e:
+            print(f"⚠️ Public key refresh failed: {e}")
+        await asyncio.sleep(interval)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> AuthUser:
     if credentials is None:
         raise HTTPException(status_code=401, detail="Missing authorization token")
-    
-    if not _init_firebase():
-        raise HTTPException(status_code=503, detail="Auth service unavailable")
-    
+
     token = credentials.credentials
-    try:
-        from firebase_admin import auth
-        decoded = auth.verify_id_token(token)
-        return AuthUser(
-            uid=decoded.get("uid"),
-            email=decoded.get("email"),
-            name=decoded.get("name"),
-            picture=decoded.get("picture"),
-            role=decoded.get("role"),
-        )
-    except Exception as exc:
-        raise HTTPException(status_code=401, detail=f"Invalid token: {str(exc)}") from exc
+    cache = get_token_cache()
+    decoded = cache.get(token)
+    if decoded is None:
+        if not _init_firebase():
+            raise HTTPException(status_code=503, detail="Auth service unavailable")
+        try:
+            from firebase_admin import auth
+            with observe("auth", "verify_id_token"):
+                decoded = await run_in_threadpool(auth.verify_id_token, token)
+        except Exception as exc:
+            raise HTTPException(status_code=401, detail=f"Invalid token: {str(exc)}") from exc
+        cache.put(token, decoded)
+    return AuthUser(
+        uid=decoded.get("uid"),
+        email=decoded.get("email"),
+        name=decoded.get("name"),
+        picture=decoded.get("picture"),
+        role=decoded.get("role"),
+    )
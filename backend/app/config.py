@@ -1,6 +1,16 @@
 import os
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, Optional
+
+
+def _parse_float_map(raw: str) -> Dict[str, float]:
+    """Parse "key=value,key=value" into a dict of floats."""
+    result = {}
+    for item in raw.split(","):
+        if "=" in item:
+            key, value = item.split("=", 1)
+            result[key.strip()] = float(value)
+    return result
 
 
 class Settings:
@@ -13,10 +23,84 @@ class Settings:
         self.firestore_collection_messages = os.getenv("FIRESTORE_MESSAGES_COLLECTION", "messages")
         self.firestore_collection_meetings = os.getenv("FIRESTORE_MEETINGS_COLLECTION", "meetings")
         self.firestore_collection_updates = os.getenv("FIRESTORE_UPDATES_COLLECTION", "updates")
+        # Newest activity entries kept on the task document; full history lives in a subcollection
+        self.activity_recent_window = int(os.getenv("ACTIVITY_RECENT_WINDOW", "20"))
+        self.firestore_backend = os.getenv("FIRESTORE_BACKEND", "firestore")
+        # NDJSON fixtures (synthetic_data.py --ndjson) loaded into the memory backend at startup
+        self.firestore_fixtures = os.getenv("FIRESTORE_FIXTURES", "")
         self.gcs_bucket = os.getenv("GCS_BUCKET", "ai-workspace-manager-attachments")
         self.gemini_model = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
         self.ai_timeout_seconds = int(os.getenv("AI_TIMEOUT_SECONDS", "30"))
         self.ai_agent_base_url = os.getenv("AI_AGENT_BASE_URL", "http://localhost:8081")
+        self.ai_max_connections = int(os.getenv("AI_MAX_CONNECTIONS", "100"))
+        self.ai_max_keepalive_connections = int(os.getenv("AI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+        self.ai_keepalive_expiry = float(os.getenv("AI_KEEPALIVE_EXPIRY_SECONDS", "30"))
+        self.ai_http2 = os.getenv("AI_HTTP2", "false").lower() == "true"
+        # Per-endpoint overrides, e.g. "/summarize=10,/flowchart=15"
+        self.ai_endpoint_timeouts = _parse_float_map(os.getenv("AI_ENDPOINT_TIMEOUTS", ""))
+        # Circuit breaker: open after N consecutive failures or SLO breaches, probe again after the cooldown
+        self.ai_breaker_failure_threshold = int(os.getenv("AI_BREAKER_FAILURE_THRESHOLD", "5"))
+        self.ai_breaker_open_seconds = float(os.getenv("AI_BREAKER_OPEN_SECONDS", "30"))
+        self.ai_latency_slo_seconds = float(os.getenv("AI_LATENCY_SLO_SECONDS", "10"))
+        # Per-endpoint SLO overrides, e.g. "/summarize=5,/assignment=8"
+        self.ai_latency_slos = _parse_float_map(os.getenv("AI_LATENCY_SLOS", ""))
+        # Timeouts follow observed p95 * multiplier, never above the configured timeout
+        self.ai_adaptive_timeouts = os.getenv("AI_ADAPTIVE_TIMEOUTS", "true").lower() == "true"
+        self.ai_timeout_p95_multiplier = float(os.getenv("AI_TIMEOUT_P95_MULTIPLIER", "3"))
+        self.ai_timeout_min_seconds = float(os.getenv("AI_TIMEOUT_MIN_SECONDS", "2"))
+        # Idempotent endpoints that may get a second, hedged request, e.g. "/flowchart,/summarize"
+        self.ai_hedge_endpoints = [path.strip() for path in os.getenv("AI_HEDGE_ENDPOINTS", "").split(",") if path.strip()]
+        # 0 hedges at the observed p95
+        self.ai_hedge_delay_ms = float(os.getenv("AI_HEDGE_DELAY_MS", "0"))
+        # Tracing: none, memory, file, console, otlp or module:factory (see telemetry.py)
+        self.tracing_exporter = os.getenv("TRACING_EXPORTER", "none")
+        self.tracing_file = os.getenv("TRACING_FILE", "traces.jsonl")
+        self.tracing_sample_ratio = float(os.getenv("TRACING_SAMPLE_RATIO", "0.1"))
+        self.ai_cache_max_entries = int(os.getenv("AI_CACHE_MAX_ENTRIES", "1024"))
+        # TTL for the idempotent content endpoints (flowchart, meeting, summarize, overload)
+        self.ai_cache_ttl_seconds = float(os.getenv("AI_CACHE_TTL_SECONDS", "300"))
+        # Per-endpoint TTL overrides; 0 disables caching for that endpoint. Assignment
+        # endpoints are uncached unless listed here (e.g. /assignment=60)
+        self.ai_cache_ttls = _parse_float_map(os.getenv("AI_CACHE_TTLS", ""))
+        # SQLite file for the on-disk tier; empty keeps the cache in memory only
+        self.ai_cache_path = os.getenv("AI_CACHE_PATH", "")
+        # Micro-batching of concurrent single assignment calls; 0 ms disables it
+        self.ai_batch_max_wait_ms = float(os.getenv("AI_BATCH_MAX_WAIT_MS", "5"))
+        self.ai_batch_max_size = int(os.getenv("AI_BATCH_MAX_SIZE", "10"))
+        self.local_assignment_enabled = os.getenv("LOCAL_ASSIGNMENT_ENABLED", "true").lower() == "true"
+        # Minimum score margin between the best and second-best member to skip Gemini
+        self.local_assignment_threshold = float(os.getenv("LOCAL_ASSIGNMENT_THRESHOLD", "0.25"))
+        # inprocess: background pool in the API; external: standalone worker; inline: enrich before responding
+        self.enrichment_mode = os.getenv("ENRICHMENT_MODE", "inprocess")
+        self.enrichment_workers = int(os.getenv("ENRICHMENT_WORKERS", "4"))
+        self.enrichment_queue_size = int(os.getenv("ENRICHMENT_QUEUE_SIZE", "200"))
+        self.enrichment_max_retries = int(os.getenv("ENRICHMENT_MAX_RETRIES", "3"))
+        self.enrichment_retry_backoff_seconds = float(os.getenv("ENRICHMENT_RETRY_BACKOFF_SECONDS", "1"))
+        self.enrichment_poll_seconds = float(os.getenv("ENRICHMENT_POLL_SECONDS", "5"))
+        # How long a worker's claim on a task lasts; should cover all retries. Expired claims are re-queued
+        self.enrichment_lease_seconds = float(os.getenv("ENRICHMENT_LEASE_SECONDS", "300"))
+        # Bounded fan-out for bulk task endpoints
+        self.bulk_ai_concurrency = int(os.getenv("BULK_AI_CONCURRENCY", "8"))
+        self.bulk_write_concurrency = int(os.getenv("BULK_WRITE_CONCURRENCY", "16"))
+        # Read-through cache for user profiles and the roster; TTL 0 disables it
+        self.user_cache_ttl_seconds = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+        self.user_cache_max_entries = int(os.getenv("USER_CACHE_MAX_ENTRIES", "1024"))
+        # Also invalidate from a Firestore listener on the users collection (multi-instance deployments)
+        self.user_cache_listen = os.getenv("USER_CACHE_LISTEN", "false").lower() == "true"
+        # Utilization at or above which a member counts as overloaded
+        self.overload_threshold = float(os.getenv("OVERLOAD_THRESHOLD", "0.9"))
+        self.overload_top_n = int(os.getenv("OVERLOAD_TOP_N", "3"))
+        # Messages sent to the summarizer per call (the thread tail, or new messages since the last summary)
+        self.summary_tail_messages = int(os.getenv("SUMMARY_TAIL_MESSAGES", "10"))
+        # Most summarizer calls one request folds in; further behind, only the tail is re-summarized
+        self.summary_max_fold_pages = int(os.getenv("SUMMARY_MAX_FOLD_PAGES", "5"))
+        # Events buffered per streaming connection before a slow client is dropped
+        self.realtime_queue_size = int(os.getenv("REALTIME_QUEUE_SIZE", "100"))
+        self.realtime_heartbeat_seconds = float(os.getenv("REALTIME_HEARTBEAT_SECONDS", "15"))
+        # Restart each channel listener from the newest event seen so its result set stays small
+        self.realtime_reanchor_seconds = float(os.getenv("REALTIME_REANCHOR_SECONDS", "300"))
+        self.auth_token_cache_size = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "1024"))
+        self.auth_cert_refresh_seconds = int(os.getenv("AUTH_CERT_REFRESH_SECONDS", "3600"))
 
 
 @lru_cache
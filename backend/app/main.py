@@ -1,8 +1,50 @@
+import asyncio
+import contextlib
 import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title="AI Workspace Manager API", version="1.0.0")
+from app.auth import refresh_public_keys_forever
+from app.config import get_settings
+from app.services.enrichment import get_enrichment_pool
+from app.services.metrics import RequestMetricsMiddleware, metrics_response
+from app.services.providers import get_ai_service, get_firestore_service
+from app.services.realtime import get_realtime_hub
+from app.services.tracing import TracingMiddleware, shutdown_tracing
+from app.services.user_cache import get_user_cache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    enrichment = get_enrichment_pool()
+    # Keep Firebase signing keys warm in the background
+    key_refresher = asyncio.create_task(refresh_public_keys_forever())
+    try:
+        # Startup runs inside the try so a failure still cancels the refresher
+        await get_ai_service().start()
+        if settings.user_cache_listen:
+            get_user_cache().listen(get_firestore_service(), settings.firestore_collection_users)
+        if settings.enrichment_mode == "inprocess":
+            await enrichment.start()
+            # Pick up tasks left pending by a previous run
+            with contextlib.suppress(Exception):
+                await enrichment.sweep_pending()
+        yield
+    finally:
+        key_refresher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await key_refresher
+        get_realtime_hub().close()
+        get_user_cache().close()
+        await enrichment.stop()
+        await get_ai_service().aclose()
+        shutdown_tracing()
+
+
+app = FastAPI(title="AI Workspace Manager API", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -10,16 +52,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
+app.add_middleware(RequestMetricsMiddleware)
+app.add_middleware(TracingMiddleware)
 
 # Health check - no auth required
 @app.get("/health")
 def health():
     return {"status": "ok", "env": os.getenv("GCP_PROJECT", "not_set")}
 
+# Prometheus scrape endpoint - no auth required
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return metrics_response()
+
 # Import routers after basic app setup
 try:
-    from app.routers import tasks, messages, attachments, agent, meetings, users, updates
+    from app.routers import tasks, messages, attachments, agent, meetings, users, updates, diagnostics, stream
     app.include_router(tasks.router)
     app.include_router(messages.router)
     app.include_router(attachments.router)
@@ -27,6 +77,8 @@ try:
     app.include_router(meetings.router)
     app.include_router(users.router)
     app.include_router(updates.router)
+    app.include_router(diagnostics.router)
+    app.include_router(stream.router)
     print("✅ All routers loaded successfully")
 except Exception as e:
     print(f"⚠️ Router import error: {e}")
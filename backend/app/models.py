@@ -26,26 +26,84 @@ class Task(TaskBase):
     status: Literal["open", "in_progress", "in_review", "blocked", "completed"] = "open"
     watchers: List[str] = []
     activity_log: List[Dict[str, str]] = []
+    ai_status: Optional[Literal["pending", "running", "complete", "failed"]] = None
     created_at: Optional[datetime]
     updated_at: Optional[datetime]
 
 
+class ActivityEntry(BaseModel):
+    id: str
+    timestamp: datetime
+    actor: str
+    action: str
+
+
+class TaskSummary(BaseModel):
+    """Board/list view of a task; omits activity_log, attachments and other heavy fields."""
+
+    id: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[str] = None
+    priority: Optional[int] = None
+    complexity: Optional[str] = None
+    tags: List[str] = []
+    assigned_to: Optional[str] = None
+    deadline: Optional[date] = None
+    predicted_hours: Optional[float] = None
+    flowchart_step: Optional[str] = None
+    project_name: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
 class TaskCreate(TaskBase):
     pass
 
 
 class TaskUpdate(BaseModel):
-    title: Optional[str]
-    description: Optional[str]
-    tags: Optional[List[str]]
-    attachments: Optional[List[str]]
-    complexity: Optional[Literal["low", "medium", "high"]]
+    title: Optional[str] = None
+    description: Optional[str] = None
+    tags: Optional[List[str]] = None
+    attachments: Optional[List[str]] = None
+    complexity: Optional[Literal["low", "medium", "high"]] = None
     priority: Optional[int] = Field(None, ge=1, le=5)
-    deadline: Optional[date]
-    status: Optional[Literal["open", "in_progress", "in_review", "blocked", "completed"]]
-    assigned_to: Optional[str]
-    flowchart_step: Optional[str]
-    watchers: Optional[List[str]]
+    deadline: Optional[date] = None
+    status: Optional[Literal["open", "in_progress", "in_review", "blocked", "completed"]] = None
+    assigned_to: Optional[str] = None
+    flowchart_step: Optional[str] = None
+    watchers: Optional[List[str]] = None
+
+
+class BulkTaskCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=500)
+
+
+class BulkTaskPatch(TaskUpdate):
+    id: str
+
+
+class BulkTaskUpdate(BaseModel):
+    updates: List[BulkTaskPatch] = Field(..., min_length=1, max_length=500)
+
+
+class BulkAutoAssign(BaseModel):
+    task_ids: List[str] = Field(..., min_length=1, max_length=500)
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    ok: bool
+    error: Optional[str] = None
+    assigned_to: Optional[str] = None
+    source: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
 
 
 class Message(BaseModel):
@@ -70,6 +128,8 @@ class UserProfile(BaseModel):
     skills: List[str] = []
     capacity_hours: float = 40.0
     assigned_hours: float = 0.0
+    open_tasks: int = 0
+    task_counts: Dict[str, int] = {}
     availability: Optional[str]
     email: Optional[str]
     avatar_url: Optional[str]
@@ -131,6 +191,17 @@ class AIAssignmentResult(BaseModel):
     required_meeting: Optional[bool]
     meeting_suggestion: Optional[MeetingSuggestion]
     reason: Optional[str]
+    source: Literal["local", "llm"] = "llm"
+    fallback: bool = False
+
+
+class EnrichmentStatus(BaseModel):
+    task_id: str
+    ai_status: Optional[Literal["pending", "running", "complete", "failed"]] = None
+    ai_attempts: int = 0
+    ai_error: Optional[str] = None
+    assigned_to: Optional[str] = None
+    predicted_hours: Optional[float] = None
 
 
 class Update(BaseModel):
@@ -1,5 +1,3 @@
-from . import tasks, messages, attachments, agent, meetings, users, updates
-
-__all__ = ["tasks", "messages", "attachments", "agent", "meetings", "users", "updates"]
-
+from . import tasks, messages, attachments, agent, meetings, users, updates, diagnostics, stream
 
+__all__ = ["tasks", "messages", "attachments", "agent", "meetings", "users", "updates", "diagnostics", "stream"]
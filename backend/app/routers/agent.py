@@ -1,30 +1,15 @@
-from typing import List, Dict, Any
+from typing import Any, Dict, List, Literal, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 
 from app.auth import AuthUser, get_current_user
+from app.config import get_settings
+from app.services.providers import get_async_firestore_service, get_ai_service
+from app.services.workload import get_overload_advisor, workload_snapshot
 
 router = APIRouter(prefix="/agent", tags=["agent"])
 
-# Lazy initialization to avoid import-time failures
-_firestore_service = None
-_ai_service = None
-
-def get_firestore_service():
-    global _firestore_service
-    if _firestore_service is None:
-        from app.services.firestore import FirestoreService
-        _firestore_service = FirestoreService()
-    return _firestore_service
-
-def get_ai_service():
-    global _ai_service
-    if _ai_service is None:
-        from app.services.ai_agent import AIAgentService
-        _ai_service = AIAgentService()
-    return _ai_service
-
 
 class WorkloadRequest(BaseModel):
     workloads: List[Dict[str, Any]]
@@ -39,18 +24,31 @@ class FlowchartRequest(BaseModel):
 
 
 @router.get("/who-is-overloaded")
-async def who_is_overloaded(current_user: AuthUser = Depends(get_current_user)):
-    users = get_firestore_service().list_users()
-    workloads = [
-        {
-            "id": user["id"],
-            "name": user.get("name"),
-            "utilization": user.get("assigned_hours", 0) / max(user.get("capacity_hours", 40), 1),
-            "skills": user.get("skills"),
-        }
-        for user in users
-    ]
-    return await get_ai_service().overload_report(workloads)
+async def who_is_overloaded(
+    top: Optional[int] = Query(None, ge=1, le=100),
+    threshold: Optional[float] = Query(None, ge=0),
+    advice: Literal["async", "wait", "none"] = "async",
+    current_user: AuthUser = Depends(get_current_user),
+):
+    """Overloaded members computed locally; Gemini suggestions attach once ready.
+
+    ``advice=async`` returns immediately and fetches suggestions in the
+    background (a later call returns them), ``wait`` blocks on them and
+    ``none`` skips the agent.
+    """
+    settings = get_settings()
+    users = await get_async_firestore_service().list_users()
+    report = workload_snapshot(
+        users,
+        threshold if threshold is not None else settings.overload_threshold,
+        top or settings.overload_top_n,
+    )
+    if advice == "none":
+        report.update({"advice_status": "none", "suggestions": []})
+        return report
+    status, suggestions = await get_overload_advisor().advise(report["overloaded"], wait=advice == "wait")
+    report.update({"advice_status": status, "suggestions": suggestions})
+    return report
 
 
 @router.post("/workload")
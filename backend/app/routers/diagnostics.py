@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends
+
+from app.auth import AuthUser, get_current_user, get_token_cache
+from app.services.enrichment import get_enrichment_pool
+from app.services.providers import get_ai_service
+from app.services.realtime import get_realtime_hub
+from app.services.user_cache import get_user_cache
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+
+@router.get("/auth")
+def auth_stats(current_user: AuthUser = Depends(get_current_user)):
+    return {"token_cache": get_token_cache().stats()}
+
+
+@router.get("/ai-pool")
+def ai_pool_stats(current_user: AuthUser = Depends(get_current_user)):
+    return get_ai_service().pool_stats()
+
+
+@router.get("/ai-cache")
+def ai_cache_stats(current_user: AuthUser = Depends(get_current_user)):
+    return get_ai_service().cache_stats()
+
+
+@router.get("/ai-coalescing")
+def ai_coalescing_stats(current_user: AuthUser = Depends(get_current_user)):
+    return get_ai_service().coalescing_stats()
+
+
+@router.get("/ai-breakers")
+def ai_breaker_stats(current_user: AuthUser = Depends(get_current_user)):
+    return get_ai_service().breaker_stats()
+
+
+@router.get("/ai-batching")
+def ai_batching_stats(current_user: AuthUser = Depends(get_current_user)):
+    return get_ai_service().batching_stats()
+
+
+@router.get("/enrichment")
+def enrichment_stats(current_user: AuthUser = Depends(get_current_user)):
+    return get_enrichment_pool().stats()
+
+
+@router.get("/realtime")
+def realtime_stats(current_user: AuthUser = Depends(get_current_user)):
+    return get_realtime_hub().stats()
+
+
+@router.get("/user-cache")
+def user_cache_stats(current_user: AuthUser = Depends(get_current_user)):
+    return get_user_cache().stats()
@@ -5,19 +5,10 @@ from fastapi import APIRouter, Depends, HTTPException, Response
 
 from app.auth import AuthUser, get_current_user
 from app.models import Meeting, MeetingCreate
+from app.services.providers import get_firestore_service
 
 router = APIRouter(prefix="/meetings", tags=["meetings"])
 
-# Lazy initialization to avoid import-time failures
-_firestore_service = None
-
-def get_firestore_service():
-    global _firestore_service
-    if _firestore_service is None:
-        from app.services.firestore import FirestoreService
-        _firestore_service = FirestoreService()
-    return _firestore_service
-
 
 @router.get("/", response_model=List[Meeting])
 def list_meetings(
@@ -1,35 +1,45 @@
-from datetime import datetime
-from typing import List
+import hashlib
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 
 from app.auth import AuthUser, get_current_user
+from app.config import get_settings
 from app.models import Message, MessageCreate
+from app.services.providers import get_async_firestore_service, get_firestore_service, get_ai_service
 
 router = APIRouter(prefix="/messages", tags=["messages"])
 
-# Lazy initialization to avoid import-time failures
-_firestore_service = None
-_ai_service = None
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+SUMMARY_FIELDS = ("bullets", "status", "next_step")
 
-def get_firestore_service():
-    global _firestore_service
-    if _firestore_service is None:
-        from app.services.firestore import FirestoreService
-        _firestore_service = FirestoreService()
-    return _firestore_service
 
-def get_ai_service():
-    global _ai_service
-    if _ai_service is None:
-        from app.services.ai_agent import AIAgentService
-        _ai_service = AIAgentService()
-    return _ai_service
+def _thread_etag(task_id: str, since: Optional[str], messages: List[dict]) -> str:
+    # Messages are immutable, so the ids in the page identify its content
+    digest = hashlib.sha1("|".join([task_id, since or "", *(m["id"] for m in messages)]).encode())
+    return f'W/"{digest.hexdigest()}"'
 
 
 @router.get("/{task_id}", response_model=List[Message])
-def list_messages(task_id: str, current_user: AuthUser = Depends(get_current_user)):
-    return get_firestore_service().list_messages(task_id)
+def list_messages(
+    task_id: str,
+    response: Response,
+    since: Optional[str] = Query(None, description="created_at of the last message the client has"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: Optional[str] = Header(None),
+    current_user: AuthUser = Depends(get_current_user),
+):
+    """Thread messages oldest first; pass ``since`` to fetch only what is new."""
+    messages = get_firestore_service().list_messages(task_id, since=since, limit=limit)
+    etag = _thread_etag(task_id, since, messages)
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    if limit and len(messages) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = messages[-1]["created_at"]
+    return messages
 
 
 @router.post("/", response_model=Message, status_code=201)
@@ -37,33 +47,70 @@ async def create_message(
     message: MessageCreate,
     current_user: AuthUser = Depends(get_current_user),
 ):
-    firestore = get_firestore_service()
+    firestore = get_async_firestore_service()
     payload = message.model_dump(exclude_unset=True)
-    payload.update({"created_at": datetime.utcnow().isoformat(), "sender_id": current_user.uid})
-    firestore.create_message(payload)
-    task = firestore.get_task(message.task_id)
-    activity_log = task.get("activity_log", [])
-    activity_log.append(
+    payload["sender_id"] = current_user.uid
+    # The store stamps created_at so the thread's delta cursor follows commit order
+    await firestore.create_message(payload)
+    await firestore.append_activity(
+        message.task_id,
         {
             "timestamp": payload["created_at"],
             "actor": current_user.uid,
             "action": "Commented on task",
-        }
-    )
-    firestore.update_task(
-        message.task_id,
-        {
-            "activity_log": activity_log,
-            "updated_at": payload["created_at"],
-            "watchers": list({*task.get("watchers", []), current_user.uid}),
         },
+        {"updated_at": payload["created_at"]},
+        watcher=current_user.uid,
     )
     return payload
 
 
 @router.post("/{task_id}/summarize")
 async def summarize(task_id: str, current_user: AuthUser = Depends(get_current_user)):
-    messages = get_firestore_service().list_messages(task_id)
-    return await get_ai_service().summarize_chat(messages)
+    """Summarize the thread, reading only messages newer than the stored summary.
+
+    The first summary covers the thread tail. Later calls fold in every
+    message after the watermark, oldest first, SUMMARY_TAIL_MESSAGES at a
+    time, so no message between two summaries is skipped. A thread more
+    than SUMMARY_MAX_FOLD_PAGES pages behind is re-summarized from its tail
+    instead, and the response says ``partial``.
+    """
+    firestore = get_async_firestore_service()
+    try:
+        task = await firestore.get_task(task_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    settings = get_settings()
+    page_size = settings.summary_tail_messages
+    max_messages = page_size * max(settings.summary_max_fold_pages, 1)
+    previous = task.get("chat_summary")
+    if not previous:
+        messages = await firestore.latest_messages(task_id, page_size)
+        return {**await _summarize_page(firestore, task_id, messages, None), "partial": False}
+    backlog = await firestore.list_messages(task_id, since=task.get("chat_summary_through"), limit=max_messages + 1)
+    if not backlog:
+        return {**previous, "cache_hit": True, "partial": False}
+    if len(backlog) > max_messages:
+        # Too far behind to fold in one request; the messages in between are left out
+        messages = await firestore.latest_messages(task_id, page_size)
+        return {**await _summarize_page(firestore, task_id, messages, None), "partial": True}
+    for start in range(0, len(backlog), page_size):
+        result = await _summarize_page(firestore, task_id, backlog[start:start + page_size], previous)
+        if result.get("fallback"):
+            break
+        previous = {key: result.get(key) for key in SUMMARY_FIELDS}
+    return {**result, "partial": False}
 
 
+async def _summarize_page(firestore, task_id: str, messages, previous) -> Dict[str, Any]:
+    """Fold ``messages`` into ``previous`` and advance the watermark to the last message fed in."""
+    result = await get_ai_service().summarize_chat(messages, previous)
+    if messages and not result.get("fallback"):
+        await firestore.update_task(
+            task_id,
+            {
+                "chat_summary": {key: result.get(key) for key in SUMMARY_FIELDS},
+                "chat_summary_through": messages[-1]["created_at"],
+            },
+        )
+    return result
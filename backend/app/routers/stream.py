@@ -0,0 +1,57 @@
+import asyncio
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.auth import AuthUser, get_current_user
+from app.config import get_settings
+from app.services.realtime import CHANNELS, get_realtime_hub
+
+router = APIRouter(prefix="/stream", tags=["stream"])
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/")
+async def stream(
+    request: Request,
+    channels: str = Query(",".join(CHANNELS), description="Comma-separated subset of messages, updates, tasks"),
+    task_id: Optional[str] = Query(None, description="Only messages and task changes for this task"),
+    current_user: AuthUser = Depends(get_current_user),
+):
+    """Server-Sent Events stream of new messages, team updates and task changes."""
+    requested = {channel.strip() for channel in channels.split(",") if channel.strip()}
+    unknown = requested - set(CHANNELS)
+    if unknown or not requested:
+        raise HTTPException(status_code=400, detail=f"Unknown channels: {', '.join(sorted(unknown)) or 'none given'}")
+    hub = get_realtime_hub()
+    heartbeat = get_settings().realtime_heartbeat_seconds
+
+    async def events():
+        subscription = hub.subscribe(requested, task_id)
+        try:
+            yield _sse("ready", {"channels": sorted(requested), "task_id": task_id})
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": heartbeat\n\n"
+                    continue
+                if event is None:
+                    yield _sse("overflow", {"reason": "client fell behind; reconnect and resync"})
+                    break
+                yield _sse(event["channel"], {"change": event["change"], "document": event["document"]})
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
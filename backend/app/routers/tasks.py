@@ -1,89 +1,240 @@
+import asyncio
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 
 from app.auth import AuthUser, get_current_user
-from app.models import Task, TaskCreate, TaskUpdate
+from app.config import get_settings
+from app.models import (
+    ActivityEntry,
+    BulkAutoAssign,
+    BulkItemResult,
+    BulkResult,
+    BulkTaskCreate,
+    BulkTaskPatch,
+    BulkTaskUpdate,
+    EnrichmentStatus,
+    Task,
+    TaskCreate,
+    TaskSummary,
+    TaskUpdate,
+)
+from app.services.enrichment import assignment_update, enrich_task, get_enrichment_pool
+from app.services.providers import get_async_firestore_service, get_firestore_service, get_ai_service
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
-# Lazy initialization to avoid import-time failures
-_firestore_service = None
-_ai_service = None
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TASK_SUMMARY_FIELDS = list(TaskSummary.model_fields)
 
-def get_firestore_service():
-    global _firestore_service
-    if _firestore_service is None:
-        from app.services.firestore import FirestoreService
-        _firestore_service = FirestoreService()
-    return _firestore_service
 
-def get_ai_service():
-    global _ai_service
-    if _ai_service is None:
-        from app.services.ai_agent import AIAgentService
-        _ai_service = AIAgentService()
-    return _ai_service
+def _task_filters(status: Optional[str], priority: Optional[int]) -> Optional[dict]:
+    filters = {}
+    if status:
+        filters["status"] = status
+    if priority:
+        filters["priority"] = priority
+    return filters if filters else None
+
+
+def _list_page(response: Response, limit: Optional[int], start_after: Optional[str], **kwargs) -> List[dict]:
+    try:
+        tasks = get_firestore_service().list_tasks(limit=limit, start_after=start_after, **kwargs)
+    except KeyError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {exc}") from exc
+    if limit and len(tasks) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = tasks[-1]["id"]
+    return tasks
 
 
 @router.get("/", response_model=List[Task])
 def list_tasks(
+    response: Response,
     status: Optional[str] = None,
     priority: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    start_after: Optional[str] = None,
     current_user: AuthUser = Depends(get_current_user),
 ):
-    filters = {}
-    if status:
-        filters["status"] = status
-    if priority:
-        filters["priority"] = priority
-    return get_firestore_service().list_tasks(filters if filters else None)
+    return _list_page(response, limit, start_after, filters=_task_filters(status, priority))
 
 
-@router.post("/", response_model=Task, status_code=201)
-async def create_task(task: TaskCreate, current_user: AuthUser = Depends(get_current_user)):
-    firestore = get_firestore_service()
+@router.get("/summary", response_model=List[TaskSummary], response_model_exclude_unset=True)
+def list_task_summaries(
+    response: Response,
+    status: Optional[str] = None,
+    priority: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    start_after: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of TaskSummary fields"),
+    current_user: AuthUser = Depends(get_current_user),
+):
+    """Paginated, projected task list for board and list views."""
+    selected = TASK_SUMMARY_FIELDS
+    if fields:
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = set(selected) - set(TASK_SUMMARY_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return _list_page(
+        response, limit, start_after, filters=_task_filters(status, priority), fields=selected
+    )
+
+
+def _new_task_payload(task: TaskCreate, uid: str) -> dict:
     now = datetime.utcnow().isoformat()
     payload = task.model_dump(exclude_unset=True)
     payload.update(
         {
             "created_at": now,
             "updated_at": now,
-            "created_by": current_user.uid,
+            "created_by": uid,
             "status": "open",
-            "watchers": [current_user.uid],
+            "watchers": [uid],
             "activity_log": [
                 {
                     "timestamp": now,
-                    "actor": current_user.uid,
+                    "actor": uid,
                     "action": "Task created",
                 }
             ],
         }
     )
-    team = firestore.list_users()
-    try:
-        ai_prediction = await get_ai_service().predict_assignment(payload, team)
-        payload.update(
-            {
-                "predicted_hours": ai_prediction.predicted_hours,
-                "assigned_to": ai_prediction.best_member_id,
-                "priority": ai_prediction.priority or payload.get("priority"),
-                "deadline": ai_prediction.deadline or payload.get("deadline"),
-                "flowchart_step": ai_prediction.flowchart_next_step or payload.get("flowchart_step"),
-                "ai_reason": ai_prediction.reason,
-            }
+    payload.update({"ai_status": "pending", "assigned_to": None, "predicted_hours": None})
+    return payload
+
+
+def _update_payload(task: TaskUpdate, uid: str) -> dict:
+    payload = task.model_dump(exclude_unset=True)
+    payload["updated_at"] = datetime.utcnow().isoformat()
+    if payload.get("watchers") is not None:
+        payload["watchers"] = list({*payload["watchers"], uid})
+    return payload
+
+
+async def _gather_bounded(limit: int, coroutines) -> list:
+    semaphore = asyncio.Semaphore(max(limit, 1))
+
+    async def run(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(run(coroutine) for coroutine in coroutines))
+
+
+def _bulk_result(results: List[BulkItemResult]) -> BulkResult:
+    succeeded = sum(1 for result in results if result.ok)
+    return BulkResult(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+@router.post("/", response_model=Task, status_code=201)
+async def create_task(task: TaskCreate, current_user: AuthUser = Depends(get_current_user)):
+    firestore = get_async_firestore_service()
+    payload = _new_task_payload(task, current_user.uid)
+    await firestore.create_task(payload)
+    settings = get_settings()
+    if settings.enrichment_mode == "inline" or (
+        settings.enrichment_mode == "inprocess" and not get_enrichment_pool().submit(payload["id"])
+    ):
+        # Inline mode, or the queue is full: absorb the prediction in this request
+        enriched = await enrich_task(
+            payload["id"], settings.enrichment_max_retries, settings.enrichment_retry_backoff_seconds
         )
-        if ai_prediction.required_meeting and ai_prediction.meeting_suggestion:
-            payload["meeting_suggestion"] = ai_prediction.meeting_suggestion.model_dump()
-    except ValueError as e:
-        # AI agent not available - continue without AI predictions
-        payload["ai_reason"] = f"AI unavailable: {str(e)}"
-    firestore.create_task(payload)
+        if enriched is not None:
+            payload = enriched
     return payload
 
 
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_tasks(body: BulkTaskCreate, current_user: AuthUser = Depends(get_current_user)):
+    """Create many tasks with batched writes; enrichment is queued, not awaited."""
+    payloads = [_new_task_payload(task, current_user.uid) for task in body.tasks]
+    errors = await get_async_firestore_service().create_tasks(payloads)
+    created = [payload["id"] for payload, error in zip(payloads, errors) if error is None]
+    settings = get_settings()
+    if created and settings.enrichment_mode == "inline":
+        await _gather_bounded(
+            settings.bulk_ai_concurrency,
+            (
+                enrich_task(task_id, settings.enrichment_max_retries, settings.enrichment_retry_backoff_seconds)
+                for task_id in created
+            ),
+        )
+    elif created and settings.enrichment_mode == "inprocess":
+        get_enrichment_pool().submit_many(created)
+    return _bulk_result(
+        [
+            BulkItemResult(index=index, id=payload["id"] if error is None else None, ok=error is None, error=error)
+            for index, (payload, error) in enumerate(zip(payloads, errors))
+        ]
+    )
+
+
+@router.patch("/bulk", response_model=BulkResult)
+async def bulk_update_tasks(body: BulkTaskUpdate, current_user: AuthUser = Depends(get_current_user)):
+    """Apply many partial updates; each one is its own transaction so counters stay exact."""
+    firestore = get_async_firestore_service()
+
+    async def apply(index: int, patch: BulkTaskPatch) -> BulkItemResult:
+        payload = _update_payload(patch, current_user.uid)
+        payload.pop("id", None)
+        entry = {"timestamp": payload["updated_at"], "actor": current_user.uid, "action": "Task updated"}
+        try:
+            updated = await firestore.append_activity(patch.id, entry, payload)
+        except KeyError:
+            return BulkItemResult(index=index, id=patch.id, ok=False, error="Task not found")
+        except Exception as e:
+            return BulkItemResult(index=index, id=patch.id, ok=False, error=str(e))
+        return BulkItemResult(index=index, id=patch.id, ok=True, assigned_to=updated.get("assigned_to"))
+
+    results = await _gather_bounded(
+        get_settings().bulk_write_concurrency, (apply(index, patch) for index, patch in enumerate(body.updates))
+    )
+    return _bulk_result(results)
+
+
+@router.post("/auto-assign/bulk", response_model=BulkResult)
+async def bulk_auto_assign(body: BulkAutoAssign, current_user: AuthUser = Depends(get_current_user)):
+    """Auto-assign many tasks against one roster read, with bounded concurrent agent calls."""
+    firestore = get_async_firestore_service()
+    settings = get_settings()
+    tasks = await firestore.get_tasks(list(dict.fromkeys(body.task_ids)))
+    found = [task_id for task_id in dict.fromkeys(body.task_ids) if task_id in tasks]
+    team = await firestore.list_users()
+    predictions = dict(
+        zip(
+            found,
+            await get_ai_service().predict_assignments(
+                [tasks[task_id] for task_id in found], team, settings.bulk_ai_concurrency
+            ),
+        )
+    )
+
+    async def apply(index: int, task_id: str) -> BulkItemResult:
+        if task_id not in tasks:
+            return BulkItemResult(index=index, id=task_id, ok=False, error="Task not found")
+        prediction = predictions[task_id]
+        if isinstance(prediction, Exception) or prediction.fallback:
+            error = str(prediction) if isinstance(prediction, Exception) else prediction.reason
+            return BulkItemResult(index=index, id=task_id, ok=False, error=f"AI agent not available: {error}")
+        update_payload = assignment_update(prediction, tasks[task_id])
+        entry = {"timestamp": update_payload["updated_at"], "actor": current_user.uid, "action": "Auto-assigned"}
+        try:
+            await firestore.append_activity(task_id, entry, update_payload)
+        except Exception as e:
+            return BulkItemResult(index=index, id=task_id, ok=False, error=str(e))
+        return BulkItemResult(
+            index=index, id=task_id, ok=True, assigned_to=prediction.best_member_id, source=prediction.source
+        )
+
+    results = await _gather_bounded(
+        settings.bulk_write_concurrency, (apply(index, task_id) for index, task_id in enumerate(body.task_ids))
+    )
+    return _bulk_result(results)
+
+
 @router.get("/{task_id}", response_model=Task)
 def get_task(task_id: str, current_user: AuthUser = Depends(get_current_user)):
     try:
@@ -92,48 +243,60 @@ def get_task(task_id: str, current_user: AuthUser = Depends(get_current_user)):
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
 
+@router.get("/{task_id}/enrichment", response_model=EnrichmentStatus)
+async def enrichment_status(task_id: str, current_user: AuthUser = Depends(get_current_user)):
+    """Poll the background AI enrichment of a task."""
+    try:
+        task = await get_async_firestore_service().get_task(task_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return EnrichmentStatus(task_id=task_id, **{k: v for k, v in task.items() if k in EnrichmentStatus.model_fields})
+
+
+@router.get("/{task_id}/activity", response_model=List[ActivityEntry])
+def list_activity(
+    task_id: str,
+    response: Response,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    start_after: Optional[str] = None,
+    current_user: AuthUser = Depends(get_current_user),
+):
+    """Full activity history of a task, newest first."""
+    try:
+        entries = get_firestore_service().list_activity(task_id, limit=limit, start_after=start_after)
+    except KeyError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {exc}") from exc
+    if len(entries) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = entries[-1]["id"]
+    return entries
+
+
 @router.patch("/{task_id}", response_model=Task)
 def update_task(task_id: str, task: TaskUpdate, current_user: AuthUser = Depends(get_current_user)):
-    firestore = get_firestore_service()
-    existing = firestore.get_task(task_id)
-    payload = task.model_dump(exclude_unset=True)
-    now = datetime.utcnow().isoformat()
-    payload["updated_at"] = now
-    activity_log = existing.get("activity_log", [])
-    activity_log.append({"timestamp": now, "actor": current_user.uid, "action": "Task updated"})
-    payload["activity_log"] = activity_log
-    if "watchers" in payload:
-        payload["watchers"] = list({*payload["watchers"], current_user.uid})
+    payload = _update_payload(task, current_user.uid)
     try:
-        return firestore.update_task(task_id, payload)
+        return get_firestore_service().append_activity(
+            task_id, {"timestamp": payload["updated_at"], "actor": current_user.uid, "action": "Task updated"}, payload
+        )
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
 
 @router.post("/{task_id}/auto-assign", response_model=Task)
 async def auto_assign(task_id: str, current_user: AuthUser = Depends(get_current_user)):
-    firestore = get_firestore_service()
-    task = firestore.get_task(task_id)
-    team = firestore.list_users()
+    firestore = get_async_firestore_service()
+    task = await firestore.get_task(task_id)
+    team = await firestore.list_users()
     try:
         ai_prediction = await get_ai_service().predict_assignment(task, team)
-        update_payload = {
-            "assigned_to": ai_prediction.best_member_id,
-            "predicted_hours": ai_prediction.predicted_hours,
-            "priority": ai_prediction.priority or task.get("priority"),
-            "deadline": ai_prediction.deadline or task.get("deadline"),
-            "flowchart_step": ai_prediction.flowchart_next_step or task.get("flowchart_step"),
-            "ai_reason": ai_prediction.reason,
-            "updated_at": datetime.utcnow().isoformat(),
-        }
-        if ai_prediction.required_meeting and ai_prediction.meeting_suggestion:
-            update_payload["meeting_suggestion"] = ai_prediction.meeting_suggestion.model_dump()
     except ValueError as e:
         raise HTTPException(status_code=503, detail=f"AI agent not available: {str(e)}")
-    activity_log = task.get("activity_log", [])
-    activity_log.append({"timestamp": update_payload["updated_at"], "actor": current_user.uid, "action": "Auto-assigned"})
-    update_payload["activity_log"] = activity_log
-    updated = firestore.update_task(task_id, update_payload)
+    update_payload = assignment_update(ai_prediction, task)
+    updated = await firestore.append_activity(
+        task_id,
+        {"timestamp": update_payload["updated_at"], "actor": current_user.uid, "action": "Auto-assigned"},
+        update_payload,
+    )
     return updated
 
 
@@ -5,20 +5,10 @@ from pydantic import BaseModel, EmailStr
 
 from app.auth import AuthUser, get_current_user
 from app.models import UserProfile, UserUpdate
+from app.services.providers import get_firestore_service
 
 router = APIRouter(prefix="/users", tags=["users"])
 
-# Lazy initialization to avoid import-time failures
-_firestore_service = None
-
-def get_firestore_service():
-    """Lazily initialize Firestore service."""
-    global _firestore_service
-    if _firestore_service is None:
-        from app.services.firestore import FirestoreService
-        _firestore_service = FirestoreService()
-    return _firestore_service
-
 
 class InviteUserRequest(BaseModel):
     email: EmailStr
@@ -0,0 +1,45 @@
+"""Task activity history: append-only subcollection plus a bounded recent window.
+
+Every entry is stored as its own document under ``tasks/{id}/activity``. The
+task document keeps only the newest entries in ``activity_log`` so list views
+stay small; ``GET /tasks/{id}/activity`` pages through the full history.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ACTIVITY_SUBCOLLECTION = "activity"
+
+
+def activity_patch(
+    task: Dict[str, Any],
+    entry: Dict[str, str],
+    updates: Optional[Dict[str, Any]],
+    watcher: Optional[str],
+    window: int,
+    new_id: Callable[[], str],
+) -> Tuple[Dict[str, Any], List[Dict[str, str]]]:
+    """Compute the task patch and the subcollection entries for one append.
+
+    Legacy entries that predate the subcollection have no ``id``; they are
+    copied into the subcollection on the first append so no history is lost
+    when the window is trimmed.
+    """
+    new_entries = []
+    recent = []
+    for existing in task.get("activity_log") or []:
+        if "id" not in existing:
+            existing = {**existing, "id": new_id()}
+            new_entries.append(existing)
+        recent.append(existing)
+    entry = {**entry, "id": new_id()}
+    new_entries.append(entry)
+    recent.append(entry)
+
+    patch = dict(updates or {})
+    patch["activity_log"] = recent[-window:] if window > 0 else []
+    if watcher:
+        watchers = patch.get("watchers", task.get("watchers") or [])
+        patch["watchers"] = list(dict.fromkeys([*watchers, watcher]))
+    return patch, new_entries
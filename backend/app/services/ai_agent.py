@@ -1,11 +1,25 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Union
 
 import httpx
+from opentelemetry.trace import SpanKind
 
 from app.config import get_settings
 from app.models import AIAssignmentResult
+from app.services.ai_batching import AssignmentBatcher
+from app.services.ai_cache import ResponseCache, canonical_key
+from app.services.ai_resilience import EndpointGuard
+from app.services.metrics import AI_FALLBACKS, DEPENDENCY_ERRORS, DEPENDENCY_SECONDS
+from app.services.assignment import LocalAssignmentEngine, TeamMatrix
+from app.services.tracing import inject_headers, span
+
+ASSIGNMENT_INSTRUCTIONS = (
+    "Return JSON with predicted_hours, best_member_id, priority, deadline (YYYY-MM-DD), "
+    "flowchart_next_step, required_meeting, meeting_suggestion {attendees,duration,day}, reason."
+)
 
 
 class AIAgentService:
@@ -14,24 +28,222 @@ class AIAgentService:
     def __init__(self) -> None:
         self._settings = get_settings()
         self._agent_base_url = self._settings.ai_agent_base_url
+        self._client: Optional[httpx.AsyncClient] = None
+        self._request_counts: Dict[str, int] = {}
+        self._local_engine = (
+            LocalAssignmentEngine(self._settings.local_assignment_threshold)
+            if self._settings.local_assignment_enabled
+            else None
+        )
+        # Single-flight: identical concurrent requests share one upstream call
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._coalesced_counts: Dict[str, int] = {}
+        self._cache = ResponseCache(
+            max_entries=self._settings.ai_cache_max_entries,
+            default_ttl=self._settings.ai_cache_ttl_seconds,
+            ttls=self._settings.ai_cache_ttls,
+            db_path=self._settings.ai_cache_path,
+        )
+        self._guards: Dict[str, EndpointGuard] = {}
+        self._sends_in_flight = 0
+        self._peak_sends_in_flight = 0
+        self._batcher = AssignmentBatcher(
+            self._dispatch_assignments,
+            max_wait=self._settings.ai_batch_max_wait_ms / 1000,
+            max_size=self._settings.ai_batch_max_size,
+        )
+
+    async def start(self) -> None:
+        """Open the shared connection pool; called once at app startup."""
+        if self._client is None:
+            settings = self._settings
+            self._client = httpx.AsyncClient(
+                base_url=self._agent_base_url,
+                timeout=self._default_timeout(),
+                limits=httpx.Limits(
+                    max_connections=settings.ai_max_connections,
+                    max_keepalive_connections=settings.ai_max_keepalive_connections,
+                    keepalive_expiry=settings.ai_keepalive_expiry,
+                ),
+                # HTTP/2 needs the optional h2 package (pip install httpx[http2])
+                http2=settings.ai_http2,
+            )
+
+    async def aclose(self) -> None:
+        await self._batcher.drain()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _default_timeout(self) -> float:
+        # Increased timeout for AI operations (30 seconds default)
+        return self._settings.ai_timeout_seconds if self._settings.ai_timeout_seconds > 10 else 30.0
+
+    def _guard(self, path: str) -> EndpointGuard:
+        guard = self._guards.get(path)
+        if guard is None:
+            settings = self._settings
+            guard = self._guards[path] = EndpointGuard(
+                failure_threshold=settings.ai_breaker_failure_threshold,
+                open_seconds=settings.ai_breaker_open_seconds,
+                latency_slo=settings.ai_latency_slos.get(path, settings.ai_latency_slo_seconds),
+                max_timeout=settings.ai_endpoint_timeouts.get(path, self._default_timeout()),
+                min_timeout=settings.ai_timeout_min_seconds,
+                p95_multiplier=settings.ai_timeout_p95_multiplier,
+                adaptive=settings.ai_adaptive_timeouts,
+                hedge=path in settings.ai_hedge_endpoints,
+                hedge_delay=settings.ai_hedge_delay_ms / 1000,
+            )
+        return guard
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Pool usage counted around our own sends, so it doesn't depend on httpx/httpcore internals."""
+        settings = self._settings
+        max_connections = settings.ai_max_connections
+        return {
+            "started": self._client is not None,
+            "base_url": self._agent_base_url,
+            "requests": dict(self._request_counts),
+            "in_flight_requests": self._sends_in_flight,
+            "peak_in_flight_requests": self._peak_sends_in_flight,
+            # Over HTTP/1.1 each request holds a connection; the rest wait for one
+            "waiting_for_connection": 0 if settings.ai_http2 else max(0, self._sends_in_flight - max_connections),
+            "max_connections": max_connections,
+            "max_keepalive_connections": settings.ai_max_keepalive_connections,
+        }
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+    def batching_stats(self) -> Dict[str, Any]:
+        return self._batcher.stats()
+
+    def breaker_stats(self) -> Dict[str, Any]:
+        return {path: guard.stats() for path, guard in self._guards.items()}
+
+    def coalescing_stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._in_flight),
+            "coalesced": dict(self._coalesced_counts),
+            "upstream_requests": dict(self._request_counts),
+        }
 
     async def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST to the agent, serving identical requests from cache or a shared in-flight call."""
+        key = canonical_key(path, payload)
+        use_cache = self._cache.enabled_for(path)
+        if use_cache:
+            cached = await self._cache.get(key)
+            if cached is not None:
+                cached["cache_hit"] = True
+                return cached
+        flight = self._in_flight.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(self._fetch(path, payload, key if use_cache else None))
+            self._in_flight[key] = flight
+            flight.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self._coalesced_counts[path] = self._coalesced_counts.get(path, 0) + 1
+        # Shield so one disconnected caller doesn't cancel the call others are waiting on
+        return dict(await asyncio.shield(flight))
+
+    async def _fetch(self, path: str, payload: Dict[str, Any], cache_key: Optional[str]) -> Dict[str, Any]:
+        result = await self._post_upstream(path, payload)
+        if result is None:
+            return {**self._get_fallback(path), "cache_hit": False, "fallback": True}
+        if cache_key:
+            await self._cache.put(cache_key, path, result)
+        result["cache_hit"] = False
+        return result
+
+    async def _post_upstream(self, path: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self._client is None:
+            await self.start()
+        guard = self._guard(path)
+        if not guard.allow():
+            # Breaker open: fail fast to the fallback instead of waiting out a timeout
+            AI_FALLBACKS.labels(path, "breaker_open").inc()
+            return None
+        self._request_counts[path] = self._request_counts.get(path, 0) + 1
+        start = time.monotonic()
         try:
-            # Increased timeout for AI operations (30 seconds default)
-            timeout = httpx.Timeout(self._settings.ai_timeout_seconds if self._settings.ai_timeout_seconds > 10 else 30.0)
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(f"{self._agent_base_url}{path}", json=payload)
-                response.raise_for_status()
-                return response.json()
+            delay = guard.hedge_delay()
+            if delay is None:
+                result = await self._send(path, payload, guard.timeout())
+            else:
+                result = await self._send_hedged(path, payload, guard, delay)
         except httpx.ConnectError:
-            # Connection error - AI agent not running, return fallback
+            # Connection error - AI agent not running, caller uses fallback
+            self._record_failure(path, guard, start, "unavailable")
             print(f"Warning: AI agent not available at {self._agent_base_url}")
-            return self._get_fallback(path)
+            return None
         except httpx.HTTPError as e:
-            # HTTP error - return fallback
+            # HTTP error or timeout - caller uses fallback
+            self._record_failure(path, guard, start, "timeout" if isinstance(e, httpx.TimeoutException) else "error")
             print(f"AI agent error: {str(e)}")
-            return self._get_fallback(path)
-    
+            return None
+        except BaseException:
+            guard.release()
+            raise
+        latency = time.monotonic() - start
+        guard.record_success(latency)
+        DEPENDENCY_SECONDS.labels("ai_agent", path).observe(latency)
+        return result
+
+    def _record_failure(self, path: str, guard: EndpointGuard, start: float, reason: str) -> None:
+        guard.record_failure()
+        DEPENDENCY_SECONDS.labels("ai_agent", path).observe(time.monotonic() - start)
+        DEPENDENCY_ERRORS.labels("ai_agent", path).inc()
+        AI_FALLBACKS.labels(path, reason).inc()
+
+    async def _send(self, path: str, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        with span(f"ai_agent POST {path}", kind=SpanKind.CLIENT, **{"url.path": path, "timeout_seconds": timeout}):
+            # The agent server continues this trace from the traceparent header
+            headers = inject_headers({})
+            self._sends_in_flight += 1
+            self._peak_sends_in_flight = max(self._peak_sends_in_flight, self._sends_in_flight)
+            # httpx timeouts bound each phase; wait_for bounds the whole call
+            try:
+                response = await asyncio.wait_for(
+                    self._client.post(path, json=payload, headers=headers, timeout=httpx.Timeout(timeout)), timeout
+                )
+            except asyncio.TimeoutError:
+                raise httpx.ReadTimeout(f"{path} took longer than {timeout:.2f} s")
+            finally:
+                self._sends_in_flight -= 1
+            response.raise_for_status()
+        return response.json()
+
+    async def _send_hedged(
+        self, path: str, payload: Dict[str, Any], guard: EndpointGuard, delay: float
+    ) -> Dict[str, Any]:
+        """Send a second identical request if the first is slower than ``delay``; first success wins."""
+        timeout = guard.timeout()
+        first = asyncio.ensure_future(self._send(path, payload, timeout))
+        attempts = {first}
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if done:
+                return first.result()
+            guard.counts["hedges_sent"] += 1
+            self._request_counts[path] += 1
+            hedge = asyncio.ensure_future(self._send(path, payload, max(timeout - delay, 0.001)))
+            attempts.add(hedge)
+            error: Optional[BaseException] = None
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if attempt is hedge:
+                            guard.counts["hedges_won"] += 1
+                        return attempt.result()
+                    error = attempt.exception()
+            raise error
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
     def _get_fallback(self, path: str) -> Dict[str, Any]:
         """Return fallback responses when AI agent is unavailable."""
         fallbacks = {
@@ -71,22 +283,86 @@ class AIAgentService:
     async def predict_assignment(
         self, task_payload: Dict[str, Any], team: List[Dict[str, Any]]
     ) -> AIAssignmentResult:
-        prompt = {
-            "task": task_payload,
-            "team": team,
-            "instructions": (
-                "Return JSON with predicted_hours, best_member_id, priority, deadline (YYYY-MM-DD), "
-                "flowchart_next_step, required_meeting, meeting_suggestion {attendees,duration,day}, reason."
-            ),
-        }
+        if self._local_engine is not None:
+            local = self._local_engine.predict(task_payload, team)
+            if local is not None:
+                return local
+        if self._batcher.enabled:
+            return await self._batcher.submit(task_payload, team)
+        return await self._predict_remote(task_payload, team)
+
+    async def predict_assignments(
+        self, tasks: List[Dict[str, Any]], team: List[Dict[str, Any]], concurrency: int
+    ) -> List[Union[AIAssignmentResult, Exception]]:
+        """Predict many tasks against one roster: one vectorized local pass, then bounded agent calls."""
+        results: List[Any] = [None] * len(tasks)
+        if self._local_engine is not None and team:
+            tagged = [index for index, task in enumerate(tasks) if task.get("tags")]
+            local = self._local_engine.predict_many([tasks[index] for index in tagged], TeamMatrix(team))
+            for index, prediction in zip(tagged, local):
+                results[index] = prediction
+        pending = [index for index, result in enumerate(results) if result is None]
+        if len(pending) > 1:
+            batched = await self._predict_remote_batch([tasks[index] for index in pending], team)
+            if batched is not None:
+                for index, prediction in zip(pending, batched):
+                    results[index] = prediction
+                return results
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def remote(index: int) -> None:
+            async with semaphore:
+                try:
+                    results[index] = await self._predict_remote(tasks[index], team)
+                except Exception as e:
+                    results[index] = e
+
+        await asyncio.gather(*(remote(index) for index in pending))
+        return results
+
+    async def _predict_remote(self, task_payload: Dict[str, Any], team: List[Dict[str, Any]]) -> AIAssignmentResult:
+        prompt = {"task": task_payload, "team": team, "instructions": ASSIGNMENT_INSTRUCTIONS}
         result = await self._post("/assignment", prompt)
         return AIAssignmentResult(**result)
 
-    async def summarize_chat(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _dispatch_assignments(
+        self, tasks: List[Dict[str, Any]], team: List[Dict[str, Any]]
+    ) -> List[Union[AIAssignmentResult, Exception]]:
+        """Batcher dispatch: a lone call keeps the single endpoint, merged calls share one batch."""
+        if len(tasks) > 1:
+            batched = await self._predict_remote_batch(tasks, team)
+            if batched is not None:
+                return batched
+        return await asyncio.gather(*(self._predict_remote(task, team) for task in tasks), return_exceptions=True)
+
+    async def _predict_remote_batch(
+        self, tasks: List[Dict[str, Any]], team: List[Dict[str, Any]]
+    ) -> Optional[List[Union[AIAssignmentResult, Exception]]]:
+        """Many tasks in one /assignment/batch call; None when the agent can't serve it."""
+        result = await self._post("/assignment/batch", {"tasks": tasks, "team": team, "instructions": ASSIGNMENT_INSTRUCTIONS})
+        items = result.get("results")
+        if result.get("fallback") or not isinstance(items, list) or len(items) != len(tasks):
+            return None
+        predictions: List[Union[AIAssignmentResult, Exception]] = []
+        for item in items:
+            try:
+                if item.get("error"):
+                    raise RuntimeError(item["error"])
+                predictions.append(AIAssignmentResult(**item))
+            except Exception as e:
+                predictions.append(e)
+        return predictions
+
+    async def summarize_chat(
+        self, messages: List[Dict[str, Any]], previous_summary: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Summarize a thread tail, or fold new messages into ``previous_summary``."""
         prompt = {
-            "messages": messages[-10:],
+            "messages": messages,
             "instructions": "Summarize into 3 bullets + status line + recommended next action.",
         }
+        if previous_summary:
+            prompt["previous_summary"] = previous_summary
         result = await self._post("/summarize", prompt)
         return result
 
@@ -0,0 +1,145 @@
+"""Micro-batching for single-task assignment calls.
+
+Concurrent ``predict_assignment`` calls (a burst of POST /tasks/ during a
+standup) are held for up to AI_BATCH_MAX_WAIT_MS and sent to the agent as
+one /assignment/batch request; each caller gets its own result back. A
+call that arrives when no other call has been seen within the wait window
+is dispatched at once, so a quiet API pays no queueing delay.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import Counter, deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+Dispatch = Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], Awaitable[List[Any]]]
+
+
+def team_key(team: List[Dict[str, Any]]) -> str:
+    """Calls are only merged when they were made against the same roster."""
+    body = json.dumps(team, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(body.encode("utf-8")).hexdigest()
+
+
+class _Batch:
+    def __init__(self, team: List[Dict[str, Any]], timer: asyncio.TimerHandle) -> None:
+        self.team = team
+        self.timer = timer
+        self.items: List[Tuple[Dict[str, Any], asyncio.Future, float]] = []
+
+
+class AssignmentBatcher:
+    """Collects concurrent calls per roster and dispatches them as one batch."""
+
+    def __init__(self, dispatch: Dispatch, max_wait: float, max_size: int) -> None:
+        self._dispatch = dispatch
+        self._max_wait = max_wait
+        self._max_size = max_size
+        self._pending: Dict[str, _Batch] = {}
+        self._last_arrival: Dict[str, float] = {}
+        self._running: set = set()
+        self._batch_sizes: Counter = Counter()
+        self._delays: deque = deque(maxlen=4096)
+        self._counts = {"calls": 0, "batches": 0, "immediate": 0, "failed_batches": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_wait > 0 and self._max_size > 1
+
+    async def submit(self, task: Dict[str, Any], team: List[Dict[str, Any]]) -> Any:
+        key = team_key(team)
+        now = time.monotonic()
+        last = self._last_arrival.get(key)
+        if len(self._last_arrival) > 64:
+            self._last_arrival.clear()
+        self._last_arrival[key] = now
+        self._counts["calls"] += 1
+
+        batch = self._pending.get(key)
+        if batch is None and (last is None or now - last > self._max_wait):
+            self._counts["immediate"] += 1
+            self._record(1, [0.0])
+            result = (await self._dispatch([task], team))[0]
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        loop = asyncio.get_running_loop()
+        if batch is None:
+            batch = _Batch(team, loop.call_later(self._max_wait, self._flush, key))
+            self._pending[key] = batch
+        future = loop.create_future()
+        batch.items.append((task, future, now))
+        if len(batch.items) >= self._max_size:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key: str) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        batch.timer.cancel()
+        now = time.monotonic()
+        self._record(len(batch.items), [now - arrived for _, _, arrived in batch.items])
+        run = asyncio.ensure_future(self._run(batch))
+        self._running.add(run)
+        run.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: _Batch) -> None:
+        futures = [future for _, future, _ in batch.items]
+        try:
+            results = await self._dispatch([task for task, _, _ in batch.items], batch.team)
+        except Exception as e:
+            self._counts["failed_batches"] += 1
+            results = [e] * len(futures)
+        for future, result in zip(futures, results):
+            if future.done():
+                # Caller went away while the batch was in flight
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _record(self, size: int, delays: List[float]) -> None:
+        self._counts["batches"] += 1
+        self._batch_sizes[size] += 1
+        self._delays.extend(delays)
+
+    async def drain(self) -> None:
+        """Dispatch whatever is still held and wait for in-flight batches (shutdown)."""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        delays = sorted(self._delays)
+        batches = self._counts["batches"]
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not delays:
+                return None
+            return round(delays[min(len(delays) - 1, int(fraction * len(delays)))] * 1000, 3)
+
+        return {
+            "enabled": self.enabled,
+            "max_wait_ms": self._max_wait * 1000,
+            "max_size": self._max_size,
+            "pending": sum(len(batch.items) for batch in self._pending.values()),
+            **self._counts,
+            "batch_sizes": dict(sorted(self._batch_sizes.items())),
+            "mean_batch_size": round(sum(size * count for size, count in self._batch_sizes.items()) / batches, 3)
+            if batches
+            else 0.0,
+            "queue_delay_ms": {
+                "mean": round(sum(delays) / len(delays) * 1000, 3) if delays else None,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": round(delays[-1] * 1000, 3) if delays else None,
+            },
+        }
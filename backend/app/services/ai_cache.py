@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+# Endpoints whose answer depends only on the request body. Others (the
+# assignment endpoints, whose best answer changes with team workload) are
+# cached only with an explicit AI_CACHE_TTLS entry.
+CACHEABLE_PATHS = frozenset({"/flowchart", "/meeting", "/summarize", "/overload"})
+
+
+def canonical_key(path: str, payload: Dict[str, Any]) -> str:
+    """Stable hash of an agent endpoint and its request body."""
+    body = json.dumps({"path": path, "body": payload}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class _SQLiteTier:
+    """On-disk cache tier so responses survive restarts."""
+
+    def __init__(self, db_path: str) -> None:
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ai_responses ("
+                "key TEXT PRIMARY KEY, path TEXT, value TEXT, expires_at REAL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM ai_responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at <= time.time():
+            self.delete(key)
+            return None
+        return expires_at, json.loads(value)
+
+    def put(self, key: str, path: str, value: Dict[str, Any], expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ai_responses (key, path, value, expires_at) VALUES (?, ?, ?, ?)",
+                (key, path, json.dumps(value, default=str), expires_at),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM ai_responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+
+class ResponseCache:
+    """TTL + LRU cache of agent responses with an optional SQLite tier."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        default_ttl: float,
+        ttls: Optional[Dict[str, float]] = None,
+        db_path: str = "",
+    ) -> None:
+        self._max_entries = max_entries
+        self._default_ttl = default_ttl
+        self._ttls = ttls or {}
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._disk = _SQLiteTier(db_path) if db_path else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, path: str) -> float:
+        if path in self._ttls:
+            return self._ttls[path]
+        return self._default_ttl if path in CACHEABLE_PATHS else 0.0
+
+    def enabled_for(self, path: str) -> bool:
+        return self._max_entries > 0 and self.ttl_for(path) > 0
+
+    def _remember(self, key: str, expires_at: float, value: Dict[str, Any]) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return dict(value)
+            del self._entries[key]
+        if self._disk is not None:
+            stored = await asyncio.to_thread(self._disk.get, key)
+            if stored is not None:
+                self._remember(key, *stored)
+                self.disk_hits += 1
+                return dict(stored[1])
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, path: str, value: Dict[str, Any]) -> None:
+        expires_at = time.time() + self.ttl_for(path)
+        self._remember(key, expires_at, dict(value))
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.put, key, path, value, expires_at)
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self._max_entries,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "disk_tier": self._disk is not None,
+        }
@@ -0,0 +1,142 @@
+"""Per-endpoint circuit breakers, adaptive timeouts and hedging for agent calls.
+
+Each agent endpoint gets an ``EndpointGuard``:
+
+* a circuit breaker that opens after AI_BREAKER_FAILURE_THRESHOLD
+  consecutive failures (errors, timeouts or responses slower than the
+  endpoint's latency SLO), answers from the fallbacks while open, and
+  after AI_BREAKER_OPEN_SECONDS lets a single half-open probe through to
+  decide whether to close again;
+* a timeout derived from the observed p95 (times AI_TIMEOUT_P95_MULTIPLIER,
+  clamped between AI_TIMEOUT_MIN_SECONDS and the configured timeout);
+* for endpoints listed in AI_HEDGE_ENDPOINTS, a hedge delay after which a
+  second identical request is sent and the first success wins.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Below this many samples the observed latencies aren't trusted
+MIN_SAMPLES = 20
+
+
+class EndpointGuard:
+    def __init__(
+        self,
+        failure_threshold: int,
+        open_seconds: float,
+        latency_slo: float,
+        max_timeout: float,
+        min_timeout: float,
+        p95_multiplier: float,
+        adaptive: bool,
+        hedge: bool,
+        hedge_delay: float,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.latency_slo = latency_slo
+        self.max_timeout = max_timeout
+        self.min_timeout = min_timeout
+        self.p95_multiplier = p95_multiplier
+        self.adaptive = adaptive
+        self.hedge = hedge
+        self._hedge_delay = hedge_delay
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._latencies: deque = deque(maxlen=256)
+        self._p95: Optional[float] = None
+        self.counts = {
+            "calls": 0,
+            "failures": 0,
+            "slo_breaches": 0,
+            "short_circuited": 0,
+            "opened": 0,
+            "hedges_sent": 0,
+            "hedges_won": 0,
+        }
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream; False means answer from the fallback."""
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                self.counts["short_circuited"] += 1
+                return False
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                self.counts["short_circuited"] += 1
+                return False
+            self._probe_in_flight = True
+        self.counts["calls"] += 1
+        return True
+
+    def record_success(self, latency: float) -> None:
+        self._latencies.append(latency)
+        self._p95 = None
+        if latency > self.latency_slo:
+            self.counts["slo_breaches"] += 1
+            self.record_failure()
+            return
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+        self.state = CLOSED
+
+    def record_failure(self) -> None:
+        self.counts["failures"] += 1
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.counts["opened"] += 1
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+    def release(self) -> None:
+        """The call was cancelled before it finished; free the half-open probe slot."""
+        self._probe_in_flight = False
+
+    def p95(self) -> Optional[float]:
+        if len(self._latencies) < MIN_SAMPLES:
+            return None
+        if self._p95 is None:
+            ordered = sorted(self._latencies)
+            self._p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+        return self._p95
+
+    def timeout(self) -> float:
+        p95 = self.p95() if self.adaptive else None
+        if p95 is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p95 * self.p95_multiplier))
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait for the first attempt before hedging; None disables hedging."""
+        if not self.hedge:
+            return None
+        if self._hedge_delay > 0:
+            return self._hedge_delay
+        # Without enough samples, hedge at half the timeout rather than never
+        return self.p95() or self.timeout() / 2
+
+    def stats(self) -> Dict[str, Any]:
+        p95 = self.p95()
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "samples": len(self._latencies),
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "timeout_seconds": round(self.timeout(), 3),
+            "latency_slo_seconds": self.latency_slo,
+            "hedged": self.hedge,
+            **self.counts,
+        }
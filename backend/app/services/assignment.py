@@ -0,0 +1,124 @@
+"""Deterministic local assignment scoring, used as a fast path before Gemini.
+
+Candidates are scored on skill overlap with the task tags and on remaining
+capacity. When one member clearly wins, the answer is returned without an
+LLM round trip; ambiguous cases fall through to the agent.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.models import AIAssignmentResult
+
+COMPLEXITY_HOURS = {"low": 4.0, "medium": 8.0, "high": 16.0}
+COMPLEXITY_DAYS = {"low": 3, "medium": 7, "high": 14}
+STATUS_WEIGHT = {"active": 1.0, "busy": 0.5, "on_leave": 0.0}
+SKILL_WEIGHT = 0.7
+CAPACITY_WEIGHT = 0.3
+
+
+def _normalize(values: Optional[List[str]]) -> List[str]:
+    return [value.strip().lower() for value in values or [] if value and value.strip()]
+
+
+class TeamMatrix:
+    """Vectorized view of a team roster: one row per member, one column per skill."""
+
+    def __init__(self, team: List[Dict[str, Any]]) -> None:
+        self.members = team
+        self.vocabulary: Dict[str, int] = {}
+        for member in team:
+            for skill in _normalize(member.get("skills")):
+                self.vocabulary.setdefault(skill, len(self.vocabulary))
+        self.skills = np.zeros((len(team), max(len(self.vocabulary), 1)), dtype=np.float32)
+        for row, member in enumerate(team):
+            for skill in _normalize(member.get("skills")):
+                self.skills[row, self.vocabulary[skill]] = 1.0
+        self.capacity = np.array([float(m.get("capacity_hours") or 40.0) for m in team], dtype=np.float32)
+        self.assigned = np.array([float(m.get("assigned_hours") or 0.0) for m in team], dtype=np.float32)
+        self.status_weight = np.array(
+            [STATUS_WEIGHT.get(m.get("status") or "active", 1.0) for m in team], dtype=np.float32
+        )
+
+    def task_vectors(self, tasks: List[Dict[str, Any]]) -> np.ndarray:
+        vectors = np.zeros((len(tasks), self.skills.shape[1]), dtype=np.float32)
+        for row, task in enumerate(tasks):
+            for tag in _normalize(task.get("tags")):
+                column = self.vocabulary.get(tag)
+                if column is not None:
+                    vectors[row, column] = 1.0
+        return vectors
+
+    def score(self, tasks: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """Score every task against every member; arrays are shaped (tasks, members)."""
+        vectors = self.task_vectors(tasks)
+        tag_counts = np.array([max(len(_normalize(t.get("tags"))), 1) for t in tasks], dtype=np.float32)
+        hours = np.array(
+            [COMPLEXITY_HOURS.get(t.get("complexity") or "medium", 8.0) for t in tasks], dtype=np.float32
+        )
+        skill_match = (vectors @ self.skills.T) / tag_counts[:, None]
+        remaining = self.capacity - self.assigned
+        headroom = (remaining[None, :] - hours[:, None]) / np.maximum(self.capacity, 1.0)[None, :]
+        scores = (SKILL_WEIGHT * skill_match + CAPACITY_WEIGHT * np.clip(headroom, -1.0, 1.0)) * self.status_weight
+        return {"scores": scores, "skill_match": skill_match, "headroom": headroom, "hours": hours}
+
+
+class LocalAssignmentEngine:
+    """Answers obvious assignments locally; returns None when Gemini should decide."""
+
+    def __init__(self, threshold: float) -> None:
+        self._threshold = threshold
+
+    def predict(self, task: Dict[str, Any], team: List[Dict[str, Any]]) -> Optional[AIAssignmentResult]:
+        if not team or not task.get("tags"):
+            return None
+        return self.predict_many([task], TeamMatrix(team))[0]
+
+    def predict_many(self, tasks: List[Dict[str, Any]], matrix: TeamMatrix) -> List[Optional[AIAssignmentResult]]:
+        if not tasks or not matrix.members:
+            return [None] * len(tasks)
+        scored = matrix.score(tasks)
+        scores = scored["scores"]
+        rows = np.arange(len(tasks))
+        if scores.shape[1] > 1:
+            # Partial sort: column 0 holds each row's best member, column 1 the runner-up
+            top_two = np.argpartition(-scores, 1, axis=1)[:, :2]
+            best = top_two[:, 0]
+            runner_up = scores[rows, top_two[:, 1]]
+        else:
+            best = np.zeros(len(tasks), dtype=np.intp)
+            runner_up = np.zeros(len(tasks), dtype=np.float32)
+        margin = scores[rows, best] - runner_up
+        confident = (
+            (scored["skill_match"][rows, best] > 0)
+            & (scored["headroom"][rows, best] >= 0)
+            & (matrix.status_weight[best] > 0)
+            & (margin >= self._threshold)
+        )
+        return [
+            self._result(task, matrix.members[best[row]], float(scored["hours"][row]), float(margin[row]))
+            if confident[row]
+            else None
+            for row, task in enumerate(tasks)
+        ]
+
+    @staticmethod
+    def _result(task: Dict[str, Any], member: Dict[str, Any], hours: float, margin: float) -> AIAssignmentResult:
+        complexity = task.get("complexity") or "medium"
+        deadline = task.get("deadline") or date.today() + timedelta(days=COMPLEXITY_DAYS.get(complexity, 7))
+        return AIAssignmentResult(
+            predicted_hours=hours,
+            best_member_id=member.get("id"),
+            priority=task.get("priority") or 3,
+            deadline=deadline,
+            flowchart_next_step=task.get("flowchart_step") or "Development",
+            required_meeting=False,
+            meeting_suggestion=None,
+            reason=f"Local match: {member.get('name', member.get('id'))} has the matching skills and capacity "
+            f"(margin {margin:.2f})",
+            source="local",
+        )
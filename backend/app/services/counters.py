@@ -0,0 +1,103 @@
+"""Per-user workload counters maintained from task mutations.
+
+Every task write computes the change in its assignee's load (open hours,
+open task count and task counts by status) and applies it to the user
+document in the same transaction. The reconciliation job rebuilds the
+counters from a full task scan to repair drift:
+
+    python -m app.services.counters
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Dict, List
+
+TASK_STATUSES = ("open", "in_progress", "in_review", "blocked", "completed")
+TASK_LOAD_FIELDS = ["assigned_to", "predicted_hours", "status"]
+
+
+def task_load(task: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Counter contribution of one task, keyed by assignee; completed tasks add no open hours."""
+    user_id = task.get("assigned_to")
+    if not user_id:
+        return {}
+    status = task.get("status") or "open"
+    is_open = status != "completed"
+    return {
+        user_id: {
+            "assigned_hours": float(task.get("predicted_hours") or 0) if is_open else 0.0,
+            "open_tasks": 1 if is_open else 0,
+            f"task_counts.{status}": 1,
+        }
+    }
+
+
+def load_deltas(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Counter increments per user that turn ``before``'s contribution into ``after``'s."""
+    deltas: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for user_id, fields in task_load(after).items():
+        for field, value in fields.items():
+            deltas[user_id][field] += value
+    for user_id, fields in task_load(before).items():
+        for field, value in fields.items():
+            deltas[user_id][field] -= value
+    return {
+        user_id: {field: value for field, value in fields.items() if value}
+        for user_id, fields in deltas.items()
+        if any(fields.values())
+    }
+
+
+def apply_load_delta(user: Dict[str, Any], fields: Dict[str, float]) -> None:
+    """Apply increments in place, expanding ``task_counts.<status>`` paths (in-memory store)."""
+    for field, value in fields.items():
+        target = user
+        *parents, leaf = field.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = (target.get(leaf) or 0) + value
+
+
+def rebuild_counters(tasks: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Absolute counters per user from a full task list."""
+    counters: Dict[str, Dict[str, Any]] = defaultdict(
+        lambda: {"assigned_hours": 0.0, "open_tasks": 0, "task_counts": dict.fromkeys(TASK_STATUSES, 0)}
+    )
+    for task in tasks:
+        for user_id, fields in task_load(task).items():
+            apply_load_delta(counters[user_id], fields)
+    return counters
+
+
+def reconcile_workload() -> Dict[str, int]:
+    """Rewrite every user's counters from a full scan of tasks; returns scan statistics."""
+    from app.services.providers import get_firestore_service
+
+    from app.services.user_cache import get_user_cache
+
+    firestore = get_firestore_service()
+    # Compare against stored counters, not a cached roster
+    get_user_cache().invalidate()
+    tasks = firestore.list_tasks(fields=TASK_LOAD_FIELDS)
+    counters = rebuild_counters(tasks)
+    empty = {"assigned_hours": 0.0, "open_tasks": 0, "task_counts": dict.fromkeys(TASK_STATUSES, 0)}
+    corrected = 0
+    users = firestore.list_users()
+    for user in users:
+        expected = counters.get(user["id"], empty)
+        expected["assigned_hours"] = round(expected["assigned_hours"], 4)
+        current = {
+            "assigned_hours": round(float(user.get("assigned_hours") or 0), 4),
+            "open_tasks": user.get("open_tasks") or 0,
+            "task_counts": {**empty["task_counts"], **(user.get("task_counts") or {})},
+        }
+        if current != expected:
+            firestore.upsert_user(user["id"], expected)
+            corrected += 1
+    return {"tasks": len(tasks), "users": len(users), "corrected": corrected}
+
+
+if __name__ == "__main__":
+    stats = reconcile_workload()
+    print(f"✅ Reconciled workload counters: {stats}")
@@ -0,0 +1,270 @@
+"""Background AI enrichment for newly created tasks.
+
+POST /tasks persists the task with ``ai_status="pending"`` and hands its id to
+an in-process worker pool, which runs the assignment prediction with retries
+and patches the task. The same pool runs standalone for scale-out:
+
+    python -m app.services.enrichment
+
+In standalone mode it polls Firestore for pending tasks; set
+ENRICHMENT_MODE=external on the API so it only persists them.
+
+Several API instances and workers may sweep the same pending tasks, so a
+worker first claims a task in a transaction (``pending`` -> ``running``
+with a claim id and a lease of ENRICHMENT_LEASE_SECONDS) and applies the
+prediction in a second transaction that requires its claim to still hold.
+Fields the user edited meanwhile are left alone, and a task deleted
+meanwhile stays deleted.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import uuid
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from app.config import get_settings
+from app.models import AIAssignmentResult
+from app.services.providers import get_ai_service, get_async_firestore_service
+
+
+def assignment_update(prediction: AIAssignmentResult, task: Dict[str, Any]) -> Dict[str, Any]:
+    """Task fields patched from an assignment prediction."""
+    update = {
+        "assigned_to": prediction.best_member_id,
+        "predicted_hours": prediction.predicted_hours,
+        "priority": prediction.priority or task.get("priority"),
+        "deadline": prediction.deadline.isoformat() if prediction.deadline else task.get("deadline"),
+        "flowchart_step": prediction.flowchart_next_step or task.get("flowchart_step"),
+        "ai_reason": prediction.reason,
+        "updated_at": datetime.utcnow().isoformat(),
+    }
+    if prediction.required_meeting and prediction.meeting_suggestion:
+        update["meeting_suggestion"] = prediction.meeting_suggestion.model_dump(mode="json")
+    return update
+
+
+# Task fields a prediction fills in, and that users can also set themselves
+PREDICTED_FIELDS = ("assigned_to", "predicted_hours", "priority", "deadline", "flowchart_step", "meeting_suggestion")
+
+TaskPatch = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+def claim_patch(claim: str, lease_seconds: float) -> TaskPatch:
+    """Move a pending task (or one whose lease ran out) to running under ``claim``."""
+
+    def build(task: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        now = datetime.utcnow()
+        status = task.get("ai_status")
+        if status == "running":
+            expires = task.get("ai_lease_expires_at")
+            if expires and expires > now.isoformat():
+                return None
+        elif status != "pending":
+            return None
+        return {
+            "ai_status": "running",
+            "ai_claim": claim,
+            "ai_lease_expires_at": (now + timedelta(seconds=lease_seconds)).isoformat(),
+        }
+
+    return build
+
+
+def result_patch(claim: str, claimed: Dict[str, Any], update: Dict[str, Any]) -> TaskPatch:
+    """Apply ``update`` only while ``claim`` holds, without overwriting fields the user set.
+
+    A predicted field is skipped if it changed since the claim, or if it
+    already had a value and the task had been edited before the claim.
+    """
+    edited_before_claim = claimed.get("updated_at") != claimed.get("created_at")
+
+    def build(task: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if task.get("ai_status") != "running" or task.get("ai_claim") != claim:
+            return None
+        patch = {"ai_claim": None, "ai_lease_expires_at": None}
+        for field, value in update.items():
+            if field in PREDICTED_FIELDS:
+                current = task.get(field)
+                if current != claimed.get(field) or (current is not None and edited_before_claim):
+                    continue
+            patch[field] = value
+        return patch
+
+    return build
+
+
+async def enrich_task(task_id: str, max_retries: int, retry_backoff: float) -> Optional[Dict[str, Any]]:
+    """Claim, predict and apply an assignment for one task, retrying on agent failures.
+
+    Returns the updated task, or None when the task is gone or another
+    worker holds it.
+    """
+    firestore = get_async_firestore_service()
+    claim = uuid.uuid4().hex
+    task = await firestore.patch_task(task_id, claim_patch(claim, get_settings().enrichment_lease_seconds))
+    if task is None:
+        return None
+    last_error = ""
+    for attempt in range(1, max_retries + 1):
+        try:
+            team = await firestore.list_users()
+            prediction = await get_ai_service().predict_assignment(task, team)
+            if prediction.fallback:
+                raise ValueError(prediction.reason or "AI agent unavailable")
+            update = assignment_update(prediction, task)
+            update.update({"ai_status": "complete", "ai_attempts": attempt, "ai_error": None})
+            return await firestore.patch_task(task_id, result_patch(claim, task, update))
+        except Exception as e:
+            last_error = str(e)
+            print(f"⚠️ Enrichment attempt {attempt}/{max_retries} failed for {task_id}: {e}")
+            if attempt < max_retries:
+                await asyncio.sleep(retry_backoff * 2 ** (attempt - 1))
+    failure = {
+        "ai_status": "failed",
+        "ai_attempts": max_retries,
+        "ai_error": last_error,
+        "ai_reason": f"AI unavailable: {last_error}",
+        "updated_at": datetime.utcnow().isoformat(),
+    }
+    return await firestore.patch_task(task_id, result_patch(claim, task, failure))
+
+
+class EnrichmentPool:
+    """Bounded queue of task ids drained by a fixed number of worker coroutines."""
+
+    def __init__(self, workers: int, queue_size: int, max_retries: int, retry_backoff: float) -> None:
+        self._worker_count = workers
+        self._queue_size = queue_size
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._pending_ids: Set[str] = set()
+        self._feeders: Set[asyncio.Task] = set()
+        self._counts = {"enqueued": 0, "completed": 0, "failed": 0, "skipped": 0, "rejected": 0}
+
+    async def start(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._queue_size)
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self._worker_count)]
+
+    async def stop(self) -> None:
+        background = [*self._feeders, *self._workers]
+        for task in background:
+            task.cancel()
+        for task in background:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._feeders.clear()
+        self._workers = []
+        self._queue = None
+        self._pending_ids.clear()
+
+    def submit(self, task_id: str) -> bool:
+        """Queue a task for enrichment; False means the pool is full or not running."""
+        if self._queue is None:
+            return False
+        if task_id in self._pending_ids:
+            return True
+        try:
+            self._queue.put_nowait(task_id)
+        except asyncio.QueueFull:
+            self._counts["rejected"] += 1
+            return False
+        self._pending_ids.add(task_id)
+        self._counts["enqueued"] += 1
+        return True
+
+    def submit_many(self, task_ids: List[str]) -> bool:
+        """Queue a bulk import without blocking the caller; waits for queue space in the background."""
+        if self._queue is None:
+            return False
+        feeder = asyncio.create_task(self._feed(task_ids))
+        self._feeders.add(feeder)
+        feeder.add_done_callback(self._feeders.discard)
+        return True
+
+    async def _feed(self, task_ids: List[str]) -> None:
+        for task_id in task_ids:
+            if task_id in self._pending_ids:
+                continue
+            self._pending_ids.add(task_id)
+            await self._queue.put(task_id)
+            self._counts["enqueued"] += 1
+
+    async def sweep_pending(self) -> int:
+        """Queue tasks left pending in Firestore (restarts, external mode) and claims whose lease ran out."""
+        if self._queue is None:
+            return 0
+        room = self._queue.maxsize - self._queue.qsize()
+        if room <= 0:
+            return 0
+        firestore = get_async_firestore_service()
+        tasks = await firestore.list_tasks(filters={"ai_status": "pending"}, limit=room, fields=["ai_status"])
+        if len(tasks) < room:
+            now = datetime.utcnow().isoformat()
+            running = await firestore.list_tasks(filters={"ai_status": "running"}, fields=["ai_lease_expires_at"])
+            expired = [task for task in running if (task.get("ai_lease_expires_at") or "") <= now]
+            tasks += expired[:room - len(tasks)]
+        return sum(1 for task in tasks if self.submit(task["id"]))
+
+    async def _work(self) -> None:
+        while True:
+            task_id = await self._queue.get()
+            try:
+                result = await enrich_task(task_id, self._max_retries, self._retry_backoff)
+                if result is None:
+                    self._counts["skipped"] += 1
+                else:
+                    self._counts["completed" if result.get("ai_status") == "complete" else "failed"] += 1
+            except Exception as e:
+                self._counts["failed"] += 1
+                print(f"⚠️ Enrichment failed for {task_id}: {e}")
+            finally:
+                self._pending_ids.discard(task_id)
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._queue is not None,
+            "workers": len(self._workers),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_size": self._queue_size,
+            **self._counts,
+        }
+
+
+@lru_cache
+def get_enrichment_pool() -> EnrichmentPool:
+    settings = get_settings()
+    return EnrichmentPool(
+        workers=settings.enrichment_workers,
+        queue_size=settings.enrichment_queue_size,
+        max_retries=settings.enrichment_max_retries,
+        retry_backoff=settings.enrichment_retry_backoff_seconds,
+    )
+
+
+async def run_worker() -> None:
+    settings = get_settings()
+    pool = get_enrichment_pool()
+    await get_ai_service().start()
+    await pool.start()
+    print(f"🚀 Enrichment worker started ({settings.enrichment_workers} workers)")
+    try:
+        while True:
+            queued = await pool.sweep_pending()
+            if queued:
+                print(f"   queued {queued} pending task(s)")
+            await asyncio.sleep(settings.enrichment_poll_seconds)
+    finally:
+        await pool.stop()
+        await get_ai_service().aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
@@ -1,43 +1,171 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from google.cloud import firestore
 from google.api_core import exceptions as gcp_exceptions
 
 from app.config import get_settings
+from app.services.activity import ACTIVITY_SUBCOLLECTION, activity_patch
+from app.services.counters import load_deltas
+from app.services.metrics import instrument
+from app.services.threads import LAST_MESSAGE_FIELD, next_message_time
+from app.services.user_cache import USER_LOADERS, AsyncCachedUserReads, CachedUserReads, get_user_cache
 
+# Firestore's cap on writes in one batched commit
+BATCH_WRITE_LIMIT = 500
 
-class FirestoreService:
-    """Lightweight wrapper around Firestore collections."""
 
-    def __init__(self) -> None:
+class _FirestoreCollections:
+    """Collection names and query builders shared by the sync and async services."""
+
+    def __init__(self, client) -> None:
         settings = get_settings()
-        self._client = firestore.Client(project=settings.project_id)
+        self._client = client
         self._tasks_col = settings.firestore_collection_tasks
         self._users_col = settings.firestore_collection_users
         self._messages_col = settings.firestore_collection_messages
         self._meetings_col = settings.firestore_collection_meetings
         self._updates_col = settings.firestore_collection_updates
+        self._activity_window = settings.activity_recent_window
 
     def _collection(self, name: str):
         return self._client.collection(name)
 
-    # Tasks
-    def create_task(self, payload: Dict[str, Any]) -> str:
+    def _activity_collection(self, task_id: str):
+        return self._collection(self._tasks_col).document(task_id).collection(ACTIVITY_SUBCOLLECTION)
+
+    def _add_new_task(self, batch, payload: Dict[str, Any]) -> None:
+        """Add a new task plus its initial activity entries (in the subcollection) to ``batch``."""
         doc_ref = self._collection(self._tasks_col).document()
         payload["id"] = doc_ref.id
-        doc_ref.set(payload)
-        return doc_ref.id
+        activity_col = self._activity_collection(doc_ref.id)
+        entries = [{**entry, "id": activity_col.document().id} for entry in payload.get("activity_log") or []]
+        payload["activity_log"] = entries[-self._activity_window:] if self._activity_window > 0 else []
+        batch.set(doc_ref, payload)
+        for entry in entries:
+            batch.set(activity_col.document(entry["id"]), entry)
+
+    def _new_task_batches(self, payloads: List[Dict[str, Any]]):
+        """Group new tasks into batches of at most BATCH_WRITE_LIMIT writes; yields (batch, indexes)."""
+        batch, indexes, writes = self._client.batch(), [], 0
+        for index, payload in enumerate(payloads):
+            task_writes = 1 + len(payload.get("activity_log") or [])
+            if indexes and writes + task_writes > BATCH_WRITE_LIMIT:
+                yield batch, indexes
+                batch, indexes, writes = self._client.batch(), [], 0
+            self._add_new_task(batch, payload)
+            indexes.append(index)
+            writes += task_writes
+        if indexes:
+            yield batch, indexes
+
+    def _user_refs(self, deltas: Dict[str, Dict[str, float]]):
+        return [self._collection(self._users_col).document(user_id) for user_id in deltas]
+
+    @staticmethod
+    def _write_load_deltas(transaction, user_snapshots, deltas: Dict[str, Dict[str, float]]) -> None:
+        """Increment workload counters of assignees that have a profile."""
+        for snapshot in user_snapshots:
+            if snapshot.exists:
+                fields = deltas[snapshot.id]
+                transaction.update(snapshot.reference, {f: firestore.Increment(v) for f, v in fields.items()})
+
+    def _tasks_query(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+    ):
+        query = self._collection(self._tasks_col)
+        if filters:
+            for field, value in filters.items():
+                query = query.where(field, "==", value)
+        if fields:
+            query = query.select(sorted({"id", "created_at", *fields}))
+        query = query.order_by("created_at", direction=firestore.Query.DESCENDING)
+        if limit:
+            query = query.limit(limit)
+        return query
+
+    def _activity_query(self, task_id: str, limit: int):
+        return (
+            self._activity_collection(task_id)
+            .order_by("timestamp", direction=firestore.Query.DESCENDING)
+            .limit(limit)
+        )
+
+    def _messages_query(self, task_id: str, since: Optional[str] = None, limit: Optional[int] = None):
+        query = self._collection(self._messages_col).where("task_id", "==", task_id)
+        if since:
+            query = query.where("created_at", ">", since)
+        query = query.order_by("created_at", direction=firestore.Query.ASCENDING)
+        if limit:
+            query = query.limit(limit)
+        return query
+
+    def _latest_messages_query(self, task_id: str, limit: int, since: Optional[str] = None):
+        query = self._collection(self._messages_col).where("task_id", "==", task_id)
+        if since:
+            query = query.where("created_at", ">", since)
+        return query.order_by("created_at", direction=firestore.Query.DESCENDING).limit(limit)
+
+    def _meetings_query(self, filters: Optional[Dict[str, Any]] = None):
+        query = self._collection(self._meetings_col)
+        if filters:
+            for key, value in filters.items():
+                query = query.where(key, "==", value)
+        return query.order_by("date", direction=firestore.Query.ASCENDING)
+
+    def _updates_query(self, limit: int):
+        return (
+            self._collection(self._updates_col)
+            .order_by("created_at", direction=firestore.Query.DESCENDING)
+            .limit(limit)
+        )
 
-    def list_tasks(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+
+@instrument("firestore", *USER_LOADERS)
+class FirestoreService(CachedUserReads, _FirestoreCollections):
+    """Lightweight wrapper around Firestore collections."""
+
+    def __init__(self) -> None:
+        super().__init__(firestore.Client(project=get_settings().project_id))
+
+    # Tasks
+    def create_task(self, payload: Dict[str, Any]) -> str:
+        batch = self._client.batch()
+        self._add_new_task(batch, payload)
+        batch.commit()
+        return payload["id"]
+
+    def create_tasks(self, payloads: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Create tasks with batched writes; returns an error message per payload (None on success)."""
+        errors: List[Optional[str]] = [None] * len(payloads)
+        for batch, indexes in self._new_task_batches(payloads):
+            try:
+                batch.commit()
+            except gcp_exceptions.GoogleAPICallError as e:
+                for index in indexes:
+                    errors[index] = str(e)
+        return errors
+
+    def list_tasks(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """List tasks newest first; ``start_after`` is the id of the last task of the previous page."""
+        query = self._tasks_query(filters, limit, fields)
+        if start_after:
+            cursor = self._collection(self._tasks_col).document(start_after).get()
+            if not cursor.exists:
+                raise KeyError(f"Task {start_after} not found")
+            query = query.start_after(cursor)
         try:
-            query = self._collection(self._tasks_col)
-            if filters:
-                for field, value in filters.items():
-                    query = query.where(field, "==", value)
-            snapshot = query.order_by("created_at", direction=firestore.Query.DESCENDING).stream()
-            return [doc.to_dict() for doc in snapshot]
+            return [doc.to_dict() for doc in query.stream()]
         except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied):
             return []
 
@@ -47,39 +175,186 @@ class FirestoreService:
             raise KeyError(f"Task {task_id} not found")
         return doc.to_dict()
 
+    def get_tasks(self, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch several tasks in one round trip; missing ids are absent from the result."""
+        refs = [self._collection(self._tasks_col).document(task_id) for task_id in task_ids]
+        return {doc.id: doc.to_dict() for doc in self._client.get_all(refs) if doc.exists}
+
     def update_task(self, task_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        doc_ref = self._collection(self._tasks_col).document(task_id)
-        doc_ref.set(payload, merge=True)
-        return doc_ref.get().to_dict()
+        """Merge ``payload`` into the task and move the assignee workload counters in one transaction."""
+        task_ref = self._collection(self._tasks_col).document(task_id)
+        changed: List[str] = []
+
+        @firestore.transactional
+        def update(transaction):
+            snapshot = task_ref.get(transaction=transaction)
+            task = snapshot.to_dict() if snapshot.exists else {}
+            updated = {**task, **payload}
+            deltas = load_deltas(task, updated)
+            changed[:] = deltas
+            users = [ref.get(transaction=transaction) for ref in self._user_refs(deltas)]
+            transaction.set(task_ref, payload, merge=True)
+            self._write_load_deltas(transaction, users, deltas)
+            return updated
+
+        result = update(self._client.transaction())
+        if changed:
+            get_user_cache().invalidate(changed)
+        return result
+
+    def patch_task(
+        self, task_id: str, build_patch: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Apply ``build_patch(task)`` in one transaction; None if the task is gone or no patch was built."""
+        task_ref = self._collection(self._tasks_col).document(task_id)
+        changed: List[str] = []
+
+        @firestore.transactional
+        def patch_in(transaction):
+            snapshot = task_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return None
+            task = snapshot.to_dict()
+            patch = build_patch(task)
+            if patch is None:
+                return None
+            updated = {**task, **patch}
+            deltas = load_deltas(task, updated)
+            changed[:] = deltas
+            users = [ref.get(transaction=transaction) for ref in self._user_refs(deltas)]
+            transaction.set(task_ref, patch, merge=True)
+            self._write_load_deltas(transaction, users, deltas)
+            return updated
+
+        result = patch_in(self._client.transaction())
+        if changed:
+            get_user_cache().invalidate(changed)
+        return result
+
+    # Activity
+    def append_activity(
+        self,
+        task_id: str,
+        entry: Dict[str, str],
+        updates: Optional[Dict[str, Any]] = None,
+        watcher: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Append an activity entry and apply ``updates`` to the task in one transaction."""
+        task_ref = self._collection(self._tasks_col).document(task_id)
+        activity_col = self._activity_collection(task_id)
+        changed: List[str] = []
+
+        @firestore.transactional
+        def append(transaction):
+            snapshot = task_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                raise KeyError(f"Task {task_id} not found")
+            task = snapshot.to_dict()
+            patch, new_entries = activity_patch(
+                task, entry, updates, watcher, self._activity_window, lambda: activity_col.document().id
+            )
+            updated = {**task, **patch}
+            deltas = load_deltas(task, updated)
+            changed[:] = deltas
+            users = [ref.get(transaction=transaction) for ref in self._user_refs(deltas)]
+            for new_entry in new_entries:
+                transaction.set(activity_col.document(new_entry["id"]), new_entry)
+            transaction.set(task_ref, patch, merge=True)
+            self._write_load_deltas(transaction, users, deltas)
+            return updated
+
+        result = append(self._client.transaction())
+        if changed:
+            get_user_cache().invalidate(changed)
+        return result
+
+    def list_activity(
+        self, task_id: str, limit: int = 50, start_after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Full activity history, newest first; ``start_after`` is the id of the last entry seen."""
+        query = self._activity_query(task_id, limit)
+        if start_after:
+            cursor = self._activity_collection(task_id).document(start_after).get()
+            if not cursor.exists:
+                raise KeyError(f"Activity {start_after} not found")
+            query = query.start_after(cursor)
+        try:
+            return [doc.to_dict() for doc in query.stream()]
+        except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied):
+            return []
+
+    # Listeners
+    def watch(
+        self,
+        name: str,
+        field: Optional[str],
+        since: Optional[str],
+        callback: Callable[[str, Dict[str, Any]], None],
+    ) -> Callable[[], None]:
+        """Snapshot listener for documents in ``name`` whose ``field`` is newer than ``since``.
+
+        Without ``field`` the whole collection is watched. ``callback(change, doc)``
+        runs on the listener thread with change in added/modified/removed.
+        Returns the function that stops the listener.
+        """
+        query = self._collection(name)
+        if field:
+            query = query.where(field, ">", since)
+
+        def on_snapshot(snapshots, changes, read_time):
+            for change in changes:
+                callback(change.type.name.lower(), change.document.to_dict())
+
+        return query.on_snapshot(on_snapshot).unsubscribe
 
     # Messages
     def create_message(self, payload: Dict[str, Any]) -> str:
+        """Store a message stamped after the newest one in its thread (see app.services.threads)."""
+        task_ref = self._collection(self._tasks_col).document(payload["task_id"])
         doc_ref = self._collection(self._messages_col).document()
         payload["id"] = doc_ref.id
-        doc_ref.set(payload)
+        requested = payload.get("created_at")
+
+        @firestore.transactional
+        def create(transaction):
+            snapshot = task_ref.get(transaction=transaction)
+            last = snapshot.to_dict().get(LAST_MESSAGE_FIELD) if snapshot.exists else None
+            payload["created_at"] = next_message_time(last, requested)
+            transaction.set(doc_ref, payload)
+            if snapshot.exists:
+                transaction.update(task_ref, {LAST_MESSAGE_FIELD: payload["created_at"]})
+
+        create(self._client.transaction())
         return doc_ref.id
 
-    def list_messages(self, task_id: str) -> List[Dict[str, Any]]:
+    def list_messages(
+        self, task_id: str, since: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Thread messages oldest first; ``since`` is the ``created_at`` of the last message seen."""
         try:
-            snapshot = (
-                self._collection(self._messages_col)
-                .where("task_id", "==", task_id)
-                .order_by("created_at", direction=firestore.Query.ASCENDING)
-                .stream()
-            )
-            return [doc.to_dict() for doc in snapshot]
+            return [doc.to_dict() for doc in self._messages_query(task_id, since, limit).stream()]
         except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied):
             return []
 
+    def latest_messages(
+        self, task_id: str, limit: int, since: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """The newest ``limit`` messages (after ``since`` if given), returned oldest first."""
+        try:
+            docs = [doc.to_dict() for doc in self._latest_messages_query(task_id, limit, since).stream()]
+        except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied):
+            return []
+        return docs[::-1]
+
     # Users
-    def list_users(self) -> List[Dict[str, Any]]:
+    def _load_users(self) -> List[Dict[str, Any]]:
         try:
             snapshot = self._collection(self._users_col).stream()
             return [doc.to_dict() for doc in snapshot]
         except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied):
             return []
 
-    def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+    def _load_user(self, user_id: str) -> Optional[Dict[str, Any]]:
         try:
             doc = self._collection(self._users_col).document(user_id).get()
             return doc.to_dict() if doc.exists else None
@@ -87,7 +362,7 @@ class FirestoreService:
             # Database doesn't exist yet or permission issue - return None
             return None
 
-    def upsert_user(self, user_id: str, payload: Dict[str, Any]) -> None:
+    def _store_user(self, user_id: str, payload: Dict[str, Any]) -> None:
         try:
             self._collection(self._users_col).document(user_id).set(payload, merge=True)
         except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied) as e:
@@ -104,12 +379,7 @@ class FirestoreService:
 
     def list_meetings(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         try:
-            query = self._collection(self._meetings_col)
-            if filters:
-                for key, value in filters.items():
-                    query = query.where(key, "==", value)
-            snapshot = query.order_by("date", direction=firestore.Query.ASCENDING).stream()
-            return [doc.to_dict() for doc in snapshot]
+            return [doc.to_dict() for doc in self._meetings_query(filters).stream()]
         except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied):
             return []
 
@@ -128,14 +398,246 @@ class FirestoreService:
 
     def list_updates(self, limit: int = 20) -> List[Dict[str, Any]]:
         try:
-            snapshot = (
-                self._collection(self._updates_col)
-                .order_by("created_at", direction=firestore.Query.DESCENDING)
-                .limit(limit)
-                .stream()
+            return [doc.to_dict() for doc in self._updates_query(limit).stream()]
+        except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied):
+            return []
+
+
+@instrument("firestore", *USER_LOADERS)
+class AsyncFirestoreService(AsyncCachedUserReads, _FirestoreCollections):
+    """Same surface as FirestoreService, built on the asyncio Firestore client."""
+
+    def __init__(self) -> None:
+        super().__init__(firestore.AsyncClient(project=get_settings().project_id))
+
+    # Tasks
+    async def create_task(self, payload: Dict[str, Any]) -> str:
+        batch = self._client.batch()
+        self._add_new_task(batch, payload)
+        await batch.commit()
+        return payload["id"]
+
+    async def create_tasks(self, payloads: List[Dict[str, Any]]) -> List[Optional[str]]:
+        errors: List[Optional[str]] = [None] * len(payloads)
+        for batch, indexes in self._new_task_batches(payloads):
+            try:
+                await batch.commit()
+            except gcp_exceptions.GoogleAPICallError as e:
+                for index in indexes:
+                    errors[index] = str(e)
+        return errors
+
+    async def list_tasks(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        query = self._tasks_query(filters, limit, fields)
+        if start_after:
+            cursor = await self._collection(self._tasks_col).document(start_after).get()
+            if not cursor.exists:
+                raise KeyError(f"Task {start_after} not found")
+            query = query.start_after(cursor)
+        try:
+            return [doc.to_dict() async for doc in query.stream()]
+        except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied):
+            return []
+
+    async def get_task(self, task_id: str) -> Dict[str, Any]:
+        doc = await self._collection(self._tasks_col).document(task_id).get()
+        if not doc.exists:
+            raise KeyError(f"Task {task_id} not found")
+        return doc.to_dict()
+
+    async def get_tasks(self, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        refs = [self._collection(self._tasks_col).document(task_id) for task_id in task_ids]
+        return {doc.id: doc.to_dict() async for doc in self._client.get_all(refs) if doc.exists}
+
+    async def update_task(self, task_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        task_ref = self._collection(self._tasks_col).document(task_id)
+        changed: List[str] = []
+
+        @firestore.async_transactional
+        async def update(transaction):
+            snapshot = await task_ref.get(transaction=transaction)
+            task = snapshot.to_dict() if snapshot.exists else {}
+            updated = {**task, **payload}
+            deltas = load_deltas(task, updated)
+            changed[:] = deltas
+            users = [await ref.get(transaction=transaction) for ref in self._user_refs(deltas)]
+            transaction.set(task_ref, payload, merge=True)
+            self._write_load_deltas(transaction, users, deltas)
+            return updated
+
+        result = await update(self._client.transaction())
+        if changed:
+            get_user_cache().invalidate(changed)
+        return result
+
+    async def patch_task(
+        self, task_id: str, build_patch: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+    ) -> Optional[Dict[str, Any]]:
+        task_ref = self._collection(self._tasks_col).document(task_id)
+        changed: List[str] = []
+
+        @firestore.async_transactional
+        async def patch_in(transaction):
+            snapshot = await task_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return None
+            task = snapshot.to_dict()
+            patch = build_patch(task)
+            if patch is None:
+                return None
+            updated = {**task, **patch}
+            deltas = load_deltas(task, updated)
+            changed[:] = deltas
+            users = [await ref.get(transaction=transaction) for ref in self._user_refs(deltas)]
+            transaction.set(task_ref, patch, merge=True)
+            self._write_load_deltas(transaction, users, deltas)
+            return updated
+
+        result = await patch_in(self._client.transaction())
+        if changed:
+            get_user_cache().invalidate(changed)
+        return result
+
+    # Activity
+    async def append_activity(
+        self,
+        task_id: str,
+        entry: Dict[str, str],
+        updates: Optional[Dict[str, Any]] = None,
+        watcher: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        task_ref = self._collection(self._tasks_col).document(task_id)
+        activity_col = self._activity_collection(task_id)
+        changed: List[str] = []
+
+        @firestore.async_transactional
+        async def append(transaction):
+            snapshot = await task_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                raise KeyError(f"Task {task_id} not found")
+            task = snapshot.to_dict()
+            patch, new_entries = activity_patch(
+                task, entry, updates, watcher, self._activity_window, lambda: activity_col.document().id
             )
-            return [doc.to_dict() for doc in snapshot]
+            updated = {**task, **patch}
+            deltas = load_deltas(task, updated)
+            changed[:] = deltas
+            users = [await ref.get(transaction=transaction) for ref in self._user_refs(deltas)]
+            for new_entry in new_entries:
+                transaction.set(activity_col.document(new_entry["id"]), new_entry)
+            transaction.set(task_ref, patch, merge=True)
+            self._write_load_deltas(transaction, users, deltas)
+            return updated
+
+        result = await append(self._client.transaction())
+        if changed:
+            get_user_cache().invalidate(changed)
+        return result
+
+    async def list_activity(
+        self, task_id: str, limit: int = 50, start_after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        query = self._activity_query(task_id, limit)
+        if start_after:
+            cursor = await self._activity_collection(task_id).document(start_after).get()
+            if not cursor.exists:
+                raise KeyError(f"Activity {start_after} not found")
+            query = query.start_after(cursor)
+        try:
+            return [doc.to_dict() async for doc in query.stream()]
         except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied):
             return []
 
+    # Messages
+    async def create_message(self, payload: Dict[str, Any]) -> str:
+        task_ref = self._collection(self._tasks_col).document(payload["task_id"])
+        doc_ref = self._collection(self._messages_col).document()
+        payload["id"] = doc_ref.id
+        requested = payload.get("created_at")
+
+        @firestore.async_transactional
+        async def create(transaction):
+            snapshot = await task_ref.get(transaction=transaction)
+            last = snapshot.to_dict().get(LAST_MESSAGE_FIELD) if snapshot.exists else None
+            payload["created_at"] = next_message_time(last, requested)
+            transaction.set(doc_ref, payload)
+            if snapshot.exists:
+                transaction.update(task_ref, {LAST_MESSAGE_FIELD: payload["created_at"]})
 
+        await create(self._client.transaction())
+        return doc_ref.id
+
+    async def list_messages(
+        self, task_id: str, since: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        try:
+            return [doc.to_dict() async for doc in self._messages_query(task_id, since, limit).stream()]
+        except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied):
+            return []
+
+    async def latest_messages(
+        self, task_id: str, limit: int, since: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        try:
+            docs = [doc.to_dict() async for doc in self._latest_messages_query(task_id, limit, since).stream()]
+        except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied):
+            return []
+        return docs[::-1]
+
+    # Users
+    async def _load_users(self) -> List[Dict[str, Any]]:
+        try:
+            return [doc.to_dict() async for doc in self._collection(self._users_col).stream()]
+        except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied):
+            return []
+
+    async def _load_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            doc = await self._collection(self._users_col).document(user_id).get()
+            return doc.to_dict() if doc.exists else None
+        except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied):
+            return None
+
+    async def _store_user(self, user_id: str, payload: Dict[str, Any]) -> None:
+        try:
+            await self._collection(self._users_col).document(user_id).set(payload, merge=True)
+        except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied) as e:
+            raise ValueError(f"Firestore database not available: {e}") from e
+
+    # Meetings
+    async def create_meeting(self, payload: Dict[str, Any]) -> str:
+        doc_ref = self._collection(self._meetings_col).document()
+        payload["id"] = doc_ref.id
+        await doc_ref.set(payload)
+        return doc_ref.id
+
+    async def list_meetings(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        try:
+            return [doc.to_dict() async for doc in self._meetings_query(filters).stream()]
+        except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied):
+            return []
+
+    async def get_meeting(self, meeting_id: str) -> Dict[str, Any]:
+        doc = await self._collection(self._meetings_col).document(meeting_id).get()
+        if not doc.exists:
+            raise KeyError(f"Meeting {meeting_id} not found")
+        return doc.to_dict()
+
+    # Updates
+    async def create_update(self, payload: Dict[str, Any]) -> str:
+        doc_ref = self._collection(self._updates_col).document()
+        payload["id"] = doc_ref.id
+        await doc_ref.set(payload)
+        return doc_ref.id
+
+    async def list_updates(self, limit: int = 20) -> List[Dict[str, Any]]:
+        try:
+            return [doc.to_dict() async for doc in self._updates_query(limit).stream()]
+        except (gcp_exceptions.NotFound, gcp_exceptions.PermissionDenied):
+            return []
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import copy
+import json
+import os
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import get_settings
+from app.services.activity import ACTIVITY_SUBCOLLECTION, activity_patch
+from app.services.counters import apply_load_delta, load_deltas
+from app.services.metrics import instrument
+from app.services.threads import LAST_MESSAGE_FIELD, next_message_time
+from app.services.user_cache import USER_LOADERS, CachedUserReads, get_user_cache
+
+
+@instrument("firestore", *USER_LOADERS)
+class InMemoryFirestoreService(CachedUserReads):
+    """Dict-backed stand-in for FirestoreService, used for local runs and benchmarks."""
+
+    def __init__(self) -> None:
+        settings = get_settings()
+        self._tasks_col = settings.firestore_collection_tasks
+        self._users_col = settings.firestore_collection_users
+        self._messages_col = settings.firestore_collection_messages
+        self._meetings_col = settings.firestore_collection_meetings
+        self._updates_col = settings.firestore_collection_updates
+        self._activity_window = settings.activity_recent_window
+        self._collections: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.RLock()
+        self._watchers: Dict[str, List[Callable[[str, Dict[str, Any]], None]]] = {}
+
+    def _docs(self, name: str) -> Dict[str, Dict[str, Any]]:
+        return self._collections.setdefault(name, {})
+
+    @staticmethod
+    def _new_id() -> str:
+        return uuid.uuid4().hex[:20]
+
+    def _activity_col(self, task_id: str) -> str:
+        return f"{self._tasks_col}/{task_id}/{ACTIVITY_SUBCOLLECTION}"
+
+    def _apply_load_deltas(self, before: Dict[str, Any], after: Dict[str, Any]) -> None:
+        users = self._docs(self._users_col)
+        deltas = load_deltas(before, after)
+        for user_id, fields in deltas.items():
+            if user_id in users:
+                apply_load_delta(users[user_id], fields)
+        if deltas:
+            get_user_cache().invalidate(deltas)
+
+    def _notify(self, name: str, change: str, doc: Dict[str, Any]) -> None:
+        for callback in self._watchers.get(name, []):
+            callback(change, copy.deepcopy(doc))
+
+    def _insert(self, name: str, payload: Dict[str, Any]) -> str:
+        with self._lock:
+            doc_id = payload.get("id") or self._new_id()
+            payload["id"] = doc_id
+            self._docs(name)[doc_id] = copy.deepcopy(payload)
+            self._notify(name, "added", payload)
+            return doc_id
+
+    def _select(
+        self,
+        name: str,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        descending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            docs = [
+                copy.deepcopy(doc)
+                for doc in self._docs(name).values()
+                if all(doc.get(field) == value for field, value in (filters or {}).items())
+            ]
+        if order_by:
+            # Firestore drops documents missing the order_by field
+            docs = [doc for doc in docs if doc.get(order_by) is not None]
+            docs.sort(key=lambda doc: doc[order_by], reverse=descending)
+        return docs
+
+    def load(self, name: str, documents: List[Dict[str, Any]]) -> None:
+        for document in documents:
+            self._insert(name, document)
+
+    def load_fixtures(self, directory: str) -> Dict[str, int]:
+        """Load the NDJSON fixtures written by synthetic_data.py; returns documents loaded per file.
+
+        Documents are freshly parsed, so they are stored without the copy and
+        watcher notification of ``_insert``; activity entries go to their
+        task's subcollection.
+        """
+        targets = {
+            "users": self._users_col,
+            "tasks": self._tasks_col,
+            "activity": None,
+            "messages": self._messages_col,
+            "meetings": self._meetings_col,
+            "updates": self._updates_col,
+        }
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for name, collection in targets.items():
+                path = os.path.join(directory, f"{name}.ndjson")
+                if not os.path.exists(path):
+                    continue
+                count = 0
+                with open(path) as handle:
+                    for line in handle:
+                        if not line.strip():
+                            continue
+                        doc = json.loads(line)
+                        target = collection or self._activity_col(doc.pop("task_id"))
+                        self._docs(target)[doc["id"]] = doc
+                        count += 1
+                counts[name] = count
+        get_user_cache().invalidate()
+        return counts
+
+    # Tasks
+    def create_task(self, payload: Dict[str, Any]) -> str:
+        with self._lock:
+            payload["id"] = payload.get("id") or self._new_id()
+            entries = [{**entry, "id": self._new_id()} for entry in payload.get("activity_log") or []]
+            for entry in entries:
+                self._insert(self._activity_col(payload["id"]), entry)
+            payload["activity_log"] = entries[-self._activity_window:] if self._activity_window > 0 else []
+            return self._insert(self._tasks_col, payload)
+
+    def create_tasks(self, payloads: List[Dict[str, Any]]) -> List[Optional[str]]:
+        for payload in payloads:
+            self.create_task(payload)
+        return [None] * len(payloads)
+
+    def get_tasks(self, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            tasks = self._docs(self._tasks_col)
+            return {task_id: copy.deepcopy(tasks[task_id]) for task_id in task_ids if task_id in tasks}
+
+    def list_tasks(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        tasks = self._select(self._tasks_col, filters, "created_at", descending=True)
+        if start_after:
+            ids = [task["id"] for task in tasks]
+            if start_after not in ids:
+                raise KeyError(f"Task {start_after} not found")
+            tasks = tasks[ids.index(start_after) + 1:]
+        if limit:
+            tasks = tasks[:limit]
+        if fields:
+            keep = {"id", "created_at", *fields}
+            tasks = [{key: value for key, value in task.items() if key in keep} for task in tasks]
+        return tasks
+
+    def get_task(self, task_id: str) -> Dict[str, Any]:
+        with self._lock:
+            doc = self._docs(self._tasks_col).get(task_id)
+            if doc is None:
+                raise KeyError(f"Task {task_id} not found")
+            return copy.deepcopy(doc)
+
+    def update_task(self, task_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            doc = self._docs(self._tasks_col).setdefault(task_id, {})
+            self._apply_load_deltas(doc, {**doc, **payload})
+            doc.update(copy.deepcopy(payload))
+            self._notify(self._tasks_col, "modified", doc)
+            return copy.deepcopy(doc)
+
+    def patch_task(
+        self, task_id: str, build_patch: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+    ) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            doc = self._docs(self._tasks_col).get(task_id)
+            if doc is None:
+                return None
+            patch = build_patch(copy.deepcopy(doc))
+            if patch is None:
+                return None
+            self._apply_load_deltas(doc, {**doc, **patch})
+            doc.update(copy.deepcopy(patch))
+            self._notify(self._tasks_col, "modified", doc)
+            return copy.deepcopy(doc)
+
+    # Activity
+    def append_activity(
+        self,
+        task_id: str,
+        entry: Dict[str, str],
+        updates: Optional[Dict[str, Any]] = None,
+        watcher: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        with self._lock:
+            task = self._docs(self._tasks_col).get(task_id)
+            if task is None:
+                raise KeyError(f"Task {task_id} not found")
+            patch, new_entries = activity_patch(task, entry, updates, watcher, self._activity_window, self._new_id)
+            for new_entry in new_entries:
+                self._insert(self._activity_col(task_id), new_entry)
+            self._apply_load_deltas(task, {**task, **patch})
+            task.update(copy.deepcopy(patch))
+            self._notify(self._tasks_col, "modified", task)
+            return copy.deepcopy(task)
+
+    def list_activity(
+        self, task_id: str, limit: int = 50, start_after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        entries = self._select(self._activity_col(task_id), None, "timestamp", descending=True)
+        if start_after:
+            ids = [entry["id"] for entry in entries]
+            if start_after not in ids:
+                raise KeyError(f"Activity {start_after} not found")
+            entries = entries[ids.index(start_after) + 1:]
+        return entries[:limit]
+
+    # Listeners
+    def watch(
+        self,
+        name: str,
+        field: Optional[str],
+        since: Optional[str],
+        callback: Callable[[str, Dict[str, Any]], None],
+    ) -> Callable[[], None]:
+        """Like a Firestore snapshot listener: existing matches arrive as ``added``, then every later write.
+
+        Later writes are not filtered on ``field``; returns the unsubscribe.
+        """
+        with self._lock:
+            for doc in list(self._docs(name).values()):
+                if field is None or (doc.get(field) is not None and (since is None or doc[field] > since)):
+                    callback("added", copy.deepcopy(doc))
+            self._watchers.setdefault(name, []).append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._watchers[name].remove(callback)
+
+        return unsubscribe
+
+    # Messages
+    def create_message(self, payload: Dict[str, Any]) -> str:
+        with self._lock:
+            task = self._docs(self._tasks_col).get(payload["task_id"])
+            last = task.get(LAST_MESSAGE_FIELD) if task is not None else None
+            payload["created_at"] = next_message_time(last, payload.get("created_at"))
+            if task is not None:
+                task[LAST_MESSAGE_FIELD] = payload["created_at"]
+            return self._insert(self._messages_col, payload)
+
+    def _thread(self, task_id: str, since: Optional[str]) -> List[Dict[str, Any]]:
+        """Messages of a task newer than ``since``, oldest first, not copied; call under the lock."""
+        thread = [
+            doc
+            for doc in self._docs(self._messages_col).values()
+            if doc.get("task_id") == task_id and doc.get("created_at") is not None
+            and (since is None or doc["created_at"] > since)
+        ]
+        thread.sort(key=lambda doc: doc["created_at"])
+        return thread
+
+    def list_messages(
+        self, task_id: str, since: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            thread = self._thread(task_id, since)
+            return copy.deepcopy(thread[:limit] if limit else thread)
+
+    def latest_messages(self, task_id: str, limit: int, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return copy.deepcopy(self._thread(task_id, since)[-limit:])
+
+    # Users
+    def _load_users(self) -> List[Dict[str, Any]]:
+        return self._select(self._users_col)
+
+    def _load_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            doc = self._docs(self._users_col).get(user_id)
+            return copy.deepcopy(doc) if doc is not None else None
+
+    def _store_user(self, user_id: str, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self._docs(self._users_col).setdefault(user_id, {}).update(copy.deepcopy(payload))
+
+    # Meetings
+    def create_meeting(self, payload: Dict[str, Any]) -> str:
+        return self._insert(self._meetings_col, payload)
+
+    def list_meetings(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        return self._select(self._meetings_col, filters, "date")
+
+    def get_meeting(self, meeting_id: str) -> Dict[str, Any]:
+        with self._lock:
+            doc = self._docs(self._meetings_col).get(meeting_id)
+            if doc is None:
+                raise KeyError(f"Meeting {meeting_id} not found")
+            return copy.deepcopy(doc)
+
+    # Updates
+    def create_update(self, payload: Dict[str, Any]) -> str:
+        return self._insert(self._updates_col, payload)
+
+    def list_updates(self, limit: int = 20) -> List[Dict[str, Any]]:
+        return self._select(self._updates_col, None, "created_at", descending=True)[:limit]
+
+
+class AsyncInMemoryFirestoreService:
+    """AsyncFirestoreService surface over a shared InMemoryFirestoreService."""
+
+    def __init__(self, store: InMemoryFirestoreService) -> None:
+        self._store = store
+
+    def __getattr__(self, name: str):
+        method = getattr(self._store, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return call
@@ -0,0 +1,158 @@
+"""Prometheus metrics for the API, served on GET /metrics.
+
+``RequestMetricsMiddleware`` records per-route latency and in-flight
+requests. Dependencies are timed, and traced as child spans, with
+``observe`` (a block) or ``instrument`` (the public methods of a service
+class): Firebase token verification, each Firestore service method and
+each AI agent endpoint. Label children are bound once per method so the
+hot path is one ``observe`` call. HTTP errors and not-found lookups
+(``KeyError``) are answers, not dependency errors.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from fastapi import HTTPException, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+from app.services.tracing import span
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "API request latency by route template and status.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "API requests currently being served.")
+DEPENDENCY_SECONDS = Histogram(
+    "dependency_call_duration_seconds",
+    "Time spent in calls to auth, Firestore and the AI agent.",
+    ["dependency", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+DEPENDENCY_ERRORS = Counter(
+    "dependency_call_errors_total",
+    "Dependency calls that raised (HTTP errors and not-found lookups excluded).",
+    ["dependency", "operation"],
+)
+AI_FALLBACKS = Counter(
+    "ai_agent_fallbacks_total",
+    "Agent calls answered from the fallback responses.",
+    ["endpoint", "reason"],
+)
+
+REALTIME_CONNECTIONS = Gauge("realtime_connections", "Open streaming (SSE) connections.")
+REALTIME_OVERFLOWS = Counter(
+    "realtime_queue_overflows_total", "Streaming connections dropped because their event queue filled up."
+)
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware; labels by route template so path parameters don't explode cardinality."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route, str(status)).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def observe(dependency: str, operation: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        with span(f"{dependency}.{operation}"):
+            yield
+    except (HTTPException, KeyError):
+        raise
+    except Exception:
+        DEPENDENCY_ERRORS.labels(dependency, operation).inc()
+        raise
+    finally:
+        DEPENDENCY_SECONDS.labels(dependency, operation).observe(time.perf_counter() - start)
+
+
+def _timed(dependency: str, operation: str, method: Callable) -> Callable:
+    histogram = DEPENDENCY_SECONDS.labels(dependency, operation)
+    errors = DEPENDENCY_ERRORS.labels(dependency, operation)
+    name = f"{dependency}.{operation}"
+
+    if inspect.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def timed_async(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                with span(name):
+                    return await method(*args, **kwargs)
+            except (HTTPException, KeyError):
+                raise
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - start)
+
+        return timed_async
+
+    @functools.wraps(method)
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            with span(name):
+                return method(*args, **kwargs)
+        except (HTTPException, KeyError):
+            raise
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    return timed
+
+
+def instrument(dependency: str, *private: str) -> Callable[[type], type]:
+    """Class decorator timing the public methods a class defines, plus the ``private`` ones named.
+
+    Inherited public methods are left alone: the read-through user cache
+    wrappers would report cache hits as dependency calls, so services time
+    the loaders behind them (``USER_LOADERS``) instead.
+    """
+
+    def decorate(cls: type) -> type:
+        for name, method in list(vars(cls).items()):
+            if (not name.startswith("_") or name in private) and inspect.isfunction(method):
+                setattr(cls, name, _timed(dependency, name.lstrip("_"), method))
+        return cls
+
+    return decorate
+
+
+def metrics_response() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
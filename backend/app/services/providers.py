@@ -0,0 +1,44 @@
+"""Process-wide service singletons shared by all routers.
+
+Services are created lazily so importing a router never touches GCP.
+Set FIRESTORE_BACKEND=memory to run against the in-memory store, and
+FIRESTORE_FIXTURES=<dir> to start it with NDJSON fixtures.
+"""
+
+from functools import lru_cache
+
+from app.config import get_settings
+
+
+@lru_cache
+def _memory_store():
+    from app.services.memory import InMemoryFirestoreService
+    store = InMemoryFirestoreService()
+    fixtures = get_settings().firestore_fixtures
+    if fixtures:
+        counts = store.load_fixtures(fixtures)
+        print(f"✅ Loaded fixtures from {fixtures}: " + ", ".join(f"{count} {name}" for name, count in counts.items()))
+    return store
+
+
+@lru_cache
+def get_firestore_service():
+    if get_settings().firestore_backend == "memory":
+        return _memory_store()
+    from app.services.firestore import FirestoreService
+    return FirestoreService()
+
+
+@lru_cache
+def get_async_firestore_service():
+    if get_settings().firestore_backend == "memory":
+        from app.services.memory import AsyncInMemoryFirestoreService
+        return AsyncInMemoryFirestoreService(_memory_store())
+    from app.services.firestore import AsyncFirestoreService
+    return AsyncFirestoreService()
+
+
+@lru_cache
+def get_ai_service():
+    from app.services.ai_agent import AIAgentService
+    return AIAgentService()
@@ -0,0 +1,178 @@
+"""Fan-out of Firestore changes to streaming clients.
+
+One snapshot listener per collection (messages, updates, tasks) is shared
+by every connection and started while at least one subscriber needs it.
+Each connection gets a bounded queue; a client that falls behind is
+dropped with an ``overflow`` event and is expected to reconnect and
+delta-sync (``GET /messages/{task_id}?since=``).
+
+A listener filters on ``field > since``, so its result set grows with every
+write after ``since``. Every REALTIME_REANCHOR_SECONDS it is restarted from
+the newest value it has delivered; events seen by both the old and the new
+listener during the swap are delivered once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from app.config import get_settings
+from app.services.metrics import REALTIME_CONNECTIONS, REALTIME_OVERFLOWS
+from app.services.providers import get_firestore_service
+
+CHANNELS = ("messages", "updates", "tasks")
+# Field each listener filters on so it starts from "now" instead of replaying the collection
+WATCH_FIELDS = {"messages": "created_at", "updates": "created_at", "tasks": "updated_at"}
+# Recent events remembered per channel to drop duplicates while a listener is re-anchored
+RECENT_EVENTS = 1024
+
+
+class Subscription:
+    """One streaming connection: the channels it wants and its bounded event queue."""
+
+    def __init__(self, channels: Set[str], task_id: Optional[str], queue_size: int) -> None:
+        self.channels = channels
+        self.task_id = task_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def wants(self, channel: str, doc: Dict[str, Any]) -> bool:
+        if channel not in self.channels or self.overflowed:
+            return False
+        if self.task_id is None or channel == "updates":
+            return True
+        key = "task_id" if channel == "messages" else "id"
+        return doc.get(key) == self.task_id
+
+
+class RealtimeHub:
+    """Routes listener callbacks (from any thread) to subscriber queues on the event loop."""
+
+    def __init__(self, source, queue_size: int, reanchor_seconds: float = 0.0) -> None:
+        self._source = source
+        self._queue_size = queue_size
+        self._reanchor_seconds = reanchor_seconds
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Dict[str, Set[Subscription]] = {channel: set() for channel in CHANNELS}
+        self._unsubscribers: Dict[str, Callable[[], None]] = {}
+        self._reanchor_timers: Dict[str, asyncio.TimerHandle] = {}
+        # Newest watched-field value delivered per channel, and recent event keys for de-duplication
+        self._anchors: Dict[str, str] = {}
+        self._recent: Dict[str, deque] = {channel: deque(maxlen=RECENT_EVENTS) for channel in CHANNELS}
+        self._connections: Set[Subscription] = set()
+        self._counts = {
+            "connections_opened": 0,
+            "events_received": 0,
+            "events_delivered": 0,
+            "duplicates_dropped": 0,
+            "overflows": 0,
+            "reanchors": 0,
+        }
+
+    def subscribe(self, channels: Iterable[str], task_id: Optional[str] = None) -> Subscription:
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(set(channels), task_id, self._queue_size)
+        for channel in subscription.channels:
+            self._subscribers[channel].add(subscription)
+            if channel not in self._unsubscribers:
+                self._anchors[channel] = datetime.utcnow().isoformat()
+                self._unsubscribers[channel] = self._watch(channel, self._anchors[channel])
+                self._schedule_reanchor(channel)
+        self._counts["connections_opened"] += 1
+        self._connections.add(subscription)
+        REALTIME_CONNECTIONS.set(len(self._connections))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for channel in subscription.channels:
+            self._subscribers[channel].discard(subscription)
+            if not self._subscribers[channel] and channel in self._unsubscribers:
+                self._stop(channel)
+        self._connections.discard(subscription)
+        REALTIME_CONNECTIONS.set(len(self._connections))
+
+    def close(self) -> None:
+        for channel in list(self._unsubscribers):
+            self._stop(channel)
+        for subscribers in self._subscribers.values():
+            subscribers.clear()
+        self._connections.clear()
+        REALTIME_CONNECTIONS.set(0)
+
+    def _stop(self, channel: str) -> None:
+        self._unsubscribers.pop(channel)()
+        timer = self._reanchor_timers.pop(channel, None)
+        if timer is not None:
+            timer.cancel()
+
+    def _schedule_reanchor(self, channel: str) -> None:
+        if self._reanchor_seconds > 0:
+            self._reanchor_timers[channel] = self._loop.call_later(self._reanchor_seconds, self._reanchor, channel)
+
+    def _reanchor(self, channel: str) -> None:
+        """Start a listener from the newest delivered value, then stop the old one; duplicates are dropped."""
+        if channel not in self._unsubscribers:
+            return
+        old_unsubscribe = self._unsubscribers[channel]
+        self._unsubscribers[channel] = self._watch(channel, self._anchors[channel])
+        old_unsubscribe()
+        self._counts["reanchors"] += 1
+        self._schedule_reanchor(channel)
+
+    def _watch(self, channel: str, since: str) -> Callable[[], None]:
+        settings = get_settings()
+        collection = getattr(settings, f"firestore_collection_{channel}")
+        loop = self._loop
+
+        def on_change(change: str, doc: Dict[str, Any]) -> None:
+            loop.call_soon_threadsafe(self._fan_out, channel, change, doc)
+
+        return self._source.watch(collection, WATCH_FIELDS[channel], since, on_change)
+
+    def _fan_out(self, channel: str, change: str, doc: Dict[str, Any]) -> None:
+        self._counts["events_received"] += 1
+        value = doc.get(WATCH_FIELDS[channel])
+        key = (change, doc.get("id"), value)
+        if key in self._recent[channel]:
+            self._counts["duplicates_dropped"] += 1
+            return
+        self._recent[channel].append(key)
+        if isinstance(value, str) and value > self._anchors.get(channel, ""):
+            self._anchors[channel] = value
+        event = {"channel": channel, "change": change, "document": doc}
+        for subscription in list(self._subscribers[channel]):
+            if not subscription.wants(channel, doc):
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+                self._counts["events_delivered"] += 1
+            except asyncio.QueueFull:
+                # Slow consumer: stop buffering for it and let the stream end
+                subscription.overflowed = True
+                self._counts["overflows"] += 1
+                REALTIME_OVERFLOWS.inc()
+                subscription.queue.get_nowait()
+                subscription.queue.put_nowait(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connections": len(self._connections),
+            "subscribers": {channel: len(subs) for channel, subs in self._subscribers.items()},
+            "listeners": sorted(self._unsubscribers),
+            "queue_size": self._queue_size,
+            **self._counts,
+        }
+
+
+@lru_cache
+def get_realtime_hub() -> RealtimeHub:
+    settings = get_settings()
+    return RealtimeHub(
+        get_firestore_service(),
+        queue_size=settings.realtime_queue_size,
+        reanchor_seconds=settings.realtime_reanchor_seconds,
+    )
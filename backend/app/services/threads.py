@@ -0,0 +1,23 @@
+"""Ordering of thread messages.
+
+The server stamps each message inside a transaction on its task, strictly
+after the task's ``last_message_at``. Within a thread ``created_at`` then
+follows commit order even when API instances' clocks disagree, and no two
+messages share a timestamp, so a ``created_at > since`` delta poll never
+skips a message committed after the reader's previous page.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+LAST_MESSAGE_FIELD = "last_message_at"
+
+
+def next_message_time(last: Optional[str], requested: Optional[str] = None) -> str:
+    """``requested`` (imports) or now, moved past ``last`` if it isn't later."""
+    stamp = datetime.fromisoformat(requested) if requested else datetime.utcnow()
+    if last:
+        stamp = max(stamp, datetime.fromisoformat(last) + timedelta(microseconds=1))
+    return stamp.isoformat()
@@ -0,0 +1,98 @@
+"""Distributed tracing with OpenTelemetry.
+
+``TracingMiddleware`` opens a server span per request (continuing a
+``traceparent`` sent by the caller). Firestore methods, token
+verification and agent calls get child spans through ``metrics.instrument``
+and ``metrics.observe``, and ``AIAgentService`` injects the trace context
+into its requests so the agent server's spans join the same trace.
+
+The provider setup (exporters, sampling) lives in the top-level
+``telemetry`` module, shared with the agent server; see there for
+TRACING_EXPORTER and TRACING_SAMPLE_RATIO.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from app.config import get_settings
+from telemetry import Tracing
+
+SERVICE_NAME = "ai-workspace-api"
+
+
+@lru_cache
+def get_tracing() -> Tracing:
+    settings = get_settings()
+    return Tracing(SERVICE_NAME, settings.tracing_exporter, settings.tracing_file, settings.tracing_sample_ratio)
+
+
+def get_tracer_provider() -> Optional[TracerProvider]:
+    return get_tracing().provider
+
+
+def get_tracer() -> trace.Tracer:
+    return get_tracing().tracer
+
+
+def get_memory_exporter() -> Optional[InMemorySpanExporter]:
+    return get_tracing().memory_exporter
+
+
+def span(name: str, kind: SpanKind = SpanKind.INTERNAL, **attributes: Any):
+    """Child span of the current one; a bare ``nullcontext`` when tracing is off."""
+    return get_tracing().span(name, kind, **attributes)
+
+
+def inject_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """Add ``traceparent``/``tracestate`` for the current span to outgoing headers."""
+    propagate.inject(headers)
+    return headers
+
+
+def shutdown_tracing() -> None:
+    get_tracing().shutdown()
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware opening a server span per HTTP request."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        tracer = get_tracer()
+        if scope["type"] != "http" or isinstance(tracer, trace.NoOpTracer):
+            await self.app(scope, receive, send)
+            return
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        status = 500
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}",
+            context=propagate.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+        ) as server_span:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    server_span.update_name(f"{scope['method']} {route}")
+                    server_span.set_attribute("http.route", route)
+                server_span.set_attribute("http.response.status_code", status)
+                if status >= 500:
+                    server_span.set_status(Status(StatusCode.ERROR))
@@ -0,0 +1,210 @@
+"""Read-through cache for user profiles and the team roster.
+
+The roster is read by task creation, auto-assign, overload analytics and
+GET /users/, but changes rarely. Services mix in ``CachedUserReads`` (or
+the async variant) and implement ``_load_users``/``_load_user``/
+``_store_user``; writes through ``upsert_user`` and workload counter
+updates invalidate the affected entries. With USER_CACHE_LISTEN=true a
+Firestore listener on the users collection also invalidates on writes
+made by other instances.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.config import get_settings
+
+
+# Loaders a service implements behind the cached reads; these are what reach the store
+USER_LOADERS = ("_load_users", "_load_user", "_store_user")
+
+
+def _copy(user: Dict[str, Any]) -> Dict[str, Any]:
+    # Callers may add keys to what they get back; keep the cached dicts pristine
+    return dict(user)
+
+
+class UserCache:
+    """TTL + LRU cache of user documents plus the full roster; safe across threads."""
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._users: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+        self._roster: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+        self._generation = 0
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self._counts = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0, "stale_fills_skipped": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0 and self._max_entries > 0
+
+    @property
+    def generation(self) -> int:
+        """Snapshot before a load; fills from a load that raced an invalidation are dropped."""
+        return self._generation
+
+    def roster(self) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            if self._roster is not None and self._roster[0] > time.monotonic():
+                self._counts["hits"] += 1
+                return [_copy(user) for user in self._roster[1]]
+            self._roster = None
+            self._counts["misses"] += 1
+            return None
+
+    def put_roster(self, users: List[Dict[str, Any]], generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                self._counts["stale_fills_skipped"] += 1
+                return
+            expires_at = time.monotonic() + self._ttl
+            self._roster = (expires_at, [_copy(user) for user in users])
+            for user in users[: self._max_entries]:
+                if user.get("id"):
+                    self._remember(user["id"], expires_at, user)
+
+    def user(self, user_id: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """(found, profile); profile is None for a cached "no such user"."""
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._users.move_to_end(user_id)
+                self._counts["hits"] += 1
+                return True, _copy(entry[1]) if entry[1] is not None else None
+            self._users.pop(user_id, None)
+            self._counts["misses"] += 1
+            return False, None
+
+    def put_user(self, user_id: str, user: Optional[Dict[str, Any]], generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                self._counts["stale_fills_skipped"] += 1
+                return
+            self._remember(user_id, time.monotonic() + self._ttl, user)
+
+    def _remember(self, user_id: str, expires_at: float, user: Optional[Dict[str, Any]]) -> None:
+        self._users[user_id] = (expires_at, _copy(user) if user is not None else None)
+        self._users.move_to_end(user_id)
+        while len(self._users) > self._max_entries:
+            self._users.popitem(last=False)
+            self._counts["evictions"] += 1
+
+    def invalidate(self, user_ids: Optional[Iterable[str]] = None) -> None:
+        """Drop the roster and the given users (all users when None)."""
+        with self._lock:
+            self._generation += 1
+            self._roster = None
+            if user_ids is None:
+                self._users.clear()
+            else:
+                for user_id in user_ids:
+                    self._users.pop(user_id, None)
+            self._counts["invalidations"] += 1
+
+    def listen(self, source, collection: str) -> None:
+        """Invalidate on every change to the users collection seen by a snapshot listener."""
+        if self._unsubscribe is None:
+            self._unsubscribe = source.watch(
+                collection, None, None, lambda change, doc: self.invalidate([doc["id"]] if doc.get("id") else None)
+            )
+
+    def close(self) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._counts["hits"] + self._counts["misses"]
+            return {
+                "enabled": self.enabled,
+                "ttl_seconds": self._ttl,
+                "entries": len(self._users),
+                "max_entries": self._max_entries,
+                "roster_cached": self._roster is not None,
+                "listening": self._unsubscribe is not None,
+                "hit_rate": round(self._counts["hits"] / lookups, 4) if lookups else 0.0,
+                **self._counts,
+            }
+
+
+@lru_cache
+def get_user_cache() -> UserCache:
+    settings = get_settings()
+    return UserCache(ttl=settings.user_cache_ttl_seconds, max_entries=settings.user_cache_max_entries)
+
+
+class CachedUserReads:
+    """Read-through ``list_users``/``get_user`` and invalidating ``upsert_user`` for sync services."""
+
+    def list_users(self) -> List[Dict[str, Any]]:
+        cache = get_user_cache()
+        if not cache.enabled:
+            return self._load_users()
+        cached = cache.roster()
+        if cached is not None:
+            return cached
+        generation = cache.generation
+        users = self._load_users()
+        cache.put_roster(users, generation)
+        return users
+
+    def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        cache = get_user_cache()
+        if not cache.enabled:
+            return self._load_user(user_id)
+        found, cached = cache.user(user_id)
+        if found:
+            return cached
+        generation = cache.generation
+        user = self._load_user(user_id)
+        cache.put_user(user_id, user, generation)
+        return user
+
+    def upsert_user(self, user_id: str, payload: Dict[str, Any]) -> None:
+        try:
+            self._store_user(user_id, payload)
+        finally:
+            get_user_cache().invalidate([user_id])
+
+
+class AsyncCachedUserReads:
+    """Async counterpart of ``CachedUserReads``."""
+
+    async def list_users(self) -> List[Dict[str, Any]]:
+        cache = get_user_cache()
+        if not cache.enabled:
+            return await self._load_users()
+        cached = cache.roster()
+        if cached is not None:
+            return cached
+        generation = cache.generation
+        users = await self._load_users()
+        cache.put_roster(users, generation)
+        return users
+
+    async def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        cache = get_user_cache()
+        if not cache.enabled:
+            return await self._load_user(user_id)
+        found, cached = cache.user(user_id)
+        if found:
+            return cached
+        generation = cache.generation
+        user = await self._load_user(user_id)
+        cache.put_user(user_id, user, generation)
+        return user
+
+    async def upsert_user(self, user_id: str, payload: Dict[str, Any]) -> None:
+        try:
+            await self._store_user(user_id, payload)
+        finally:
+            get_user_cache().invalidate([user_id])
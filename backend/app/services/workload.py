@@ -0,0 +1,101 @@
+"""Local team workload analytics for GET /agent/who-is-overloaded.
+
+Utilization, threshold breaches and the top-N overloaded members are
+computed in one pass over the roster. Gemini is only asked for advice on
+the overloaded members, and that advice is attached when ready instead of
+blocking the response.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.services.providers import get_ai_service
+
+
+def utilization(user: Dict[str, Any]) -> float:
+    return float(user.get("assigned_hours") or 0) / max(float(user.get("capacity_hours") or 40), 1.0)
+
+
+def workload_snapshot(users: List[Dict[str, Any]], threshold: float, top_n: int) -> Dict[str, Any]:
+    """Utilization stats for a roster: O(n) scan plus a size-``top_n`` heap."""
+    breaches = []
+    total = 0.0
+    for user in users:
+        load = utilization(user)
+        total += load
+        if load >= threshold:
+            breaches.append(
+                {
+                    "id": user.get("id"),
+                    "name": user.get("name"),
+                    "utilization": round(load, 4),
+                    "assigned_hours": user.get("assigned_hours") or 0,
+                    "capacity_hours": user.get("capacity_hours") or 40,
+                    "skills": user.get("skills") or [],
+                }
+            )
+    return {
+        "overloaded": heapq.nlargest(top_n, breaches, key=lambda member: member["utilization"]),
+        "breaches": len(breaches),
+        "members": len(users),
+        "team_utilization": round(total / len(users), 4) if users else 0.0,
+        "threshold": threshold,
+    }
+
+
+def _advice_key(overloaded: List[Dict[str, Any]]) -> Tuple:
+    return tuple((member["id"], round(member["utilization"], 2)) for member in overloaded)
+
+
+class OverloadAdvisor:
+    """Remembers Gemini suggestions per overloaded set and fetches new ones in the background."""
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self._max_entries = max_entries
+        self._advice: "OrderedDict[Tuple, List[str]]" = OrderedDict()
+        self._in_flight: Set[Tuple] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def advise(self, overloaded: List[Dict[str, Any]], wait: bool) -> Tuple[str, List[str]]:
+        """Return (advice_status, suggestions); status is ready, pending or none."""
+        if not overloaded:
+            return "none", []
+        key = _advice_key(overloaded)
+        if key in self._advice:
+            self._advice.move_to_end(key)
+            return "ready", self._advice[key]
+        if wait:
+            suggestions = await self._fetch(key, overloaded)
+            return ("ready", suggestions) if suggestions is not None else ("none", [])
+        if key not in self._in_flight:
+            task = asyncio.create_task(self._fetch(key, overloaded))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return "pending", []
+
+    async def _fetch(self, key: Tuple, overloaded: List[Dict[str, Any]]) -> Optional[List[str]]:
+        self._in_flight.add(key)
+        try:
+            report = await get_ai_service().overload_report(overloaded)
+        except Exception as e:
+            print(f"⚠️ Overload advice failed: {e}")
+            return None
+        finally:
+            self._in_flight.discard(key)
+        if report.get("fallback"):
+            return None
+        suggestions = list(report.get("suggestions") or [])
+        self._advice[key] = suggestions
+        if len(self._advice) > self._max_entries:
+            self._advice.popitem(last=False)
+        return suggestions
+
+
+@lru_cache
+def get_overload_advisor() -> OverloadAdvisor:
+    return OverloadAdvisor()
@@ -0,0 +1,68 @@
+"""
+Track activity write cost as a task grows to thousands of events.
+
+Compares the old read-modify-write of the whole activity_log array with
+append_activity (subcollection entry + bounded window) on the in-memory
+store, reporting per-append latency and task document size at each
+checkpoint. The legacy path is quadratic, so large --events runs take
+minutes (10k events: several minutes); --quick stops at 500.
+
+Run from the backend directory:
+    python -m benchmarks.activity_write_bench
+    python -m benchmarks.activity_write_bench --quick
+    python -m benchmarks.activity_write_bench --events 10000
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+
+from app.services.memory import InMemoryFirestoreService
+
+
+def _entry(i: int) -> dict:
+    return {"timestamp": datetime.utcnow().isoformat(), "actor": f"user_{i % 7}", "action": "Commented on task"}
+
+
+def _legacy_append(store: InMemoryFirestoreService, task_id: str, i: int) -> dict:
+    task = store.get_task(task_id)
+    activity_log = task.get("activity_log", [])
+    activity_log.append(_entry(i))
+    return store.update_task(task_id, {"activity_log": activity_log})
+
+
+def _append(store: InMemoryFirestoreService, task_id: str, i: int) -> dict:
+    return store.append_activity(task_id, _entry(i))
+
+
+def _run(label: str, append, events: int, checkpoints: list) -> None:
+    store = InMemoryFirestoreService()
+    task_id = store.create_task({"title": "Bench", "created_at": datetime.utcnow().isoformat(), "activity_log": []})
+    done = 0
+    print(label)
+    for checkpoint in checkpoints:
+        start, previous = time.perf_counter(), done
+        while done < checkpoint:
+            task = append(store, task_id, done)
+            done += 1
+        per_append = (time.perf_counter() - start) / max(done - previous, 1)
+        size = len(json.dumps(task))
+        print(f"  {checkpoint:>6} events: {per_append * 1e6:9.1f} us/append, task doc {size / 1024:8.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--quick", action="store_true", help="500 events, a few seconds")
+    args = parser.parse_args()
+    if args.quick:
+        args.events = 500
+
+    checkpoints = [n for n in (10, 100, 1000, 5000, 10000, 50000) if n < args.events] + [args.events]
+    _run("read-modify-write activity_log", _legacy_append, args.events, checkpoints)
+    _run("append_activity (subcollection + window)", _append, args.events, checkpoints)
+
+
+if __name__ == "__main__":
+    main()
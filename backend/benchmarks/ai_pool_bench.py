@@ -0,0 +1,102 @@
+"""
+Benchmark the pooled AIAgentService client against a client-per-call.
+
+Starts a stub agent server on localhost and fires summarize calls at it,
+first opening a new httpx.AsyncClient per call (the old behaviour), then
+through the shared keep-alive pool. The pooled run calls _post_upstream so
+the response cache and single-flight don't collapse the identical calls.
+
+Run from the backend directory:
+    python -m benchmarks.ai_pool_bench --requests 2000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import threading
+import time
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from app.services.ai_agent import AIAgentService
+
+stub = FastAPI()
+
+
+@stub.post("/summarize")
+async def summarize():
+    return {"bullets": ["stub"], "status": "ok", "next_step": "none"}
+
+
+def _start_stub() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(stub, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def _run(call, requests: int, concurrency: int):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    base_url = _start_stub()
+    payload = {"messages": [], "instructions": "bench"}
+
+    async def per_call_client():
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.post(f"{base_url}/summarize", json=payload)
+            response.raise_for_status()
+
+    async def pooled():
+        service = AIAgentService()
+        service._agent_base_url = base_url
+        await service.start()
+        try:
+            result = await _run(
+                lambda: service._post_upstream("/summarize", payload), args.requests, args.concurrency
+            )
+            result["pool"] = service.pool_stats()
+            return result
+        finally:
+            await service.aclose()
+
+    unpooled = asyncio.run(_run(per_call_client, args.requests, args.concurrency))
+    pooled_result = asyncio.run(pooled())
+
+    for label, result in (("client per call", unpooled), ("pooled client", pooled_result)):
+        print(f"{label:<16} {result['rps']:8.1f} req/s  p50 {result['p50_ms']:6.2f} ms  p95 {result['p95_ms']:6.2f} ms")
+    print(f"pool stats: {pooled_result['pool']}")
+
+
+if __name__ == "__main__":
+    main()
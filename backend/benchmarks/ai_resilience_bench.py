@@ -0,0 +1,148 @@
+"""
+Circuit breaker, adaptive timeouts and hedging for agent calls.
+
+Points AIAgentService at a fault-injecting stub agent (errors, slow
+responses, hangs, slow tail) and checks that:
+
+* repeated errors open the breaker and later calls get the fallback
+  without reaching the agent;
+* after the cooldown a single half-open probe goes through and closes
+  the breaker once the agent is healthy again;
+* successful but SLO-breaching responses also open the breaker;
+* the timeout follows the observed p95, so a hang costs a fraction of the
+  configured timeout;
+* hedging a slow tail cuts the worst-case latency of an idempotent endpoint
+  (without it the slow responses run into the adaptive timeout).
+
+Run from the backend directory:
+    python -m benchmarks.ai_resilience_bench --calls 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("AI_CACHE_MAX_ENTRIES", "0")
+os.environ.setdefault("AI_BREAKER_FAILURE_THRESHOLD", "5")
+os.environ.setdefault("AI_BREAKER_OPEN_SECONDS", "0.2")
+os.environ.setdefault("AI_LATENCY_SLOS", "/meeting=0.05")
+os.environ.setdefault("AI_TIMEOUT_MIN_SECONDS", "0.1")
+os.environ.setdefault("AI_HEDGE_ENDPOINTS", "/summarize")
+
+import httpx
+
+from app.services.ai_agent import AIAgentService
+from app.services.ai_resilience import CLOSED, OPEN
+
+
+class FaultyAgent:
+    """Stub agent whose behaviour per endpoint is switched by the checks."""
+
+    def __init__(self) -> None:
+        self.faults = {}
+        self.requests = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        fault = self.faults.get(request.url.path, ("ok", 0.0))
+        kind, latency = fault if not callable(fault) else fault(self.requests)
+        await asyncio.sleep(latency)
+        if kind == "error":
+            return httpx.Response(500, json={"detail": "injected"})
+        return httpx.Response(200, json={"ok": True, "echo": json.loads(request.content)})
+
+
+def _service(agent: FaultyAgent) -> AIAgentService:
+    service = AIAgentService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(agent.handler), base_url="http://stub")
+    return service
+
+
+async def _timed(service, path: str, i: int):
+    start = time.perf_counter()
+    result = await service._post(path, {"i": i})
+    return time.perf_counter() - start, result
+
+
+async def _check_breaker(agent: FaultyAgent, service: AIAgentService) -> None:
+    agent.faults["/overload"] = ("error", 0.0)
+    for i in range(5):
+        await _timed(service, "/overload", i)
+    guard = service._guards["/overload"]
+    assert guard.state == OPEN, guard.stats()
+    before = agent.requests
+    for i in range(20):
+        elapsed, result = await _timed(service, "/overload", 100 + i)
+        assert result["fallback"] and elapsed < 0.01
+    assert agent.requests == before, "open breaker let calls through"
+
+    agent.faults["/overload"] = ("ok", 0.05)
+    await asyncio.sleep(0.25)
+    before = agent.requests
+    results = await asyncio.gather(*(_timed(service, "/overload", 200 + i) for i in range(5)))
+    assert agent.requests == before + 1, "half-open state should send exactly one probe"
+    assert sum(1 for _, result in results if not result.get("fallback")) == 1
+    assert guard.state == CLOSED, guard.stats()
+    print(f"✅ breaker opens after errors, short-circuits, recovers via one probe: {guard.stats()}")
+
+    agent.faults["/meeting"] = ("ok", 0.08)
+    for i in range(5):
+        _, result = await _timed(service, "/meeting", i)
+        assert not result.get("fallback")
+    assert service._guards["/meeting"].state == OPEN, "SLO breaches should open the breaker"
+    print("✅ latency SLO breaches open the breaker")
+
+
+async def _check_adaptive_timeout(agent: FaultyAgent, service: AIAgentService) -> None:
+    agent.faults["/flowchart"] = ("ok", 0.02)
+    for i in range(40):
+        await _timed(service, "/flowchart", i)
+    guard = service._guards["/flowchart"]
+    configured = guard.max_timeout
+    assert guard.timeout() < configured
+    agent.faults["/flowchart"] = ("ok", 5.0)
+    elapsed, result = await _timed(service, "/flowchart", 999)
+    assert result["fallback"] and elapsed < 1.0, elapsed
+    print(f"✅ adaptive timeout {guard.timeout():.3f} s (configured {configured} s): hang fell back after {elapsed:.3f} s")
+
+
+async def _tail(service: AIAgentService, path: str, calls: int):
+    results = [await _timed(service, path, i) for i in range(calls)]
+    latencies = sorted(elapsed for elapsed, _ in results)
+    fallbacks = sum(1 for _, result in results if result.get("fallback"))
+    return latencies[len(latencies) // 2], latencies[int(0.99 * len(latencies))], latencies[-1], fallbacks
+
+
+async def _run(calls: int) -> None:
+    agent = FaultyAgent()
+    service = _service(agent)
+    await _check_breaker(agent, service)
+    await _check_adaptive_timeout(agent, service)
+
+    # Every 25th request is slow (beyond p95); /summarize is hedged at p95, /overload isn't
+    slow_tail = lambda n: ("ok", 0.5 if n % 25 == 0 else 0.01)
+    agent.faults["/summarize"] = slow_tail
+    agent.faults["/overload"] = slow_tail
+    plain = await _tail(service, "/overload", calls)
+    hedged = await _tail(service, "/summarize", calls)
+    stats = service.breaker_stats()["/summarize"]
+    print(f"{calls} calls, 4% of agent responses take 500 ms")
+    for label, (p50, p99, worst, fallbacks) in (("no hedging", plain), ("hedged", hedged)):
+        print(f"  {label:<11} p50 {p50 * 1000:6.1f} ms  p99 {p99 * 1000:6.1f} ms  max {worst * 1000:6.1f} ms"
+              f"  {fallbacks:3} timed out to fallback")
+    print(f"  hedges sent {stats['hedges_sent']}, won {stats['hedges_won']}")
+    assert hedged[1] < plain[1] and hedged[3] < plain[3]
+    await service.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(_run(args.calls))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Batched assignment prompts vs one prompt per task.
+
+Swaps the ADK client for a fake model that answers from the prompt: each
+task's title encodes the member it should go to, batched answers come back
+shuffled, and the fake drops or truncates some items so the single-task
+fallback is exercised. Checks every result maps back to its own task, then
+compares wall time and prompt tokens per task for N tasks sent to
+/assignment one by one (concurrently) and to /assignment/batch.
+
+Run from the backend directory:
+    python -m benchmarks.assignment_batch_bench --tasks 100 --members 40 --batch-size 10
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from types import SimpleNamespace
+
+import httpx
+
+import ai_agent_server
+
+
+class FakeAssignmentModel:
+    """Latency grows with the number of answers generated, like real decoding."""
+
+    def __init__(self, base_latency: float, per_item_latency: float, members: int, faulty: bool) -> None:
+        self.base_latency = base_latency
+        self.per_item_latency = per_item_latency
+        self.members = members
+        self.faulty = faulty
+        self.calls = 0
+        self.rng = random.Random(19)
+
+    def _answer(self, title: str) -> dict:
+        number = int(title.rsplit(" ", 1)[1])
+        return {"predicted_hours": 4 + number % 5, "best_member_id": f"user_{number % self.members}", "priority": 3,
+                "deadline": "2030-01-01", "flowchart_next_step": "Development", "required_meeting": False,
+                "meeting_suggestion": None, "reason": title}
+
+    async def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        titles = re.findall(r"^- Title: (.*)$", contents, re.MULTILINE)
+        await asyncio.sleep(self.base_latency + self.per_item_latency * len(titles))
+        if "task_index" not in contents:
+            return SimpleNamespace(text=json.dumps(self._answer(titles[0])))
+        items = [{"task_index": index, **self._answer(title)} for index, title in enumerate(titles)]
+        self.rng.shuffle(items)
+        text = "```json\n" + json.dumps(items) + "\n```"
+        if self.faulty:
+            # One item without its index, and the response cut off mid-object
+            del items[0]["task_index"]
+            text = "Here you go:\n" + json.dumps(items)[:-40]
+        return SimpleNamespace(text=text)
+
+
+def _tasks(count: int) -> list:
+    tags = ["python", "react", "sql", "devops", "design"]
+    return [{"title": f"Task {i}", "description": "Synthetic task", "complexity": "medium", "tags": [tags[i % 5]]}
+            for i in range(count)]
+
+
+def _team(members: int) -> list:
+    skills = ["python", "react", "sql", "devops", "design"]
+    return [{"id": f"user_{i}", "name": f"Member {i}", "skills": [skills[i % 5], skills[(i + 2) % 5]],
+             "capacity_hours": 40, "assigned_hours": i % 30} for i in range(members)]
+
+
+def _check(results: list, tasks: list, members: int) -> None:
+    assert len(results) == len(tasks)
+    for task, result in zip(tasks, results):
+        number = int(task["title"].rsplit(" ", 1)[1])
+        assert result["reason"] == task["title"], (task, result)
+        assert result["best_member_id"] == f"user_{number % members}", (task, result)
+
+
+async def _run(args, model: FakeAssignmentModel):
+    tasks, team = _tasks(args.tasks), _team(args.members)
+    instructions = "Return JSON."
+    transport = httpx.ASGITransport(app=ai_agent_server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://agent", timeout=None) as client:
+        model.faulty = True
+        response = await client.post(
+            "/assignment/batch", json={"tasks": tasks[:12], "team": team, "instructions": instructions, "batch_size": 6}
+        )
+        body = response.json()
+        _check(body["results"], tasks[:12], args.members)
+        assert body["batch"]["fallbacks"] >= 4 and not all(r["batched"] for r in body["results"]), body["batch"]
+        print(f"✅ shuffled, unindexed and truncated items map back to their tasks ({body['batch']['fallbacks']} fallbacks)")
+
+        model.faulty = False
+        model.calls = 0
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.post("/assignment", json={"task": task, "team": team, "instructions": instructions}) for task in tasks
+        ))
+        single_elapsed, single_calls = time.perf_counter() - start, model.calls
+        singles = [response.json() for response in responses]
+        _check(singles, tasks, args.members)
+        single_tokens = sum(result["team_filter"]["prompt_tokens_after"] for result in singles)
+
+        model.calls = 0
+        start = time.perf_counter()
+        response = await client.post(
+            "/assignment/batch",
+            json={"tasks": tasks, "team": team, "instructions": instructions, "batch_size": args.batch_size},
+        )
+        batch_elapsed = time.perf_counter() - start
+        body = response.json()
+        _check(body["results"], tasks, args.members)
+        assert body["batch"]["fallbacks"] == 0
+    return (single_elapsed, single_calls, single_tokens), (batch_elapsed, model.calls, body["batch"]["prompt_tokens"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--members", type=int, default=40)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4, help="GEMINI_MAX_CONCURRENCY for the run")
+    parser.add_argument("--base-latency-ms", type=float, default=400.0)
+    parser.add_argument("--per-item-latency-ms", type=float, default=60.0)
+    args = parser.parse_args()
+
+    model = FakeAssignmentModel(args.base_latency_ms / 1000, args.per_item_latency_ms / 1000, args.members, False)
+    ai_agent_server.client = SimpleNamespace(aio=SimpleNamespace(models=model))
+    ai_agent_server.gemini_slots = asyncio.Semaphore(args.concurrency)
+
+    single, batch = asyncio.run(_run(args, model))
+    print(f"{args.tasks} tasks, {args.members} members, batch size {args.batch_size}, {args.concurrency} Gemini slots")
+    for label, (elapsed, calls, tokens) in (("one per task", single), ("batched", batch)):
+        print(f"  {label:<13} {elapsed:7.2f} s  {calls:4} model calls  {tokens / args.tasks:7.1f} prompt tokens/task")
+    print(f"  prompt tokens per task reduced {1 - batch[2] / single[2]:.0%}, wall time {single[0] / batch[0]:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Micro-benchmark for the verified-token cache in app.auth.get_current_user.
+
+Run from the backend directory:
+    python -m benchmarks.auth_cache_bench --requests 2000 --verify-ms 2
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app import auth as auth_module
+
+
+def _fake_verifier(verify_ms: float):
+    def verify_id_token(token: str):
+        time.sleep(verify_ms / 1000)
+        return {"uid": token, "email": f"{token}@example.com", "exp": time.time() + 3600}
+    return verify_id_token
+
+
+async def _run(requests: int, tokens: int) -> float:
+    start = time.perf_counter()
+    for i in range(requests):
+        creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=f"user-{i % tokens}")
+        await auth_module.get_current_user(creds)
+    return (time.perf_counter() - start) / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--tokens", type=int, default=50, help="distinct users sending requests")
+    parser.add_argument("--verify-ms", type=float, default=2.0, help="simulated verify_id_token cost")
+    args = parser.parse_args()
+
+    from firebase_admin import auth as firebase_auth
+    firebase_auth.verify_id_token = _fake_verifier(args.verify_ms)
+    auth_module._firebase_initialized = True
+    cache = auth_module.get_token_cache()
+
+    cache._max_entries = 0
+    uncached = asyncio.run(_run(args.requests, args.tokens))
+
+    cache._max_entries = max(args.tokens, 1)
+    cache.clear()
+    cache.hits = cache.misses = 0
+    cached = asyncio.run(_run(args.requests, args.tokens))
+
+    print(f"without cache: {uncached:.3f} ms/request")
+    print(f"with cache:    {cached:.3f} ms/request ({uncached / cached:.1f}x faster)")
+    print(f"cache stats:   {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
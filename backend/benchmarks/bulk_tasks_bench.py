@@ -0,0 +1,139 @@
+"""
+Throughput of the bulk task endpoints against the single-item ones.
+
+Imports N tasks with N sequential POST /tasks/ calls and with one
+POST /tasks/bulk, then auto-assigns them one by one and with
+POST /tasks/auto-assign/bulk. Firestore round trips are simulated with a
+fixed latency per data-layer call and the agent is a stub with
+Gemini-like latency (local assignment off, so every task reaches it);
+bulk auto-assign reaches it through one /assignment/batch call.
+
+Run from the backend directory:
+    python -m benchmarks.bulk_tasks_bench --tasks 200 --db-latency-ms 5 --agent-latency-ms 300
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("FIRESTORE_BACKEND", "memory")
+os.environ.setdefault("ENRICHMENT_MODE", "external")
+os.environ.setdefault("LOCAL_ASSIGNMENT_ENABLED", "false")
+
+import httpx
+
+from app.auth import AuthUser, get_current_user
+from app.main import app
+from app.routers import tasks as tasks_router
+from app.services import providers
+
+
+class _LatencyFacade:
+    """Async service surface over the memory store that adds a round trip per call."""
+
+    def __init__(self, store, latency: float) -> None:
+        self._store = store
+        self._latency = latency
+        self.calls = 0
+
+    def __getattr__(self, name):
+        method = getattr(self._store, name)
+
+        async def call(*args, **kwargs):
+            self.calls += 1
+            await asyncio.sleep(self._latency)
+            return method(*args, **kwargs)
+
+        return call
+
+
+def _task(i: int) -> dict:
+    return {"title": f"Imported {i}", "complexity": "medium", "tags": ["python"], "deadline": None, "flowchart_step": None}
+
+
+async def _run(tasks: int, agent_latency: float, facade: _LatencyFacade):
+    agent_calls = 0
+
+    async def agent(request: httpx.Request) -> httpx.Response:
+        nonlocal agent_calls
+        agent_calls += 1
+        await asyncio.sleep(agent_latency)
+        result = {"predicted_hours": 6, "best_member_id": "user_1", "priority": 3, "deadline": "2030-01-01",
+                  "flowchart_next_step": "Development", "required_meeting": False, "meeting_suggestion": None,
+                  "reason": "stub"}
+        if request.url.path == "/assignment/batch":
+            tasks = json.loads(request.content)["tasks"]
+            return httpx.Response(200, json={"results": [result] * len(tasks), "batch": {"tasks": len(tasks)}})
+        return httpx.Response(200, json=result)
+
+    service = providers.get_ai_service()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(agent), base_url="http://stub")
+    rows = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def measure(label, run):
+            nonlocal agent_calls
+            facade.calls, agent_calls = 0, 0
+            start = time.perf_counter()
+            ids = await run()
+            rows[label] = (time.perf_counter() - start, facade.calls, agent_calls)
+            return ids
+
+        async def single_create():
+            ids = []
+            for i in range(tasks):
+                response = await client.post("/tasks/", json=_task(i))
+                response.raise_for_status()
+                ids.append(response.json()["id"])
+            return ids
+
+        async def bulk_create():
+            response = await client.post("/tasks/bulk", json={"tasks": [_task(i) for i in range(tasks)]})
+            response.raise_for_status()
+            body = response.json()
+            assert body["failed"] == 0, body
+            return [result["id"] for result in body["results"]]
+
+        async def single_assign(ids):
+            for task_id in ids:
+                (await client.post(f"/tasks/{task_id}/auto-assign")).raise_for_status()
+
+        async def bulk_assign(ids):
+            response = await client.post("/tasks/auto-assign/bulk", json={"task_ids": ids + ["missing-task"]})
+            response.raise_for_status()
+            body = response.json()
+            assert body["succeeded"] == len(ids) and body["failed"] == 1, body
+
+        single_ids = await measure("create  single", single_create)
+        bulk_ids = await measure("create  bulk", bulk_create)
+        await measure("assign  single", lambda: single_assign(single_ids))
+        await measure("assign  bulk", lambda: bulk_assign(bulk_ids))
+    await service.aclose()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--db-latency-ms", type=float, default=5.0)
+    parser.add_argument("--agent-latency-ms", type=float, default=300.0)
+    args = parser.parse_args()
+
+    app.dependency_overrides[get_current_user] = lambda: AuthUser(uid="bench-user")
+    store = providers.get_firestore_service()
+    for i in range(20):
+        store.upsert_user(f"user_{i}", {"id": f"user_{i}", "name": f"Member {i}", "skills": ["python"]})
+    facade = _LatencyFacade(store, args.db_latency_ms / 1000)
+    tasks_router.get_async_firestore_service = lambda: facade
+
+    rows = asyncio.run(_run(args.tasks, args.agent_latency_ms / 1000, facade))
+    print(f"{args.tasks} tasks, db latency {args.db_latency_ms} ms, agent latency {args.agent_latency_ms} ms")
+    for label, (elapsed, db_calls, agent_calls) in rows.items():
+        print(f"  {label:<15} {elapsed:8.2f} s  {args.tasks / elapsed:8.1f} tasks/s  {db_calls:5} db calls  {agent_calls:4} agent calls")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Stand-ins for GCP used by the load-test harness and benchmarks.
+
+``install_fake_firebase`` makes firebase_admin.auth.verify_id_token accept
+any bearer token (``uid`` = the token, claims valid for an hour) and
+answers the startup certificate warm-up locally, and ``FakeGemini`` replaces the ADK
+client in ai_agent_server with a model that answers every agent prompt
+with well-formed JSON after a configurable, optionally jittered latency.
+"""
+
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from types import ModuleType, SimpleNamespace
+from typing import Optional
+
+import ai_agent_server
+
+
+def install_fake_firebase(verify_latency: float = 0.0, project_id: str = "fake-project") -> None:
+    def verify_id_token(token: str):
+        if verify_latency:
+            time.sleep(verify_latency)
+        now = int(time.time())
+        # Real ID tokens carry exp, which is what lets get_current_user's TokenCache keep them
+        return {
+            "uid": token,
+            "sub": token,
+            "email": f"{token}@example.com",
+            "name": token,
+            "iat": now,
+            "exp": now + 3600,
+            "aud": project_id,
+            "iss": f"https://securetoken.google.com/{project_id}",
+        }
+
+    app = SimpleNamespace(project_id=project_id)
+    # What app.auth.warm_public_keys reaches through: the token verifier's certificate transport
+    token_verifier = SimpleNamespace(
+        request=lambda url, method="GET", **kwargs: SimpleNamespace(status=200, data=b"{}"),
+        id_token_verifier=SimpleNamespace(cert_url="https://certs.invalid/securetoken"),
+    )
+
+    firebase_admin = ModuleType("firebase_admin")
+    firebase_admin._apps = [app]
+    firebase_admin.get_app = lambda name=None: app
+    firebase_admin.auth = SimpleNamespace(
+        verify_id_token=verify_id_token,
+        _get_client=lambda app=None: SimpleNamespace(_token_verifier=token_verifier),
+    )
+    firebase_admin.credentials = SimpleNamespace()
+    sys.modules["firebase_admin"] = firebase_admin
+
+
+class FakeGemini:
+    """``client.aio.models`` replacement; latency is base * lognormal(0, jitter)."""
+
+    def __init__(self, latency: float, jitter: float = 0.0, seed: Optional[int] = None) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    def install(self) -> "FakeGemini":
+        ai_agent_server.client = SimpleNamespace(aio=SimpleNamespace(models=self))
+        return self
+
+    @staticmethod
+    def _assignment(member_id: Optional[str], reason: str) -> dict:
+        return {"predicted_hours": 6.0, "best_member_id": member_id, "priority": 3, "deadline": "2030-01-01",
+                "flowchart_next_step": "Development", "required_meeting": False, "meeting_suggestion": None,
+                "reason": reason}
+
+    def answer(self, prompt: str) -> str:
+        members = re.findall(r"\(ID: ([^)]+)\)", prompt)
+        if "task_index" in prompt:
+            titles = re.findall(r"^- Title: (.*)$", prompt, re.MULTILINE)
+            return json.dumps([
+                {"task_index": index, **self._assignment(members[index % len(members)] if members else None, title)}
+                for index, title in enumerate(titles)
+            ])
+        if "optimal assignment" in prompt:
+            return json.dumps(self._assignment(members[0] if members else None, "fake assignment"))
+        if '"bullets"' in prompt:
+            return json.dumps({"bullets": ["Progress discussed", "Blocker raised", "Owner agreed"],
+                               "status": "In progress", "next_step": "Follow up tomorrow"})
+        if "overloaded" in prompt:
+            return json.dumps({"overloaded": [], "suggestions": ["Rebalance reviews", "Defer low-priority work"]})
+        if "suggest a meeting" in prompt:
+            return json.dumps({"attendees": members[:2], "duration": 30, "day": "2030-01-01", "reason": "fake"})
+        return json.dumps({"flowchart_next_step": "Testing", "blockers": [], "recommended_action": "Write tests"})
+
+    async def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        delay = self.latency * (self.rng.lognormvariate(0.0, self.jitter) if self.jitter else 1.0)
+        await asyncio.sleep(delay)
+        return SimpleNamespace(text=self.answer(contents))
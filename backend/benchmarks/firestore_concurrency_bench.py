@@ -0,0 +1,90 @@
+"""
+Concurrency benchmark for the async Firestore data layer.
+
+Drives POST /messages/ with many concurrent clients against the in-memory
+store with simulated round-trip latency, once with blocking calls on the
+event loop (the old sync client) and once with the async service.
+
+Run from the backend directory:
+    python -m benchmarks.firestore_concurrency_bench --clients 64 --requests 640
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("FIRESTORE_BACKEND", "memory")
+
+import httpx
+
+from app.auth import AuthUser, get_current_user
+from app.main import app
+from app.routers import messages as messages_router
+from app.services import providers
+
+
+class _LatencyFacade:
+    """Async service surface over the memory store that adds a per-call round trip."""
+
+    def __init__(self, store, latency: float, blocking: bool) -> None:
+        self._store = store
+        self._latency = latency
+        self._blocking = blocking
+
+    def __getattr__(self, name):
+        method = getattr(self._store, name)
+
+        async def call(*args, **kwargs):
+            if self._blocking:
+                time.sleep(self._latency)
+            else:
+                await asyncio.sleep(self._latency)
+            return method(*args, **kwargs)
+
+        return call
+
+
+async def _drive(clients: int, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(requests):
+            queue.put_nowait(i)
+
+        async def worker():
+            while not queue.empty():
+                i = queue.get_nowait()
+                response = await client.post("/messages/", json={"task_id": "bench-task", "text": f"msg {i}"})
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=640)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="simulated Firestore round trip")
+    args = parser.parse_args()
+
+    app.dependency_overrides[get_current_user] = lambda: AuthUser(uid="bench-user")
+    store = providers.get_firestore_service()
+    store.create_task({"id": "bench-task", "title": "Bench", "complexity": "low", "activity_log": []})
+
+    results = {}
+    for label, blocking in (("blocking", True), ("async", False)):
+        facade = _LatencyFacade(store, args.latency_ms / 1000, blocking)
+        messages_router.get_async_firestore_service = lambda facade=facade: facade
+        results[label] = asyncio.run(_drive(args.clients, args.requests))
+
+    print(f"clients={args.clients} requests={args.requests} latency={args.latency_ms}ms")
+    for label, rps in results.items():
+        print(f"  {label:<9} {rps:8.1f} req/s")
+    print(f"  speedup   {results['async'] / results['blocking']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Load test for non-blocking Gemini calls in ai_agent_server.
+
+Swaps the ADK client for a fake whose generate_content sleeps for a fixed
+latency, then fires N concurrent /summarize requests. With the async API
+the batch finishes in roughly one latency (per GEMINI_MAX_CONCURRENCY
+slots), not N latencies.
+
+Run from the backend directory:
+    python -m benchmarks.gemini_load_bench --requests 16 --latency-ms 500
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import httpx
+
+import ai_agent_server
+
+
+class FakeModels:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.calls = 0
+
+    async def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(text=json.dumps({"bullets": ["fake"], "status": "ok", "next_step": "none"}))
+
+
+def install_fake_client(latency: float) -> FakeModels:
+    models = FakeModels(latency)
+    ai_agent_server.client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    return models
+
+
+async def _fire(requests: int) -> float:
+    transport = httpx.ASGITransport(app=ai_agent_server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://agent", timeout=None) as client:
+        body = {"messages": [{"sender_id": "u1", "text": "hello"}], "instructions": "summarize"}
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.post("/summarize", json=body) for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+    assert all(response.status_code == 200 for response in responses)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=500.0)
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    models = install_fake_client(latency)
+    elapsed = asyncio.run(_fire(args.requests))
+    waves = -(-args.requests // ai_agent_server.GEMINI_MAX_CONCURRENCY)
+
+    print(f"{args.requests} concurrent requests, fake model latency {args.latency_ms:.0f} ms")
+    print(f"  elapsed:             {elapsed * 1000:8.1f} ms")
+    print(f"  expected (bounded):  {waves * args.latency_ms:8.1f} ms")
+    print(f"  serial would take:   {args.requests * args.latency_ms:8.1f} ms")
+    print(f"  model calls: {models.calls}, stats: {ai_agent_server.gemini_stats}")
+    assert elapsed < (waves + 1) * latency, "Gemini calls are serialising on the event loop"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""
+Reproducible load test of the API and the agent server without GCP.
+
+Boots app.main:app (with its lifespan) and ai_agent_server:app in one
+process, on the in-memory Firestore backend, with a fake verify_id_token
+and a fake Gemini client whose latency is configurable. Seeds a synthetic
+team, backlog and chat threads from a fixed RNG seed, then drives
+closed-loop scenarios with a fixed number of requests each (or, with
+--fixtures, loads a production-sized workspace written by
+``synthetic_data.py --ndjson``):
+
+* dashboard        board summary, roster, updates, meetings, overload report
+* task_burst       many clients creating tasks at once (standup burst)
+* chat_polling     clients polling threads with ?since= and If-None-Match,
+                   occasionally posting a message
+* summarize_storm  many threads summarized at once, then again
+
+Results are written as JSON: throughput and p50/p95/p99 latency per
+scenario and endpoint (route template), plus the config and git commit,
+so runs can be compared across commits with --compare.
+
+Run from the backend directory:
+    python -m benchmarks.harness --output results.json
+    python -m benchmarks.harness --http --gemini-latency-ms 800 --output results.json
+    python -m benchmarks.harness --compare baseline.json --fail-on-regression 20
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+os.environ.setdefault("FIRESTORE_BACKEND", "memory")
+
+SCENARIOS = ("dashboard", "task_burst", "chat_polling", "summarize_storm")
+SKILLS = ["python", "react", "sql", "devops", "design", "testing", "go", "kotlin"]
+
+
+class Recorder:
+    """Client-side latency per endpoint label, e.g. ``GET /tasks/{task_id}``."""
+
+    def __init__(self) -> None:
+        self.samples = defaultdict(list)
+        self.errors = Counter()
+
+    async def call(self, client, method: str, url: str, label: str, expect=(200, 201, 304), **kwargs):
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.samples[f"{method} {label}"].append(time.perf_counter() - start)
+        if response.status_code not in expect:
+            self.errors[f"{method} {label}"] += 1
+        return response
+
+
+def _percentile(ordered, fraction: float) -> float:
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    for label, samples in sorted(recorder.samples.items()):
+        ordered = sorted(samples)
+        endpoints[label] = {
+            "requests": len(ordered),
+            "errors": recorder.errors[label],
+            "throughput_rps": round(len(ordered) / elapsed, 2),
+            "p50_ms": round(_percentile(ordered, 0.50) * 1000, 3),
+            "p95_ms": round(_percentile(ordered, 0.95) * 1000, 3),
+            "p99_ms": round(_percentile(ordered, 0.99) * 1000, 3),
+        }
+    total = sum(len(samples) for samples in recorder.samples.values())
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "requests": total,
+        "errors": sum(recorder.errors.values()),
+        "throughput_rps": round(total / elapsed, 2),
+        "endpoints": endpoints,
+    }
+
+
+def seed(store, users: int, tasks: int, threads: int, messages_per_thread: int, rng: random.Random) -> dict:
+    """Synthetic team, backlog and chat threads loaded straight into the memory store."""
+    members = []
+    for i in range(users):
+        members.append({
+            "id": f"user_{i}", "name": f"Member {i}", "email": f"user_{i}@example.com", "role": "employee",
+            "skills": rng.sample(SKILLS, rng.randint(1, 3)), "capacity_hours": rng.choice([32.0, 40.0]),
+            "status": "active",
+        })
+    store.load(store._users_col, members)
+    start = datetime(2025, 1, 1)
+    task_ids = []
+    for i in range(tasks):
+        assigned = rng.random() < 0.7
+        task_ids.append(f"task_{i}")
+        store.create_task({
+            "id": f"task_{i}", "title": f"Task {i}", "description": "Seeded task", "complexity": "medium",
+            "tags": rng.sample(SKILLS, 2), "status": rng.choice(["open", "in_progress", "in_review", "completed"]),
+            "priority": rng.randint(1, 5), "assigned_to": f"user_{rng.randrange(users)}" if assigned else None,
+            "predicted_hours": rng.choice([2, 4, 8, 16]) if assigned else None, "watchers": [],
+            "created_at": (start + timedelta(minutes=i)).isoformat(), "updated_at": None,
+        })
+    thread_ids = task_ids[:threads]
+    messages = []
+    for task_id in thread_ids:
+        for j in range(messages_per_thread):
+            messages.append({
+                "task_id": task_id, "sender_id": f"user_{rng.randrange(users)}", "text": f"Update {j} on {task_id}",
+                "created_at": (start + timedelta(seconds=j)).isoformat(),
+            })
+    store.load(store._messages_col, messages)
+    from app.services.counters import reconcile_workload
+    from app.services.user_cache import get_user_cache
+
+    reconcile_workload()
+    get_user_cache().invalidate()
+    return {"task_ids": task_ids, "thread_ids": thread_ids}
+
+
+def load_fixtures(store, directory: str, threads: int) -> dict:
+    """A workspace from ``synthetic_data.py --ndjson``; chat scenarios use its longest threads."""
+    counts = store.load_fixtures(directory)
+    print(f"  loaded {', '.join(f'{count:,} {name}' for name, count in counts.items())} from {directory}")
+    task_ids = sorted(store._docs(store._tasks_col))
+    lengths = Counter(doc["task_id"] for doc in store._docs(store._messages_col).values())
+    thread_ids = [task_id for task_id, _ in sorted(lengths.items(), key=lambda item: (-item[1], item[0]))[:threads]]
+    return {"task_ids": task_ids, "thread_ids": thread_ids or task_ids[:threads]}
+
+
+def _auth(client_id: int) -> dict:
+    return {"Authorization": f"Bearer bench-user-{client_id}"}
+
+
+async def _clients(count: int, run):
+    await asyncio.gather(*(run(client_id) for client_id in range(count)))
+
+
+async def dashboard(client, recorder: Recorder, data: dict, args) -> None:
+    async def run(client_id: int):
+        headers = _auth(client_id)
+        for _ in range(args.iterations):
+            await asyncio.gather(
+                recorder.call(client, "GET", "/tasks/summary?limit=100", "/tasks/summary", headers=headers),
+                recorder.call(client, "GET", "/users/", "/users/", headers=headers),
+                recorder.call(client, "GET", "/updates/", "/updates/", headers=headers),
+                recorder.call(client, "GET", "/meetings/", "/meetings/", headers=headers),
+                recorder.call(client, "GET", "/agent/who-is-overloaded?advice=none", "/agent/who-is-overloaded",
+                              headers=headers),
+            )
+
+    await _clients(args.clients, run)
+
+
+async def task_burst(client, recorder: Recorder, data: dict, args) -> None:
+    async def run(client_id: int):
+        for i in range(args.iterations):
+            await recorder.call(
+                client, "POST", "/tasks/", "/tasks/", headers=_auth(client_id),
+                json={"title": f"Burst {client_id}-{i}", "description": "Created during a standup burst",
+                      "complexity": "medium", "tags": [SKILLS[(client_id + i) % len(SKILLS)]], "deadline": None,
+                      "flowchart_step": None},
+            )
+
+    await _clients(args.clients, run)
+
+
+async def chat_polling(client, recorder: Recorder, data: dict, args) -> None:
+    rng = random.Random(args.seed + 1)
+    threads = data["thread_ids"]
+
+    async def run(client_id: int):
+        task_id = threads[client_id % len(threads)]
+        headers = _auth(client_id)
+        response = await recorder.call(client, "GET", f"/messages/{task_id}", "/messages/{task_id}", headers=headers)
+        messages = response.json()
+        cursor = messages[-1]["created_at"] if messages else None
+        etag = response.headers.get("ETag")
+        for _ in range(args.iterations):
+            if rng.random() < 0.1:
+                await recorder.call(client, "POST", "/messages/", "/messages/", headers=headers,
+                                    json={"task_id": task_id, "text": f"ping from {client_id}"})
+            params = {"since": cursor} if cursor else {}
+            poll_headers = {**headers, **({"If-None-Match": etag} if etag else {})}
+            response = await recorder.call(client, "GET", f"/messages/{task_id}", "/messages/{task_id}",
+                                           params=params, headers=poll_headers)
+            if response.status_code == 200:
+                etag = response.headers.get("ETag")
+                new = response.json()
+                if new:
+                    cursor = new[-1]["created_at"]
+            await asyncio.sleep(args.poll_interval_ms / 1000)
+
+    await _clients(args.clients, run)
+
+
+async def summarize_storm(client, recorder: Recorder, data: dict, args) -> None:
+    threads = data["thread_ids"][: args.clients]
+
+    async def run(client_id: int):
+        task_id = threads[client_id % len(threads)]
+        for _ in range(max(1, args.iterations // 10)):
+            await recorder.call(client, "POST", f"/messages/{task_id}/summarize", "/messages/{task_id}/summarize",
+                                headers=_auth(client_id))
+
+    await _clients(args.clients, run)
+
+
+async def _serve(app, host: str = "127.0.0.1"):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=0, log_level="warning", lifespan="on"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, task, f"http://{host}:{port}"
+
+
+async def run_harness(args) -> dict:
+    import httpx
+
+    import ai_agent_server
+    from app.main import app
+    from app.services import providers
+    from benchmarks.fakes import FakeGemini, install_fake_firebase
+
+    install_fake_firebase(args.verify_latency_ms / 1000)
+    gemini = FakeGemini(args.gemini_latency_ms / 1000, args.gemini_jitter, seed=args.seed).install()
+    store = providers.get_firestore_service()
+    if args.fixtures:
+        data = load_fixtures(store, args.fixtures, args.threads)
+    else:
+        data = seed(store, args.users, args.tasks, args.threads, args.messages_per_thread, random.Random(args.seed))
+
+    service = providers.get_ai_service()
+    servers = []
+    async with contextlib.AsyncExitStack() as stack:
+        if args.http:
+            agent_server, agent_task, agent_url = await _serve(ai_agent_server.app)
+            servers.append((agent_server, agent_task))
+            service._agent_base_url = agent_url
+            api_server, api_task, api_url = await _serve(app)
+            servers.append((api_server, api_task))
+            transport = httpx.AsyncHTTPTransport()
+        else:
+            service._client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=ai_agent_server.app), base_url="http://agent"
+            )
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            api_url = "http://api"
+            transport = httpx.ASGITransport(app=app)
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(
+                transport=transport, base_url=api_url, timeout=None,
+                limits=httpx.Limits(max_connections=args.clients * 5),
+            )
+        )
+        results = {}
+        for name in args.scenarios:
+            recorder = Recorder()
+            calls_before = gemini.calls
+            start = time.perf_counter()
+            await globals()[name](client, recorder, data, args)
+            results[name] = summarize(recorder, time.perf_counter() - start)
+            results[name]["gemini_calls"] = gemini.calls - calls_before
+            print(f"  {name:<16} {results[name]['requests']:6} requests  {results[name]['throughput_rps']:9.1f} req/s"
+                  f"  {results[name]['errors']} errors")
+        for server, task in reversed(servers):
+            server.should_exit = True
+            await task
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> int:
+    """Print p95 and throughput changes per endpoint; returns how many p95s regressed beyond ``threshold`` %."""
+    regressions = 0
+    print(f"compared with {baseline.get('git_commit', 'unknown')[:12]}")
+    ignored = ("scenarios", "fail_on_regression")
+    differing = sorted(
+        key for key, value in current["config"].items()
+        if key not in ignored and baseline.get("config", {}).get(key) != value
+    )
+    if differing:
+        print(f"⚠️ Config differs from the baseline ({', '.join(differing)}); numbers may not be comparable")
+    for scenario, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(scenario)
+        if before is None:
+            continue
+        print(f"  {scenario}")
+        for label, stats in result["endpoints"].items():
+            old = before["endpoints"].get(label)
+            if old is None:
+                continue
+            p95_change = (stats["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0.0
+            rps_change = (stats["throughput_rps"] - old["throughput_rps"]) / old["throughput_rps"] * 100 \
+                if old["throughput_rps"] else 0.0
+            flag = ""
+            if threshold and p95_change > threshold:
+                regressions += 1
+                flag = "  REGRESSION"
+            print(f"    {label:<40} p95 {old['p95_ms']:9.2f} -> {stats['p95_ms']:9.2f} ms ({p95_change:+6.1f}%)"
+                  f"  rps {rps_change:+6.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of " + ", ".join(SCENARIOS))
+    parser.add_argument("--clients", type=int, default=20, help="concurrent virtual clients per scenario")
+    parser.add_argument("--iterations", type=int, default=20, help="requests (or page loads) per client")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=200, help="tasks with a seeded chat thread")
+    parser.add_argument("--messages-per-thread", type=int, default=40)
+    parser.add_argument("--poll-interval-ms", type=float, default=50.0)
+    parser.add_argument("--gemini-latency-ms", type=float, default=300.0)
+    parser.add_argument("--gemini-jitter", type=float, default=0.3, help="sigma of the lognormal latency multiplier")
+    parser.add_argument("--verify-latency-ms", type=float, default=2.0, help="fake verify_id_token cost")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--fixtures", help="load NDJSON fixtures from synthetic_data.py instead of the built-in seed")
+    parser.add_argument("--http", action="store_true", help="serve both apps with uvicorn on local ports")
+    parser.add_argument("--output", help="write the JSON results here")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--fail-on-regression", type=float, default=0.0, help="exit 1 if any p95 grows more than this %%")
+    args = parser.parse_args()
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    print(f"Running {', '.join(args.scenarios)} ({'uvicorn' if args.http else 'in-process ASGI'})")
+    scenarios = asyncio.run(run_harness(args))
+    # Imported after the run so FIRESTORE_BACKEND is set before any app module loads
+    from app.auth import get_token_cache
+
+    report = {
+        "schema": 1,
+        "git_commit": _git_commit(),
+        "started_at": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "scenarios": scenarios,
+        "token_cache": get_token_cache().stats(),
+    }
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"✅ Results written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(json.load(handle), report, args.fail_on_regression)
+        if regressions:
+            print(f"❌ {regressions} endpoint(s) regressed beyond {args.fail_on_regression}%")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Per-poll cost of the TaskDrawer message refresh as a thread grows.
+
+Seeds one thread in the in-memory store and, at each checkpoint, compares
+a full GET /messages/{task_id} with a delta poll (``since`` + If-None-Match)
+when nothing changed and when one new message arrived. Reports response
+bytes and documents read per poll, and asserts the delta poll stays
+constant.
+
+Run from the backend directory:
+    python -m benchmarks.message_poll_bench --messages 5000
+"""
+
+import argparse
+import os
+from datetime import datetime, timedelta
+
+os.environ.setdefault("FIRESTORE_BACKEND", "memory")
+
+from fastapi.testclient import TestClient
+
+from app.auth import AuthUser, get_current_user
+from app.main import app
+from app.services.providers import get_firestore_service
+
+TASK_ID = "bench-task"
+START = datetime(2024, 1, 1)
+
+
+class _ReadCounter:
+    """Counts documents returned by list_messages on the shared store."""
+
+    def __init__(self, store) -> None:
+        self.reads = 0
+        self._list_messages = store.list_messages
+        store.list_messages = self
+
+    def __call__(self, *args, **kwargs):
+        docs = self._list_messages(*args, **kwargs)
+        self.reads += len(docs)
+        return docs
+
+
+def _add_message(store, i: int) -> None:
+    store.create_message(
+        {
+            "task_id": TASK_ID,
+            "sender_id": f"user_{i % 5}",
+            "text": f"message {i}",
+            "attachments": [],
+            "created_at": (START + timedelta(seconds=i)).isoformat(),
+        }
+    )
+
+
+def _poll(client: TestClient, counter: _ReadCounter, **kwargs):
+    counter.reads = 0
+    response = client.get(f"/messages/{TASK_ID}", **kwargs)
+    return response, len(response.content), counter.reads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=5000)
+    args = parser.parse_args()
+
+    app.dependency_overrides[get_current_user] = lambda: AuthUser(uid="bench-user")
+    store = get_firestore_service()
+    counter = _ReadCounter(store)
+    checkpoints = [n for n in (10, 100, 1000, 10000) if n < args.messages] + [args.messages]
+    delta_costs = set()
+    added = 0
+    with TestClient(app) as client:
+        print(f"{'thread':>7} | {'full poll':>18} | {'delta, unchanged':>18} | {'delta, 1 new':>18}")
+        for checkpoint in checkpoints:
+            while added < checkpoint - 1:
+                _add_message(store, added)
+                added += 1
+            full, full_bytes, full_reads = _poll(client, counter)
+            last_seen = full.json()[-1]["created_at"]
+            first, _, _ = _poll(client, counter, params={"since": last_seen})
+            unchanged, unchanged_bytes, unchanged_reads = _poll(
+                client, counter, params={"since": last_seen}, headers={"If-None-Match": first.headers["ETag"]}
+            )
+            assert unchanged.status_code == 304, unchanged.status_code
+            _add_message(store, added)
+            added += 1
+            fresh, fresh_bytes, fresh_reads = _poll(
+                client, counter, params={"since": last_seen}, headers={"If-None-Match": first.headers["ETag"]}
+            )
+            assert fresh.status_code == 200 and len(fresh.json()) == 1
+            delta_costs.add((unchanged_bytes, unchanged_reads, fresh_reads))
+            print(
+                f"{checkpoint:>7} | {full_bytes:>8} B {full_reads:>5} rd | "
+                f"{unchanged_bytes:>8} B {unchanged_reads:>5} rd | {fresh_bytes:>8} B {fresh_reads:>5} rd"
+            )
+    assert len(delta_costs) == 1, f"delta poll cost grew with the thread: {delta_costs}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Micro-batching of concurrent single assignment calls.
+
+Fires bursts of concurrent predict_assignment calls (local assignment off)
+at a stub agent that serves a few requests at a time with a latency that
+grows with the tasks in the request. Checks that every caller gets the
+result for its own task and that a lone call is not held, then compares
+wall time and agent requests with the batcher off and on, and prints the
+batch size distribution and queueing delay it adds.
+
+Run from the backend directory:
+    python -m benchmarks.micro_batch_bench --calls 200 --max-wait-ms 5 --max-size 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("LOCAL_ASSIGNMENT_ENABLED", "false")
+os.environ.setdefault("AI_CACHE_MAX_ENTRIES", "0")
+
+import httpx
+
+from app.services.ai_agent import AIAgentService
+from app.services.ai_batching import AssignmentBatcher
+
+TEAM = [{"id": f"user_{i}", "name": f"Member {i}", "skills": ["python"]} for i in range(20)]
+
+
+def _answer(task: dict) -> dict:
+    number = int(task["title"].rsplit(" ", 1)[1])
+    return {"predicted_hours": 1 + number % 7, "best_member_id": f"user_{number % 20}", "priority": 3,
+            "deadline": "2030-01-01", "flowchart_next_step": "Development", "required_meeting": False,
+            "meeting_suggestion": None, "reason": task["title"]}
+
+
+def _stub_agent(slots: int, base_latency: float, per_task_latency: float):
+    semaphore = asyncio.Semaphore(slots)
+    requests = {"count": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        tasks = body["tasks"] if request.url.path == "/assignment/batch" else [body["task"]]
+        requests["count"] += 1
+        async with semaphore:
+            await asyncio.sleep(base_latency + per_task_latency * len(tasks))
+        if request.url.path == "/assignment/batch":
+            return httpx.Response(200, json={"results": [_answer(task) for task in tasks]})
+        return httpx.Response(200, json=_answer(tasks[0]))
+
+    return handler, requests
+
+
+async def _run(args, max_wait: float):
+    handler, requests = _stub_agent(args.agent_slots, args.base_latency_ms / 1000, args.per_task_latency_ms / 1000)
+    service = AIAgentService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://stub")
+    service._batcher = AssignmentBatcher(service._dispatch_assignments, max_wait=max_wait, max_size=args.max_size)
+
+    start = time.perf_counter()
+    await service.predict_assignment({"title": "Task 0"}, TEAM)
+    lone = time.perf_counter() - start
+
+    tasks = [{"title": f"Task {i}", "tags": []} for i in range(args.calls)]
+
+    async def call(task: dict, delay: float):
+        await asyncio.sleep(delay)
+        return await service.predict_assignment(task, TEAM)
+
+    await asyncio.sleep(max_wait * 2)
+    requests["count"] = 0
+    start = time.perf_counter()
+    # Arrivals spread over ~spread_ms, as requests from many clients would be
+    results = await asyncio.gather(*(call(task, (i % 50) * args.spread_ms / 50000) for i, task in enumerate(tasks)))
+    elapsed = time.perf_counter() - start
+    for task, result in zip(tasks, results):
+        assert result.reason == task["title"] and result.best_member_id == _answer(task)["best_member_id"], (task, result)
+    stats = service.batching_stats()
+    await service.aclose()
+    return lone, elapsed, requests["count"], stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--max-size", type=int, default=10)
+    parser.add_argument("--spread-ms", type=float, default=20.0)
+    parser.add_argument("--agent-slots", type=int, default=8)
+    parser.add_argument("--base-latency-ms", type=float, default=300.0)
+    parser.add_argument("--per-task-latency-ms", type=float, default=30.0)
+    args = parser.parse_args()
+
+    off = asyncio.run(_run(args, 0.0))
+    on = asyncio.run(_run(args, args.max_wait_ms / 1000))
+    print(f"{args.calls} concurrent calls over {args.spread_ms} ms, agent {args.agent_slots} slots")
+    for label, (lone, elapsed, requests, _) in (("no batching", off), (f"wait {args.max_wait_ms} ms", on)):
+        print(f"  {label:<13} lone call {lone * 1000:7.1f} ms  burst {elapsed:6.2f} s  {requests:4} agent requests")
+    assert on[0] < off[0] + args.max_wait_ms / 1000 + 0.05, "lone call was held"
+    stats = on[3]
+    print(f"  batch sizes {stats['batch_sizes']}  mean {stats['mean_batch_size']}")
+    print(f"  queue delay ms {stats['queue_delay_ms']}")
+    print("✅ every caller got its own result")
+
+
+if __name__ == "__main__":
+    main()
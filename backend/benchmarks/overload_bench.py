@@ -0,0 +1,104 @@
+"""
+Latency of GET /agent/who-is-overloaded: LLM-ranked vs local analytics.
+
+Seeds a team in the in-memory store and puts a stub agent with Gemini-like
+latency behind AIAgentService (response cache off). Times the old flow,
+which awaits the overload report for the whole roster, against the local
+snapshot with advice fetched in the background.
+
+Run from the backend directory:
+    python -m benchmarks.overload_bench --members 2000 --latency-ms 1500
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("FIRESTORE_BACKEND", "memory")
+os.environ.setdefault("AI_CACHE_TTLS", "/overload=0")
+
+import httpx
+
+from app.services import providers
+from app.services.workload import OverloadAdvisor, utilization, workload_snapshot
+
+
+def _seed(members: int) -> None:
+    rng = random.Random(7)
+    store = providers.get_firestore_service()
+    for i in range(members):
+        store.upsert_user(
+            f"user_{i}",
+            {
+                "id": f"user_{i}",
+                "name": f"Member {i}",
+                "capacity_hours": 40.0,
+                "assigned_hours": round(rng.uniform(0, 52), 1),
+                "skills": ["python"],
+            },
+        )
+
+
+async def _old_flow():
+    users = await providers.get_async_firestore_service().list_users()
+    workloads = [
+        {"id": u["id"], "name": u.get("name"), "utilization": utilization(u), "skills": u.get("skills")} for u in users
+    ]
+    return await providers.get_ai_service().overload_report(workloads)
+
+
+async def _new_flow(advisor: OverloadAdvisor):
+    users = await providers.get_async_firestore_service().list_users()
+    report = workload_snapshot(users, threshold=0.9, top_n=3)
+    report["advice_status"], report["suggestions"] = await advisor.advise(report["overloaded"], wait=False)
+    return report
+
+
+async def _time(coro_factory, runs: int):
+    samples = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = await coro_factory()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, result
+
+
+async def _run(runs: int, latency: float):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json={"overloaded": [], "suggestions": ["Rebalance reviews"]})
+
+    service = providers.get_ai_service()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://stub")
+    advisor = OverloadAdvisor()
+    old_ms, _ = await _time(_old_flow, runs)
+    new_ms, first = await _time(lambda: _new_flow(advisor), 1)
+    await asyncio.sleep(latency * 1.5)
+    warm_ms, warm = await _time(lambda: _new_flow(advisor), runs)
+    await service.aclose()
+    return old_ms, new_ms, first, warm_ms, warm
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=1500.0)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    _seed(args.members)
+    old_ms, new_ms, first, warm_ms, warm = asyncio.run(_run(args.runs, args.latency_ms / 1000))
+    print(f"{args.members} members, agent latency {args.latency_ms:.0f} ms")
+    print(f"  LLM-ranked (old):            {old_ms:9.1f} ms")
+    print(f"  local, advice pending:       {new_ms:9.1f} ms  ({first['breaches']} breaches, advice {first['advice_status']})")
+    print(f"  local, advice attached:      {warm_ms:9.1f} ms  (advice {warm['advice_status']}: {warm['suggestions']})")
+    assert first["advice_status"] == "pending" and warm["advice_status"] == "ready"
+    assert new_ms < args.latency_ms / 10, "local report should not wait on the agent"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Fan-out check for the realtime hub over the in-memory event source.
+
+Opens N subscriptions on one task thread, writes messages through the
+store and reports delivery latency, then verifies that all connections
+share one listener per collection and that a consumer that never reads
+is dropped with an overflow instead of growing without bound.
+
+Run from the backend directory:
+    python -m benchmarks.realtime_fanout_bench --connections 500 --messages 200
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime
+
+os.environ.setdefault("FIRESTORE_BACKEND", "memory")
+
+from app.services.memory import InMemoryFirestoreService
+from app.services.realtime import RealtimeHub
+
+TASK_ID = "bench-task"
+
+
+class _CountingSource:
+    """Memory store wrapper that counts listeners opened against it."""
+
+    def __init__(self, store: InMemoryFirestoreService) -> None:
+        self.store = store
+        self.listeners = 0
+
+    def watch(self, *args):
+        self.listeners += 1
+        return self.store.watch(*args)
+
+
+async def _run(connections: int, messages: int, queue_size: int):
+    store = InMemoryFirestoreService()
+    source = _CountingSource(store)
+    hub = RealtimeHub(source, queue_size=queue_size)
+    readers = [hub.subscribe(["messages", "tasks"], TASK_ID) for _ in range(connections)]
+    stalled = hub.subscribe(["messages"], TASK_ID)
+    other_task = hub.subscribe(["messages"], "other-task")
+    latencies = []
+
+    async def read(subscription):
+        for _ in range(messages):
+            event = await subscription.queue.get()
+            latencies.append(time.perf_counter() - event["document"]["sent"])
+
+    consumers = [asyncio.create_task(read(subscription)) for subscription in readers]
+    start = time.perf_counter()
+    for i in range(messages):
+        store.create_message(
+            {"task_id": TASK_ID, "text": f"m{i}", "created_at": datetime.utcnow().isoformat(), "sent": time.perf_counter()}
+        )
+        await asyncio.sleep(0)
+    await asyncio.gather(*consumers)
+    elapsed = time.perf_counter() - start
+    stats = hub.stats()
+    for subscription in readers + [stalled, other_task]:
+        hub.unsubscribe(subscription)
+    return source, stalled, other_task, latencies, elapsed, stats, hub.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--connections", type=int, default=500)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--queue-size", type=int, default=100)
+    args = parser.parse_args()
+
+    source, stalled, other_task, latencies, elapsed, stats, closed = asyncio.run(
+        _run(args.connections, args.messages, args.queue_size)
+    )
+    latencies.sort()
+    delivered = len(latencies)
+    print(f"{args.messages} messages x {args.connections} connections -> {delivered} deliveries in {elapsed * 1000:.1f} ms")
+    print(
+        f"latency p50 {latencies[delivered // 2] * 1e6:.0f} us, "
+        f"p99 {latencies[int(delivered * 0.99)] * 1e6:.0f} us, listeners opened {source.listeners}"
+    )
+    print(f"hub stats: {stats}")
+    assert delivered == args.connections * args.messages
+    assert source.listeners == 2, "expected one shared listener per collection"
+    assert other_task.queue.empty(), "events leaked to a subscriber of another task"
+    if args.messages > args.queue_size:
+        assert stalled.overflowed and stats["overflows"] == 1
+    assert closed["connections"] == 0 and not closed["listeners"], "listeners not released"
+
+
+if __name__ == "__main__":
+    main()
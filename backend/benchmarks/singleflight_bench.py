@@ -0,0 +1,54 @@
+"""
+Single-flight check for AIAgentService.
+
+Fires N concurrent identical overload reports at a stub agent that takes
+a while to answer and asserts that exactly one upstream call was made.
+
+Run from the backend directory:
+    python -m benchmarks.singleflight_bench --callers 100
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.services.ai_agent import AIAgentService
+
+
+async def _run(callers: int, latency: float):
+    upstream_calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal upstream_calls
+        upstream_calls += 1
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json={"overloaded": [], "suggestions": ["stub"]})
+
+    service = AIAgentService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://stub")
+    workloads = [{"id": "u1", "name": "Alice", "utilization": 1.2}]
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(service.overload_report(workloads) for _ in range(callers)))
+    elapsed = time.perf_counter() - start
+    await service.aclose()
+    return upstream_calls, results, elapsed, service.coalescing_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--callers", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    upstream_calls, results, elapsed, stats = asyncio.run(_run(args.callers, args.latency_ms / 1000))
+    print(f"{args.callers} concurrent callers -> {upstream_calls} upstream call(s) in {elapsed * 1000:.1f} ms")
+    print(f"coalescing stats: {stats}")
+    assert upstream_calls == 1, f"expected one upstream call, got {upstream_calls}"
+    assert all(result["suggestions"] == ["stub"] for result in results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Document reads and prompt size for POST /messages/{task_id}/summarize.
+
+Grows one thread in the in-memory store and re-summarizes after a fixed
+number of new messages at each checkpoint. Compares the reads of loading
+the whole thread (the old path) with the incremental summarizer, and
+asserts that re-summarizing costs O(new messages) however long the
+thread is.
+
+Run from the backend directory:
+    python -m benchmarks.summarize_cost_bench --messages 5000 --new 5
+"""
+
+import argparse
+import os
+from datetime import datetime, timedelta
+
+os.environ.setdefault("FIRESTORE_BACKEND", "memory")
+os.environ.setdefault("ENRICHMENT_MODE", "external")
+
+from fastapi.testclient import TestClient
+
+from app.auth import AuthUser, get_current_user
+from app.main import app
+from app.routers import messages as messages_router
+from app.services.providers import get_firestore_service
+
+TASK_ID = "bench-task"
+START = datetime(2024, 1, 1)
+
+
+class _StubSummarizer:
+    """Records what the summarizer is sent instead of calling the agent."""
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    async def summarize_chat(self, messages, previous_summary=None):
+        self.calls.append((len(messages), previous_summary is not None))
+        return {"bullets": [f"{len(messages)} messages"], "status": "ok", "next_step": "none", "cache_hit": False}
+
+
+class _ReadCounter:
+    """Counts documents returned by the store's read methods."""
+
+    def __init__(self, store) -> None:
+        self.reads = 0
+        for name in ("get_task", "list_messages", "latest_messages"):
+            setattr(store, name, self._wrap(getattr(store, name)))
+
+    def _wrap(self, method):
+        def call(*args, **kwargs):
+            result = method(*args, **kwargs)
+            self.reads += len(result) if isinstance(result, list) else 1
+            return result
+
+        return call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--new", type=int, default=5, help="messages added between re-summarizations")
+    args = parser.parse_args()
+
+    app.dependency_overrides[get_current_user] = lambda: AuthUser(uid="bench-user")
+    summarizer = _StubSummarizer()
+    messages_router.get_ai_service = lambda: summarizer
+    store = get_firestore_service()
+    store.create_task({"id": TASK_ID, "title": "Bench", "created_at": START.isoformat()})
+    counter = _ReadCounter(store)
+    checkpoints = [n for n in (10, 100, 1000, 10000) if args.new < n < args.messages] + [args.messages]
+    added = 0
+    incremental_reads = set()
+
+    def add(count):
+        nonlocal added
+        for _ in range(count):
+            store.create_message(
+                {"task_id": TASK_ID, "sender_id": "u", "text": f"m{added}",
+                 "created_at": (START + timedelta(seconds=added)).isoformat()}
+            )
+            added += 1
+
+    with TestClient(app) as client:
+        print(f"{'thread':>7} | {'full thread':>11} | {'incremental':>11} | {'sent':>4} | {'unchanged':>9}")
+        for checkpoint in checkpoints:
+            add(max(checkpoint - args.new - added, 0))
+            client.post(f"/messages/{TASK_ID}/summarize").raise_for_status()
+            add(args.new)
+            counter.reads = 0
+            store.list_messages(TASK_ID)
+            full_reads = counter.reads
+            counter.reads = 0
+            before = len(summarizer.calls)
+            client.post(f"/messages/{TASK_ID}/summarize").raise_for_status()
+            # More new messages than SUMMARY_TAIL_MESSAGES are folded in page by page
+            pages = summarizer.calls[before:]
+            reads, sent = counter.reads, sum(count for count, _ in pages)
+            incremental = all(has_previous for _, has_previous in pages)
+            counter.reads = 0
+            calls = len(summarizer.calls)
+            client.post(f"/messages/{TASK_ID}/summarize").raise_for_status()
+            assert len(summarizer.calls) == calls, "unchanged thread should not call the agent"
+            print(f"{added:>7} | {full_reads:>6} reads | {reads:>6} reads | {sent:>4} | {counter.reads:>3} reads")
+            assert incremental and sent == args.new
+            incremental_reads.add(reads)
+    assert len(incremental_reads) == 1, f"re-summarize reads grew with the thread: {incremental_reads}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+End-to-end trace of POST /tasks/ across the API, the agent server and Gemini.
+
+Runs both apps in process with in-memory span exporters, a fake
+verify_id_token and a fake Gemini client with fixed latency, with
+ENRICHMENT_MODE=inline so the request waits for its assignment. Checks that
+the API's spans and the agent server's spans share one trace and nest
+(request -> auth / Firestore / agent hop -> agent request -> prompt
+building / generate_content), prints the span tree with durations, then
+checks the sampler: unsampled roots are dropped and a sampled incoming
+traceparent is always followed.
+
+Run from the backend directory:
+    python -m benchmarks.tracing_bench --gemini-latency-ms 200
+"""
+
+import argparse
+import asyncio
+import os
+
+os.environ.setdefault("FIRESTORE_BACKEND", "memory")
+os.environ.setdefault("ENRICHMENT_MODE", "inline")
+os.environ.setdefault("LOCAL_ASSIGNMENT_ENABLED", "false")
+os.environ.setdefault("AI_BATCH_MAX_WAIT_MS", "0")
+os.environ["TRACING_EXPORTER"] = "memory"
+os.environ["TRACING_SAMPLE_RATIO"] = "1.0"
+
+import httpx
+
+import ai_agent_server
+from app.main import app
+from app.services import providers
+from app.services.tracing import get_memory_exporter
+from benchmarks.fakes import FakeGemini, install_fake_firebase
+from telemetry import build_tracer_provider
+
+
+def _print_tree(spans) -> None:
+    children = {}
+    for span in spans:
+        parent = span.parent.span_id if span.parent else None
+        children.setdefault(parent, []).append(span)
+    by_id = {span.context.span_id for span in spans}
+
+    def walk(span, depth):
+        duration = (span.end_time - span.start_time) / 1e6
+        service = span.resource.attributes.get("service.name")
+        print(f"  {'  ' * depth}{span.name:<40} {duration:8.2f} ms  [{service}]")
+        for child in sorted(children.get(span.context.span_id, []), key=lambda s: s.start_time):
+            walk(child, depth + 1)
+
+    for root in [span for span in spans if not span.parent or span.parent.span_id not in by_id]:
+        walk(root, 0)
+
+
+async def _run(latency: float):
+    FakeGemini(latency).install()
+    service = providers.get_ai_service()
+    service._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=ai_agent_server.app), base_url="http://agent")
+    store = providers.get_firestore_service()
+    store.upsert_user("user_1", {"id": "user_1", "name": "Ada", "skills": ["python"]})
+    get_memory_exporter().clear()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://api") as client:
+        response = await client.post(
+            "/tasks/",
+            json={"title": "Traced task", "complexity": "low", "tags": ["python"], "deadline": None, "flowchart_step": None},
+            headers={"Authorization": "Bearer token-1"},
+        )
+        assert response.status_code == 201, response.text
+        assert response.json()["assigned_to"] == "user_1", response.json()
+    await service.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--gemini-latency-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    install_fake_firebase()
+    asyncio.run(_run(args.gemini_latency_ms / 1000))
+
+    spans = list(get_memory_exporter().get_finished_spans()) + list(ai_agent_server.tracing.memory_exporter.get_finished_spans())
+    trace_ids = {span.context.trace_id for span in spans}
+    assert len(trace_ids) == 1, f"expected one trace, got {len(trace_ids)}"
+    names = {span.name: span for span in spans}
+    for expected in ("POST /tasks/", "auth.verify_id_token", "firestore.create_task", "firestore.load_users",
+                     "ai_agent POST /assignment", "POST /assignment", "assignment.build_prompt", "gemini.generate_content"):
+        assert expected in names, f"missing span {expected}: {sorted(names)}"
+    assert names["POST /assignment"].parent.span_id == names["ai_agent POST /assignment"].context.span_id
+    assert names["gemini.generate_content"].parent.span_id == names["POST /assignment"].context.span_id
+    assert names["ai_agent POST /assignment"].resource.attributes["service.name"] == "ai-workspace-api"
+    assert names["POST /assignment"].resource.attributes["service.name"] == "ai-agent-server"
+    print(f"POST /tasks/ trace {trace_ids.pop():032x}, {len(spans)} spans")
+    _print_tree(spans)
+
+    provider, exporter = build_tracer_provider("sampling-check", "memory", "", 0.0)
+    tracer = provider.get_tracer("check")
+    for _ in range(100):
+        with tracer.start_as_current_span("unsampled root"):
+            pass
+    from opentelemetry import propagate
+
+    parent = propagate.extract({"traceparent": "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"})
+    with tracer.start_as_current_span("continued", context=parent):
+        pass
+    assert [span.name for span in exporter.get_finished_spans()] == ["continued"]
+    print("✅ one trace across both services; ratio 0 drops new roots but follows a sampled traceparent")
+
+
+if __name__ == "__main__":
+    main()
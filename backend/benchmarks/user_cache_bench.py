@@ -0,0 +1,120 @@
+"""
+Read-through user cache: store reads saved, and writes visible on the next read.
+
+Runs against the in-memory store, counting the loads that reach it. Checks
+that upsert_user and workload counter updates are visible on the very
+next list_users/get_user, that a load racing an invalidation is not
+cached, that entries expire after the TTL and that a listener event
+invalidates. Then times roster reads with and without the cache.
+
+Run from the backend directory:
+    python -m benchmarks.user_cache_bench --members 500 --reads 2000
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("FIRESTORE_BACKEND", "memory")
+os.environ.setdefault("USER_CACHE_TTL_SECONDS", "0.5")
+
+from app.services.memory import InMemoryFirestoreService
+from app.services.user_cache import get_user_cache
+
+
+class _CountingStore(InMemoryFirestoreService):
+    """Memory store that counts the loads reaching it through the cache."""
+
+    loads = 0
+
+    def _load_users(self):
+        self.loads += 1
+        return super()._load_users()
+
+    def _load_user(self, user_id):
+        self.loads += 1
+        return super()._load_user(user_id)
+
+
+def _check_consistency(store: _CountingStore) -> None:
+    cache = get_user_cache()
+    store.upsert_user("u1", {"id": "u1", "name": "Ada", "capacity_hours": 40.0})
+    assert store.get_user("u1")["name"] == "Ada"
+    store.list_users()
+    loads = store.loads
+    assert store.list_users()[0]["name"] == "Ada" and store.loads == loads, "second read should be a hit"
+
+    store.upsert_user("u1", {"name": "Ada L."})
+    assert store.list_users()[0]["name"] == "Ada L.", "roster write not visible on next read"
+    assert store.get_user("u1")["name"] == "Ada L.", "profile write not visible on next read"
+
+    store.create_task({"id": "t1", "title": "T", "status": "open", "created_at": "2024-01-01T00:00:00"})
+    store.update_task("t1", {"assigned_to": "u1", "predicted_hours": 8})
+    assert store.get_user("u1")["assigned_hours"] == 8, "counter update not visible on next read"
+    assert store.list_users()[0]["open_tasks"] == 1
+
+    returned = store.list_users()
+    returned[0]["name"] = "mutated by caller"
+    assert store.list_users()[0]["name"] == "Ada L.", "cached roster shared with callers"
+
+    generation = cache.generation
+    stale = store._load_users()
+    cache.invalidate(["u1"])
+    cache.put_roster(stale, generation)
+    assert cache.roster() is None, "load that raced an invalidation was cached"
+
+    store.get_user("u1")
+    time.sleep(cache.stats()["ttl_seconds"] + 0.1)
+    loads = store.loads
+    store.get_user("u1")
+    assert store.loads == loads + 1, "entry outlived its TTL"
+
+    class _Source:
+        def watch(self, name, field, since, callback):
+            self.callback = callback
+            return lambda: None
+
+    source = _Source()
+    cache.listen(source, "users")
+    store.list_users()
+    source.callback("modified", {"id": "u1"})
+    loads = store.loads
+    store.list_users()
+    assert store.loads == loads + 1, "listener event did not invalidate"
+    cache.close()
+
+
+def _time_reads(store: _CountingStore, reads: int, cached: bool) -> float:
+    cache = get_user_cache()
+    start = time.perf_counter()
+    for _ in range(reads):
+        if not cached:
+            cache.invalidate()
+        store.list_users()
+    return (time.perf_counter() - start) / reads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=500)
+    parser.add_argument("--reads", type=int, default=2000)
+    args = parser.parse_args()
+
+    _check_consistency(_CountingStore())
+    print("✅ writes visible on next read, racing fills dropped, TTL and listener invalidation work")
+
+    store = _CountingStore()
+    for i in range(args.members):
+        store.upsert_user(f"user_{i}", {"id": f"user_{i}", "name": f"Member {i}", "skills": ["python", "sql"]})
+    store.loads = 0
+    uncached = _time_reads(store, args.reads, cached=False)
+    uncached_loads, store.loads = store.loads, 0
+    cached = _time_reads(store, args.reads, cached=True)
+    print(f"{args.reads} roster reads of {args.members} members")
+    print(f"  no cache:   {uncached * 1e6:9.1f} us/read, {uncached_loads} store loads")
+    print(f"  read-through: {cached * 1e6:7.1f} us/read, {store.loads} store loads")
+    print(f"  cache stats: {get_user_cache().stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Incremental workload counters vs recomputing from a full task scan.
+
+Seeds a team and a task backlog in the in-memory store, then applies a
+random stream of task mutations (assignment, re-estimates, status changes,
+reassignment) through update_task/append_activity. Checks that the
+incrementally maintained user counters match a full rebuild, times one
+counter read against one full-scan recompute, and shows the
+reconciliation job repairing deliberately corrupted counters.
+
+Run from the backend directory:
+    python -m benchmarks.workload_counters_bench --tasks 20000 --mutations 5000
+"""
+
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("FIRESTORE_BACKEND", "memory")
+
+from app.services.counters import TASK_LOAD_FIELDS, TASK_STATUSES, rebuild_counters, reconcile_workload
+from app.services.providers import get_firestore_service
+
+
+def _seed(store, members: int, tasks: int, rng: random.Random) -> None:
+    for i in range(members):
+        store.upsert_user(f"user_{i}", {"id": f"user_{i}", "name": f"Member {i}", "capacity_hours": 40.0})
+    start = datetime(2024, 1, 1)
+    for i in range(tasks):
+        store.create_task(
+            {"id": f"task_{i}", "title": f"Task {i}", "status": "open", "assigned_to": None,
+             "created_at": (start + timedelta(seconds=i)).isoformat()}
+        )
+
+
+def _mutate(store, members: int, tasks: int, rng: random.Random) -> None:
+    task_id = f"task_{rng.randrange(tasks)}"
+    kind = rng.random()
+    if kind < 0.4:
+        store.update_task(task_id, {"assigned_to": f"user_{rng.randrange(members)}", "predicted_hours": rng.choice([4, 8, 16])})
+    elif kind < 0.7:
+        store.append_activity(
+            task_id, {"timestamp": datetime.utcnow().isoformat(), "actor": "bench", "action": "Task updated"},
+            {"status": rng.choice(TASK_STATUSES)},
+        )
+    elif kind < 0.9:
+        store.update_task(task_id, {"predicted_hours": rng.uniform(1, 20)})
+    else:
+        store.update_task(task_id, {"assigned_to": None})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--mutations", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    store = get_firestore_service()
+    _seed(store, args.members, args.tasks, rng)
+
+    start = time.perf_counter()
+    for _ in range(args.mutations):
+        _mutate(store, args.members, args.tasks, rng)
+    per_mutation = (time.perf_counter() - start) / args.mutations
+
+    start = time.perf_counter()
+    users = store.list_users()
+    read_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    rebuilt = rebuild_counters(store.list_tasks(fields=TASK_LOAD_FIELDS))
+    scan_ms = (time.perf_counter() - start) * 1000
+
+    for user in users:
+        expected = rebuilt.get(user["id"])
+        if expected is None:
+            assert not user.get("open_tasks") and not any((user.get("task_counts") or {}).values()), user
+            continue
+        assert abs(user["assigned_hours"] - expected["assigned_hours"]) < 1e-6, (user, expected)
+        assert user["open_tasks"] == expected["open_tasks"]
+        assert {k: v for k, v in user["task_counts"].items() if v} == {k: v for k, v in expected["task_counts"].items() if v}
+
+    clean = reconcile_workload()
+    store.upsert_user("user_0", {"assigned_hours": 999.0, "open_tasks": -3})
+    repaired = reconcile_workload()
+    after = reconcile_workload()
+
+    print(f"{args.mutations} mutations over {args.tasks} tasks / {args.members} members")
+    print(f"  counter maintenance:      {per_mutation * 1e6:8.1f} us per mutation")
+    print(f"  read counters (roster):   {read_ms:8.2f} ms")
+    print(f"  recompute from full scan: {scan_ms:8.2f} ms")
+    print(f"  reconcile: clean {clean}, after corruption {repaired}, then {after}")
+    assert clean["corrected"] == 0 and repaired["corrected"] == 1 and after["corrected"] == 0
+
+
+if __name__ == "__main__":
+    main()
@@ -8,14 +8,16 @@ import firebase_admin
 from firebase_admin import credentials, firestore
 from datetime import datetime, timedelta
 
-# Initialize Firebase
-cred_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", 
-    r"D:\AI Workspace manager\secrets\ai-workspace-manager-firebase-adminsdk-fbsvc-455ce1d44b.json")
-if not firebase_admin._apps:
-    cred = credentials.Certificate(cred_path)
-    firebase_admin.initialize_app(cred)
 
-db = firestore.client()
+def get_db():
+    """Initialize Firebase on first use so the mock data can be imported without credentials."""
+    cred_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", 
+        r"D:\AI Workspace manager\secrets\ai-workspace-manager-firebase-adminsdk-fbsvc-455ce1d44b.json")
+    if not firebase_admin._apps:
+        cred = credentials.Certificate(cred_path)
+        firebase_admin.initialize_app(cred)
+    return firestore.client()
+
 
 # Mock employees
 MOCK_EMPLOYEES = [
@@ -271,6 +273,7 @@ MOCK_UPDATES = [
 def seed_collection(collection_name: str, data: list):
     """Seed a Firestore collection with data."""
     print(f"Seeding {collection_name}...")
+    db = get_db()
     for item in data:
         doc_id = item.get("id")
         if doc_id:
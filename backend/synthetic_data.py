@@ -0,0 +1,478 @@
+"""
+Generate a large synthetic workspace for performance testing.
+
+Where seed_data.py writes a handful of hand-written records, this builds a
+workspace of any size from a seeded RNG, so the same arguments always
+produce the same data:
+
+* users: roles and skills drawn from a popularity-skewed catalog, mostly
+  full-time capacities;
+* tasks: tags from the same skill catalog, assigned (when assigned) to a
+  user holding one of the tags, weighted so a few people carry most of
+  the work; status depends on age, and predicted hours on complexity;
+* activity: a creation entry, one per status step and a geometric tail of
+  edits; the newest ACTIVITY_RECENT_WINDOW stay on the task document;
+* messages: heavy-tailed thread lengths (many tasks silent, a few
+  threads in the hundreds);
+* meetings and updates at a configurable density per user per week.
+
+User workload counters are computed from the generated tasks, so
+``python -m app.services.counters`` finds nothing to correct.
+
+Output goes either to NDJSON fixtures (one file per collection, loaded by
+the in-memory backend with FIRESTORE_FIXTURES=<dir> or by
+``benchmarks/harness.py --fixtures <dir>``) or to Firestore with a
+BulkWriter or parallel batched writes:
+
+    python synthetic_data.py --users 2000 --tasks 100000 --ndjson fixtures/large
+    python synthetic_data.py --users 2000 --tasks 100000 --firestore --writer batch --workers 16
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.config import get_settings
+from app.services.counters import TASK_STATUSES, apply_load_delta, task_load
+
+ROLES = [("developer", 0.55), ("designer", 0.1), ("qa", 0.1), ("devops", 0.1), ("manager", 0.15)]
+SKILLS_BY_ROLE = {
+    "developer": ["Python", "FastAPI", "React", "TypeScript", "JavaScript", "Node.js", "Go", "Java", "SQL",
+                  "MongoDB", "GraphQL", "Kotlin", "Swift", "Machine Learning", "Data Science"],
+    "designer": ["Figma", "UI/UX", "CSS", "Tailwind", "Illustration", "Prototyping"],
+    "qa": ["Testing", "Playwright", "Selenium", "Python", "Performance Testing"],
+    "devops": ["Docker", "Kubernetes", "Terraform", "GCP", "CI/CD", "Monitoring"],
+    "manager": ["Project Management", "Agile", "Scrum", "Team Leadership", "Planning"],
+}
+FIRST_NAMES = ["Alice", "Bob", "Carol", "David", "Eva", "Farid", "Grace", "Hiro", "Ines", "Jonas", "Kemi", "Liam",
+               "Maya", "Nikhil", "Olga", "Pablo", "Quinn", "Rosa", "Sven", "Tara", "Umar", "Vera", "Wei", "Yara"]
+LAST_NAMES = ["Johnson", "Smith", "Williams", "Chen", "Martinez", "Okafor", "Kowalski", "Tanaka", "Silva", "Novak",
+              "Haddad", "Müller", "Patel", "Nguyen", "Rossi", "Larsen"]
+PROJECTS = ["AI Workspace Manager", "Billing Revamp", "Mobile App", "Data Platform", "Customer Portal",
+            "Internal Tools", "Search", "Onboarding"]
+CUSTOMERS = ["Internal", "Acme Corp", "Globex", "Initech", "Umbrella", "Stark Industries"]
+VERBS = ["Implement", "Fix", "Refactor", "Design", "Document", "Test", "Migrate", "Optimize", "Review", "Set up"]
+NOUNS = ["authentication", "dashboard", "CI/CD pipeline", "search index", "billing webhook", "onboarding flow",
+         "notification service", "export job", "settings page", "API rate limits", "audit log", "data model"]
+FLOWCHART_STEPS = ["Requirements", "Design", "Development", "Testing", "Review", "Deployment"]
+ACTIVITY_ACTIONS = ["Task updated", "Description edited", "Tags changed", "Deadline moved", "Priority changed",
+                    "Attachment added", "Watcher added"]
+MESSAGE_TEXTS = ["Pushed a first draft, reviews welcome.", "Blocked on the API contract, who owns it?",
+                 "Can we move the deadline by two days?", "Tests are green on my branch.",
+                 "Found the root cause, fix incoming.", "Design is updated in Figma.",
+                 "Deployed to staging, please verify.", "Taking this over while they are out.",
+                 "Needs a decision from product.", "Merged, closing once QA signs off."]
+# Status progression; tasks further along have one activity entry per step
+STATUS_STEPS = ["open", "in_progress", "in_review", "completed"]
+COMPLEXITY_HOURS = {"low": (1.2, 0.5), "medium": (2.2, 0.5), "high": (3.2, 0.5)}
+FIXTURE_FILES = ("users", "tasks", "activity", "messages", "meetings", "updates")
+
+
+class Progress:
+    """Thread-safe document counter printing a rate line every couple of seconds."""
+
+    def __init__(self, label: str, interval: float = 2.0) -> None:
+        self.label = label
+        self.interval = interval
+        self.count = 0
+        self.failed = 0
+        self._start = time.perf_counter()
+        self._last = self._start
+        self._lock = threading.Lock()
+
+    def tick(self, count: int = 1) -> None:
+        with self._lock:
+            self.count += count
+            now = time.perf_counter()
+            if now - self._last >= self.interval:
+                self._last = now
+                print(f"  … {self.label}: {self.count:,} docs ({self.count / (now - self._start):,.0f}/s)")
+
+    def done(self) -> None:
+        elapsed = time.perf_counter() - self._start
+        failed = f", {self.failed:,} failed" if self.failed else ""
+        print(f"  ✅ {self.label}: {self.count:,} docs in {elapsed:.1f}s "
+              f"({self.count / max(elapsed, 1e-9):,.0f}/s{failed})")
+
+
+class NdjsonSink:
+    """One ``<name>.ndjson`` file per fixture; activity entries carry their ``task_id``."""
+
+    def __init__(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self._files = {name: open(os.path.join(directory, f"{name}.ndjson"), "w") for name in FIXTURE_FILES}
+        self.progress = Progress(f"NDJSON → {directory}")
+
+    def write(self, name: str, doc: Dict[str, Any], task_id: Optional[str] = None) -> None:
+        if task_id is not None:
+            doc = {**doc, "task_id": task_id}
+        self._files[name].write(json.dumps(doc, separators=(",", ":")) + "\n")
+        self.progress.tick()
+
+    def close(self) -> None:
+        for handle in self._files.values():
+            handle.close()
+        self.progress.done()
+
+
+class FirestoreSink:
+    """Writes through a BulkWriter (``bulk``) or through 500-write batches committed on a thread pool (``batch``)."""
+
+    def __init__(self, db, writer: str, workers: int, max_ops_per_second: int) -> None:
+        settings = get_settings()
+        self._db = db
+        self._collections = {
+            "users": settings.firestore_collection_users,
+            "tasks": settings.firestore_collection_tasks,
+            "messages": settings.firestore_collection_messages,
+            "meetings": settings.firestore_collection_meetings,
+            "updates": settings.firestore_collection_updates,
+        }
+        self.progress = Progress(f"Firestore ({writer})")
+        self._writer_kind = writer
+        if writer == "bulk":
+            from google.cloud.firestore_v1.bulk_writer import BulkWriterOptions, SendMode
+
+            self._bulk = db.bulk_writer(BulkWriterOptions(
+                initial_ops_per_second=min(500, max_ops_per_second), max_ops_per_second=max_ops_per_second,
+                mode=SendMode.parallel,
+            ))
+            self._bulk.on_write_result(lambda reference, result, bulk_writer: self.progress.tick())
+            self._bulk.on_write_error(self._retry)
+        else:
+            from app.services.firestore import BATCH_WRITE_LIMIT
+
+            self._limit = BATCH_WRITE_LIMIT
+            self._pool = ThreadPoolExecutor(max_workers=workers)
+            self._max_in_flight = workers * 2
+            self._in_flight = set()
+            self._batch, self._pending = db.batch(), 0
+
+    def _retry(self, failure, bulk_writer) -> bool:
+        if failure.attempts < 5:
+            return True
+        self.progress.failed += 1
+        print(f"  ❌ {failure.reference.path}: {failure.message}")
+        return False
+
+    def _reference(self, name: str, doc_id: str, task_id: Optional[str]):
+        if name == "activity":
+            from app.services.activity import ACTIVITY_SUBCOLLECTION
+
+            return (self._db.collection(self._collections["tasks"]).document(task_id)
+                    .collection(ACTIVITY_SUBCOLLECTION).document(doc_id))
+        return self._db.collection(self._collections[name]).document(doc_id)
+
+    def write(self, name: str, doc: Dict[str, Any], task_id: Optional[str] = None) -> None:
+        reference = self._reference(name, doc["id"], task_id)
+        if self._writer_kind == "bulk":
+            self._bulk.set(reference, doc)
+            return
+        self._batch.set(reference, doc)
+        self._pending += 1
+        if self._pending >= self._limit:
+            self._submit()
+
+    def _commit(self, batch, size: int) -> None:
+        for attempt in range(5):
+            try:
+                batch.commit()
+                self.progress.tick(size)
+                return
+            except Exception as e:
+                if attempt == 4:
+                    self.progress.failed += size
+                    print(f"  ❌ Batch of {size} writes failed: {e}")
+                    return
+                time.sleep(0.5 * 2 ** attempt)
+
+    def _submit(self) -> None:
+        # Bounded in-flight commits keep memory flat on very large datasets
+        if len(self._in_flight) >= self._max_in_flight:
+            _, self._in_flight = wait(self._in_flight, return_when=FIRST_COMPLETED)
+        self._in_flight.add(self._pool.submit(self._commit, self._batch, self._pending))
+        self._batch, self._pending = self._db.batch(), 0
+
+    def close(self) -> None:
+        if self._writer_kind == "bulk":
+            self._bulk.close()
+        else:
+            if self._pending:
+                self._submit()
+            wait(self._in_flight)
+            self._pool.shutdown()
+        self.progress.done()
+
+
+class WorkspaceGenerator:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.now = datetime.fromisoformat(args.now) if args.now else datetime(2025, 1, 1)
+        self.window = get_settings().activity_recent_window
+        self.counters: Dict[str, Dict[str, Any]] = defaultdict(
+            lambda: {"assigned_hours": 0.0, "open_tasks": 0, "task_counts": dict.fromkeys(TASK_STATUSES, 0)}
+        )
+        self.users: List[Dict[str, Any]] = []
+        self._by_skill: Dict[str, Tuple[List[str], List[float]]] = {}
+        self._skills = sorted({skill for skills in SKILLS_BY_ROLE.values() for skill in skills})
+        # Zipf-like popularity: a few skills are everywhere, most are niche
+        self._skill_weights = [1 / (rank + 1) ** 0.8 for rank in range(len(self._skills))]
+        self.rng.shuffle(self._skills)
+
+    def _timestamp(self, days_ago: float) -> str:
+        return (self.now - timedelta(days=days_ago)).isoformat()
+
+    def _pick_skills(self, pool: List[str], count: int) -> List[str]:
+        weights = [self._skill_weights[self._skills.index(skill)] for skill in pool]
+        picked: List[str] = []
+        while len(picked) < min(count, len(pool)):
+            skill = self.rng.choices(pool, weights)[0]
+            if skill not in picked:
+                picked.append(skill)
+        return picked
+
+    def build_users(self) -> None:
+        rng = self.rng
+        roles, role_weights = zip(*ROLES)
+        by_skill = defaultdict(list)
+        for index in range(self.args.users):
+            role = rng.choices(roles, role_weights)[0]
+            skills = self._pick_skills(SKILLS_BY_ROLE[role], rng.randint(2, 6))
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            user_id = f"emp_{index:06d}"
+            self.users.append({
+                "id": user_id,
+                "name": f"{first} {last}",
+                "email": f"{first.lower()}.{last.lower()}.{index}@company.com",
+                "role": role,
+                "skills": skills,
+                "capacity_hours": rng.choices([40, 32, 20], [0.8, 0.15, 0.05])[0],
+                "status": rng.choices(["active", "busy", "on_leave"], [0.7, 0.25, 0.05])[0],
+                "phone": f"+1-555-{index % 10000:04d}",
+                "bio": f"{role.capitalize()} working on {', '.join(skills[:2])}.",
+                "avatar_url": None,
+                "resume_url": None,
+                "availability": "Available Mon-Fri 9AM-5PM",
+            })
+            # A few people carry most of the work (Pareto-distributed pull)
+            weight = rng.paretovariate(1.5)
+            for skill in skills:
+                by_skill[skill].append((user_id, weight))
+        for skill, members in by_skill.items():
+            self._by_skill[skill] = ([user_id for user_id, _ in members], list(accumulate(w for _, w in members)))
+
+    def _assignee(self, tags: List[str]) -> Optional[str]:
+        staffed = [tag for tag in tags if tag in self._by_skill]
+        if not staffed:
+            return self.rng.choice(self.users)["id"] if self.users else None
+        user_ids, cumulative = self._by_skill[self.rng.choice(staffed)]
+        return self.rng.choices(user_ids, cum_weights=cumulative)[0]
+
+    def _activity(self, created_days_ago: float, status: str, creator: str, assignee: Optional[str]):
+        """Full history for one task, oldest first."""
+        rng = self.rng
+        actors = [creator] + ([assignee] if assignee else [])
+        entries = [(created_days_ago, creator, "Task created")]
+        steps = STATUS_STEPS.index(status) if status in STATUS_STEPS else 1
+        edits = int(rng.expovariate(1 / self.args.activity_mean)) if self.args.activity_mean > 0 else 0
+        for _ in range(steps + edits):
+            entries.append((rng.uniform(0, created_days_ago), rng.choice(actors), rng.choice(ACTIVITY_ACTIONS)))
+        entries[1:] = sorted(entries[1:], key=lambda entry: -entry[0])
+        return [
+            {"id": f"act_{index:04d}", "timestamp": self._timestamp(days_ago), "actor": actor, "action": action}
+            for index, (days_ago, actor, action) in enumerate(entries)
+        ]
+
+    def _thread_length(self) -> int:
+        if self.rng.random() < self.args.silent_ratio or self.args.messages_mean <= 0:
+            return 0
+        # Lognormal with sigma 1.2, scaled so the mean over talking tasks is messages_mean
+        sigma = 1.2
+        mu = math.log(self.args.messages_mean) - sigma ** 2 / 2
+        return max(1, min(int(self.rng.lognormvariate(mu, sigma)), self.args.max_thread))
+
+    def tasks(self) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, str]], List[Dict[str, Any]]]]:
+        """Yields (task, full activity history, messages) one task at a time."""
+        rng, args = self.rng, self.args
+        user_ids = [user["id"] for user in self.users]
+        for index in range(args.tasks):
+            task_id = f"task_{index:07d}"
+            # Newer tasks are more common: exponential age, capped at the history window
+            age = min(rng.expovariate(1 / (args.days / 4)), args.days)
+            tags = [skill.lower() for skill in self._pick_skills(self._skills, rng.choices([1, 2, 3], [0.3, 0.5, 0.2])[0])]
+            complexity = rng.choices(["low", "medium", "high"], [0.3, 0.5, 0.2])[0]
+            mu, sigma = COMPLEXITY_HOURS[complexity]
+            completion = min(age / 30, 0.9)
+            status = rng.choices(
+                ["open", "in_progress", "in_review", "blocked", "completed"],
+                [0.35 * (1 - completion), 0.3 * (1 - completion), 0.1, 0.05, completion + 0.05],
+            )[0]
+            assigned = status != "open" or rng.random() < 0.5
+            assignee = self._assignee([skill for skill in self._skills if skill.lower() in tags]) if assigned else None
+            creator = rng.choice(user_ids) if user_ids else "admin"
+            watchers = rng.sample(user_ids, min(len(user_ids), rng.choices([0, 1, 2, 3], [0.4, 0.3, 0.2, 0.1])[0]))
+            history = self._activity(age, status, creator, assignee)
+            updated_days_ago = min(rng.uniform(0, age), age)
+            task = {
+                "id": task_id,
+                "title": f"{rng.choice(VERBS)} {rng.choice(NOUNS)}",
+                "description": f"{rng.choice(VERBS)} the {rng.choice(NOUNS)} for {rng.choice(PROJECTS)}.",
+                "tags": tags,
+                "attachments": [],
+                "complexity": complexity,
+                "priority": rng.choices([1, 2, 3, 4, 5], [0.1, 0.25, 0.35, 0.2, 0.1])[0],
+                "deadline": (self.now + timedelta(days=rng.randint(-int(age // 2) - 1, 30))).strftime("%Y-%m-%d"),
+                "flowchart_step": rng.choice(FLOWCHART_STEPS),
+                "customer_name": rng.choice(CUSTOMERS),
+                "project_name": rng.choice(PROJECTS),
+                "prd_url": "",
+                "predicted_hours": round(rng.lognormvariate(mu, sigma), 1) if assignee else None,
+                "assigned_to": assignee,
+                "created_by": creator,
+                "status": status,
+                "watchers": watchers,
+                "activity_log": history[-self.window:] if self.window > 0 else [],
+                "created_at": self._timestamp(age),
+                "updated_at": self._timestamp(updated_days_ago),
+            }
+            for user_id, fields in task_load(task).items():
+                apply_load_delta(self.counters[user_id], fields)
+
+            participants = [user_id for user_id in [creator, assignee, *watchers] if user_id]
+            length = self._thread_length()
+            offsets = sorted(rng.uniform(0, age * 86400) for _ in range(length))
+            messages = [
+                {
+                    "id": f"{task_id}_msg_{position:05d}",
+                    "task_id": task_id,
+                    "sender_id": rng.choice(participants) if rng.random() < 0.9 else rng.choice(user_ids),
+                    "text": rng.choice(MESSAGE_TEXTS),
+                    "attachments": [],
+                    "created_at": (self.now - timedelta(days=age) + timedelta(seconds=offset)).isoformat(),
+                }
+                for position, offset in enumerate(offsets)
+            ]
+            yield task, history, messages
+
+    def users_with_counters(self) -> Iterator[Dict[str, Any]]:
+        for user in self.users:
+            counters = self.counters.get(user["id"])
+            if counters is None:
+                counters = {"assigned_hours": 0.0, "open_tasks": 0, "task_counts": dict.fromkeys(TASK_STATUSES, 0)}
+            yield {**user, **counters, "assigned_hours": round(counters["assigned_hours"], 4)}
+
+    def meetings(self) -> Iterator[Dict[str, Any]]:
+        rng, args = self.rng, self.args
+        user_ids = [user["id"] for user in self.users]
+        # Meetings are shared, so the count is per-user density over the average attendee count
+        total = int(args.users * args.meetings_per_user_week * args.days / 7 / 3.5)
+        for index in range(total):
+            attendees = rng.sample(user_ids, min(len(user_ids), rng.choices([2, 3, 4, 6, 10], [0.3, 0.3, 0.2, 0.15, 0.05])[0]))
+            day = rng.uniform(-args.days, 14)
+            start = (self.now - timedelta(days=day)).replace(hour=rng.randint(9, 16), minute=rng.choice([0, 30]),
+                                                             second=0, microsecond=0)
+            yield {
+                "id": f"meet_{index:07d}",
+                "title": rng.choice(["Daily Standup", "Sprint Planning", "Design Review", "1:1", "Retro", "Sync"]),
+                "description": "",
+                "attendees": attendees,
+                "date": start.isoformat(),
+                "duration_minutes": rng.choice([15, 30, 30, 45, 60]),
+                "task_id": f"task_{rng.randrange(args.tasks):07d}" if args.tasks and rng.random() < 0.4 else None,
+                "created_by": attendees[0] if attendees else "admin",
+                "meet_url": None,
+            }
+
+    def updates(self) -> Iterator[Dict[str, Any]]:
+        rng, args = self.rng, self.args
+        total = int(args.users * args.updates_per_user_week * args.days / 7)
+        for index in range(total):
+            user = rng.choice(self.users)
+            yield {
+                "id": f"update_{index:07d}",
+                "user_id": user["id"],
+                "user_name": user["name"],
+                "priority": rng.choices(["low", "medium", "high"], [0.5, 0.35, 0.15])[0],
+                "message": rng.choice(MESSAGE_TEXTS),
+                "task_id": f"task_{rng.randrange(args.tasks):07d}" if args.tasks and rng.random() < 0.7 else None,
+                "created_at": self._timestamp(rng.uniform(0, args.days)),
+            }
+
+
+def generate(args: argparse.Namespace, sink) -> Dict[str, int]:
+    generator = WorkspaceGenerator(args)
+    generator.build_users()
+    counts = defaultdict(int)
+    for task, history, messages in generator.tasks():
+        sink.write("tasks", task)
+        for entry in history:
+            sink.write("activity", entry, task_id=task["id"])
+        for message in messages:
+            sink.write("messages", message)
+        counts["tasks"] += 1
+        counts["activity"] += len(history)
+        counts["messages"] += len(messages)
+    # Users last, once their workload counters are known
+    for user in generator.users_with_counters():
+        sink.write("users", user)
+        counts["users"] += 1
+    for meeting in generator.meetings():
+        sink.write("meetings", meeting)
+        counts["meetings"] += 1
+    for update in generator.updates():
+        sink.write("updates", update)
+        counts["updates"] += 1
+    sink.close()
+    return dict(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--days", type=float, default=180, help="history covered by the dataset")
+    parser.add_argument("--messages-mean", type=float, default=25, help="mean thread length of tasks with messages")
+    parser.add_argument("--silent-ratio", type=float, default=0.3, help="share of tasks without messages")
+    parser.add_argument("--max-thread", type=int, default=2000)
+    parser.add_argument("--activity-mean", type=float, default=4, help="mean edits per task beyond status changes")
+    parser.add_argument("--meetings-per-user-week", type=float, default=3)
+    parser.add_argument("--updates-per-user-week", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--now", help="ISO timestamp the data is relative to (default 2025-01-01, for reproducibility)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--ndjson", metavar="DIR", help="write NDJSON fixtures to this directory")
+    target.add_argument("--firestore", action="store_true", help="write to Firestore (GOOGLE_APPLICATION_CREDENTIALS)")
+    parser.add_argument("--writer", choices=["bulk", "batch"], default="bulk",
+                        help="Firestore BulkWriter, or 500-write batches committed in parallel")
+    parser.add_argument("--workers", type=int, default=8, help="parallel batch commits (--writer batch)")
+    parser.add_argument("--max-ops-per-second", type=int, default=10000, help="BulkWriter ramp-up ceiling")
+    args = parser.parse_args()
+
+    print(f"🌱 Generating {args.users:,} users and {args.tasks:,} tasks (seed {args.seed})\n")
+    if args.ndjson:
+        sink = NdjsonSink(args.ndjson)
+    else:
+        from seed_data import get_db
+
+        sink = FirestoreSink(get_db(), args.writer, args.workers, args.max_ops_per_second)
+    counts = generate(args, sink)
+    print("\n✨ Synthetic workspace written:")
+    for name in FIXTURE_FILES:
+        print(f"  - {name}: {counts.get(name, 0):,}")
+    if sink.progress.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""OpenTelemetry setup shared by the API and the agent server.
+
+Depends on the OpenTelemetry SDK only, not on the ``app`` package or its
+settings, so the standalone agent server can import it too. Each process
+builds one ``Tracing`` from its TRACING_* settings:
+
+* TRACING_EXPORTER picks where spans go: ``none`` (default, a no-op
+  tracer), ``memory`` (kept in process, for tests), ``file`` (one JSON span
+  per line appended to TRACING_FILE), ``console`` (JSON spans on stdout),
+  ``otlp`` (OTLP/gRPC to OTEL_EXPORTER_OTLP_ENDPOINT, needs
+  opentelemetry-exporter-otlp) or ``module:factory`` (any callable
+  returning a ``SpanExporter``);
+* TRACING_SAMPLE_RATIO samples that fraction of new traces; requests that
+  arrive with a sampled ``traceparent`` are always traced.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+from contextlib import nullcontext
+from typing import Any, Optional, Tuple
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SimpleSpanProcessor,
+    SpanExporter,
+)
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind
+
+
+def _build_exporter(name: str, file_path: str) -> SpanExporter:
+    if name == "memory":
+        return InMemorySpanExporter()
+    if name == "console":
+        return ConsoleSpanExporter(formatter=lambda span: span.to_json(indent=None) + "\n")
+    if name == "file":
+        # Line-buffered so a crash loses at most the span being written
+        return ConsoleSpanExporter(
+            out=open(file_path, "a", buffering=1), formatter=lambda span: span.to_json(indent=None) + "\n"
+        )
+    if name == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        except ImportError as exc:
+            raise RuntimeError(
+                "TRACING_EXPORTER=otlp needs the OTLP exporter: pip install opentelemetry-exporter-otlp"
+            ) from exc
+        return OTLPSpanExporter()
+    module, separator, factory = name.partition(":")
+    if not separator:
+        raise RuntimeError(f"Unknown TRACING_EXPORTER {name!r}: use none, memory, console, file, otlp or module:factory")
+    return getattr(importlib.import_module(module), factory)()
+
+
+def build_tracer_provider(
+    service_name: str, exporter: str, file_path: str, sample_ratio: float
+) -> Tuple[Optional[TracerProvider], Optional[SpanExporter]]:
+    """A provider for one process and its exporter, or (None, None) when tracing is off.
+
+    Not installed globally, so two apps can share a process (benchmarks).
+    Misconfiguration raises at startup.
+    """
+    if exporter in ("", "none"):
+        return None, None
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+    )
+    span_exporter = _build_exporter(exporter, file_path)
+    # Export off the request path, except in memory where tests read spans right away
+    processor = SimpleSpanProcessor if exporter == "memory" else BatchSpanProcessor
+    provider.add_span_processor(processor(span_exporter))
+    return provider, span_exporter
+
+
+class Tracing:
+    """One process's tracer provider, tracer and exporter; a no-op tracer when tracing is off."""
+
+    def __init__(self, service_name: str, exporter: str, file_path: str, sample_ratio: float) -> None:
+        self.provider, self.exporter = build_tracer_provider(service_name, exporter, file_path, sample_ratio)
+        self.tracer = self.provider.get_tracer(service_name) if self.provider is not None else trace.NoOpTracer()
+
+    @classmethod
+    def from_env(cls, service_name: str) -> "Tracing":
+        return cls(
+            service_name,
+            os.getenv("TRACING_EXPORTER", "none"),
+            os.getenv("TRACING_FILE", "traces.jsonl"),
+            float(os.getenv("TRACING_SAMPLE_RATIO", "0.1")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.provider is not None
+
+    @property
+    def memory_exporter(self) -> Optional[InMemorySpanExporter]:
+        return self.exporter if isinstance(self.exporter, InMemorySpanExporter) else None
+
+    def span(self, name: str, kind: SpanKind = SpanKind.INTERNAL, **attributes: Any):
+        """Child span of the current one; a bare ``nullcontext`` when tracing is off."""
+        if not self.enabled:
+            return nullcontext()
+        return self.tracer.start_as_current_span(name, kind=kind, attributes=attributes)
+
+    def shutdown(self) -> None:
+        if self.provider is not None:
+            self.provider.shutdown()
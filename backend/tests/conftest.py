@@ -0,0 +1,8 @@
+"""Shared test setup: run against the in-memory store, never GCP."""
+
+import os
+import sys
+
+os.environ.setdefault("FIRESTORE_BACKEND", "memory")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
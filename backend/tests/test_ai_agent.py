@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+import httpx
+
+from app.services.ai_agent import AIAgentService
+
+
+def _service(handler) -> AIAgentService:
+    service = AIAgentService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://stub")
+    return service
+
+
+def test_concurrent_identical_calls_share_one_upstream_call():
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"overloaded": [], "suggestions": ["stub"]})
+
+    async def run():
+        service = _service(handler)
+        workloads = [{"id": "u1", "name": "Alice", "utilization": 1.2}]
+        results = await asyncio.gather(*(service.overload_report(workloads) for _ in range(20)))
+        stats = service.coalescing_stats()
+        await service.aclose()
+        return results, stats
+
+    results, stats = asyncio.run(run())
+    assert calls == ["/overload"]
+    assert all(result["suggestions"] == ["stub"] for result in results)
+    assert stats["coalesced"] == {"/overload": 19}
+    assert stats["in_flight"] == 0
+
+
+def test_different_payloads_are_not_coalesced():
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.content)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"ok": True})
+
+    async def run():
+        service = _service(handler)
+        await asyncio.gather(*(service._post("/meeting", {"i": i}) for i in range(3)))
+        await service.aclose()
+
+    asyncio.run(run())
+    assert len(calls) == 3
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"ok": True})
+
+    async def run():
+        service = _service(handler)
+        first = asyncio.ensure_future(service._post("/meeting", {"i": 1}))
+        second = asyncio.ensure_future(service._post("/meeting", {"i": 1}))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        result = await second
+        await service.aclose()
+        return result
+
+    assert asyncio.run(run())["ok"] is True
+
+
+def _prediction(member_id: str, reason: str) -> dict:
+    return {"predicted_hours": 3, "best_member_id": member_id, "priority": 2, "deadline": None,
+            "flowchart_next_step": "Development", "required_meeting": False, "meeting_suggestion": None,
+            "reason": reason}
+
+
+def test_batch_results_map_back_to_tasks_with_per_item_errors():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"results": [
+            _prediction("u1", "A"),
+            {"error": "model gave up", "batched": False},
+            _prediction("u2", "C"),
+        ]})
+
+    async def run():
+        service = _service(handler)
+        results = await service._predict_remote_batch([{"title": t} for t in "ABC"], [{"id": "u1"}, {"id": "u2"}])
+        await service.aclose()
+        return results
+
+    first, second, third = asyncio.run(run())
+    assert (first.best_member_id, first.reason) == ("u1", "A")
+    assert isinstance(second, RuntimeError)
+    assert (third.best_member_id, third.reason) == ("u2", "C")
+
+
+def test_short_batch_response_falls_back_to_one_call_per_task():
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path == "/assignment/batch":
+            return httpx.Response(200, json={"results": [_prediction("u1", "only one")]})
+        task = json.loads(request.content)["task"]
+        return httpx.Response(200, json=_prediction("u2", task["title"]))
+
+    async def run():
+        service = _service(handler)
+        results = await service.predict_assignments([{"title": t} for t in "AB"], [{"id": "u2"}], concurrency=2)
+        await service.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert [result.reason for result in results] == ["A", "B"]
+    assert sorted(calls) == ["/assignment", "/assignment", "/assignment/batch"]
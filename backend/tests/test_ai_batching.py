@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from app.services.ai_batching import AssignmentBatcher
+
+TEAM = [{"id": "u1"}]
+
+
+class _Dispatch:
+    """Answers each task with its title; a task titled "bad" gets an exception."""
+
+    def __init__(self) -> None:
+        self.batches = []
+
+    async def __call__(self, tasks, team):
+        self.batches.append([task["title"] for task in tasks])
+        await asyncio.sleep(0)
+        return [ValueError("bad task") if task["title"] == "bad" else f"result {task['title']}" for task in tasks]
+
+
+def _burst(batcher: AssignmentBatcher, titles, team=TEAM):
+    async def run():
+        # The first call on a quiet batcher goes out at once; the burst after it is merged
+        await batcher.submit({"title": "warm-up"}, team)
+        return await asyncio.gather(
+            *(batcher.submit({"title": title}, team) for title in titles), return_exceptions=True
+        )
+
+    return asyncio.run(run())
+
+
+def test_quiet_call_is_dispatched_without_waiting():
+    dispatch = _Dispatch()
+    batcher = AssignmentBatcher(dispatch, max_wait=10.0, max_size=10)
+    assert asyncio.run(batcher.submit({"title": "a"}, TEAM)) == "result a"
+    assert dispatch.batches == [["a"]]
+    assert batcher.stats()["immediate"] == 1
+
+
+def test_concurrent_calls_share_one_batch_and_get_their_own_results():
+    dispatch = _Dispatch()
+    batcher = AssignmentBatcher(dispatch, max_wait=0.05, max_size=10)
+    results = _burst(batcher, ["a", "b", "c"])
+    assert results == ["result a", "result b", "result c"]
+    assert dispatch.batches == [["warm-up"], ["a", "b", "c"]]
+
+
+def test_full_batch_is_flushed_before_the_wait_expires():
+    dispatch = _Dispatch()
+    batcher = AssignmentBatcher(dispatch, max_wait=10.0, max_size=2)
+    results = _burst(batcher, ["a", "b", "c", "d"])
+    assert results == ["result a", "result b", "result c", "result d"]
+    assert dispatch.batches[1:] == [["a", "b"], ["c", "d"]]
+
+
+def test_failed_item_only_fails_its_own_caller():
+    dispatch = _Dispatch()
+    batcher = AssignmentBatcher(dispatch, max_wait=0.05, max_size=10)
+    good, bad = _burst(batcher, ["a", "bad"])
+    assert good == "result a"
+    assert isinstance(bad, ValueError)
+
+
+def test_calls_against_different_rosters_are_not_merged():
+    dispatch = _Dispatch()
+    batcher = AssignmentBatcher(dispatch, max_wait=0.05, max_size=10)
+
+    async def run():
+        await batcher.submit({"title": "warm-up"}, TEAM)
+        await batcher.submit({"title": "warm-up"}, [{"id": "u2"}])
+        return await asyncio.gather(batcher.submit({"title": "a"}, TEAM), batcher.submit({"title": "b"}, [{"id": "u2"}]))
+
+    assert asyncio.run(run()) == ["result a", "result b"]
+    assert sorted(dispatch.batches[2:]) == [["a"], ["b"]]
+
+
+@pytest.mark.parametrize("max_wait, max_size", [(0.0, 10), (0.05, 1)])
+def test_batching_can_be_disabled(max_wait, max_size):
+    assert not AssignmentBatcher(_Dispatch(), max_wait=max_wait, max_size=max_size).enabled
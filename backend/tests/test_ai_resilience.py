@@ -0,0 +1,106 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+
+from app.services import ai_resilience
+from app.services.ai_agent import AIAgentService
+from app.services.ai_resilience import CLOSED, HALF_OPEN, MIN_SAMPLES, OPEN, EndpointGuard
+
+
+def _guard(monkeypatch, clock, **overrides):
+    monkeypatch.setattr(ai_resilience, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    settings = dict(
+        failure_threshold=3, open_seconds=10.0, latency_slo=1.0, max_timeout=5.0, min_timeout=0.1,
+        p95_multiplier=2.0, adaptive=False, hedge=False, hedge_delay=0.0,
+    )
+    settings.update(overrides)
+    return EndpointGuard(**settings)
+
+
+def test_breaker_opens_then_half_open_probe_closes_it(monkeypatch):
+    clock = [100.0]
+    guard = _guard(monkeypatch, clock)
+    for _ in range(3):
+        assert guard.allow()
+        guard.record_failure()
+    assert guard.state == OPEN
+    assert not guard.allow()
+
+    clock[0] += 10.0
+    assert guard.allow()
+    assert guard.state == HALF_OPEN
+    assert not guard.allow(), "only one half-open probe at a time"
+    guard.record_success(0.01)
+    assert guard.state == CLOSED
+    assert guard.allow()
+
+
+def test_failed_half_open_probe_reopens_breaker(monkeypatch):
+    clock = [100.0]
+    guard = _guard(monkeypatch, clock)
+    for _ in range(3):
+        guard.allow()
+        guard.record_failure()
+    clock[0] += 10.0
+    assert guard.allow()
+    guard.record_failure()
+    assert guard.state == OPEN
+    assert not guard.allow()
+    clock[0] += 10.0
+    assert guard.allow()
+
+
+def test_cancelled_probe_frees_the_half_open_slot(monkeypatch):
+    clock = [100.0]
+    guard = _guard(monkeypatch, clock)
+    for _ in range(3):
+        guard.allow()
+        guard.record_failure()
+    clock[0] += 10.0
+    assert guard.allow()
+    guard.release()
+    assert guard.allow()
+
+
+def test_slow_success_counts_as_failure(monkeypatch):
+    guard = _guard(monkeypatch, [0.0])
+    for _ in range(3):
+        guard.allow()
+        guard.record_success(2.0)
+    assert guard.state == OPEN
+    assert guard.counts["slo_breaches"] == 3
+
+
+def test_timeout_follows_observed_p95_within_bounds(monkeypatch):
+    guard = _guard(monkeypatch, [0.0], adaptive=True)
+    assert guard.timeout() == 5.0, "too few samples to trust"
+    for _ in range(MIN_SAMPLES):
+        guard.record_success(0.2)
+    assert guard.timeout() == 0.4
+
+    fast = _guard(monkeypatch, [0.0], adaptive=True)
+    for _ in range(MIN_SAMPLES):
+        fast.record_success(0.01)
+    assert fast.timeout() == 0.1
+
+
+def test_open_breaker_answers_from_fallback_without_upstream_calls():
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(500, json={"detail": "injected"})
+
+    async def run():
+        service = AIAgentService()
+        service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://stub")
+        guard = service._guard("/meeting")
+        results = [await service._post("/meeting", {"i": i}) for i in range(guard.failure_threshold + 3)]
+        await service.aclose()
+        return guard, results
+
+    guard, results = asyncio.run(run())
+    assert guard.state == OPEN
+    assert len(calls) == guard.failure_threshold
+    assert all(result["fallback"] for result in results)
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import re
+
+from fastapi import HTTPException
+
+import ai_agent_server
+from ai_agent_server import assign_batch, map_batch_results, parse_json_items
+
+TEAM = [{"id": f"user_{i}", "name": f"Member {i}", "skills": ["python"], "capacity_hours": 40, "assigned_hours": 0}
+        for i in range(3)]
+
+
+def _answer(title: str) -> dict:
+    number = int(title.rsplit(" ", 1)[1])
+    return {"best_member_id": f"user_{number % 3}", "predicted_hours": 4, "reason": title}
+
+
+def test_map_batch_results_drops_malformed_and_duplicate_items():
+    items = [
+        {"task_index": 1, "best_member_id": "user_1"},
+        {"task_index": "0", "best_member_id": "user_0"},
+        {"task_index": 1, "best_member_id": "duplicate"},
+        {"task_index": 7, "best_member_id": "out of range"},
+        {"best_member_id": "no index"},
+        {"task_index": 2, "best_member_id": None},
+    ]
+    mapped = map_batch_results(items, 3)
+    assert mapped == {0: {"best_member_id": "user_0"}, 1: {"best_member_id": "user_1"}}
+
+
+def test_parse_json_items_skips_truncated_objects():
+    text = 'Here you go: [{"task_index": 0, "best_member_id": "a"}, {"task_index": 1, "best_m'
+    assert parse_json_items(text) == [{"task_index": 0, "best_member_id": "a"}]
+
+
+def test_assign_batch_maps_shuffled_items_and_falls_back_per_task(monkeypatch):
+    prompts = []
+
+    async def fake_gemini(prompt, system_instruction=None, max_output_tokens=2048):
+        prompts.append(prompt)
+        titles = re.findall(r"^- Title: (.*)$", prompt, re.MULTILINE)
+        if "task_index" not in prompt:
+            return json.dumps(_answer(titles[0]))
+        # Answers come back reversed and without the item for task 1
+        items = [{"task_index": index, **_answer(title)} for index, title in enumerate(titles) if index != 1]
+        return json.dumps(items[::-1])
+
+    monkeypatch.setattr(ai_agent_server, "call_gemini_adk", fake_gemini)
+    tasks = [{"title": f"Task {i}", "description": "d", "tags": ["python"]} for i in range(4)]
+    outcome = asyncio.run(assign_batch(tasks, TEAM, "Return JSON."))
+
+    assert outcome["fallbacks"] == 1
+    assert len(prompts) == 2
+    for task, result in zip(tasks, outcome["results"]):
+        assert result["reason"] == task["title"]
+        assert result["best_member_id"] == _answer(task["title"])["best_member_id"]
+    assert [result["batched"] for result in outcome["results"]] == [True, False, True, True]
+
+
+def test_assign_batch_records_errors_when_fallback_fails(monkeypatch):
+    async def failing_gemini(prompt, system_instruction=None, max_output_tokens=2048):
+        raise HTTPException(status_code=500, detail="ADK/Gemini error: boom")
+
+    monkeypatch.setattr(ai_agent_server, "call_gemini_adk", failing_gemini)
+    outcome = asyncio.run(assign_batch([{"title": "Task 0"}, {"title": "Task 1"}], TEAM, "Return JSON."))
+    assert outcome["fallbacks"] == 2
+    assert outcome["results"] == [{"error": "ADK/Gemini error: boom", "batched": False}] * 2
+
+
+async def _no_fallback(task, team, instructions):
+    raise HTTPException(status_code=500, detail="not under test")
+
+
+def test_single_prompt_token_estimate_matches_the_prompts_it_stands_for(monkeypatch):
+    async def fake_gemini(prompt, system_instruction=None, max_output_tokens=2048):
+        return "[]"
+
+    monkeypatch.setattr(ai_agent_server, "call_gemini_adk", fake_gemini)
+    monkeypatch.setattr(ai_agent_server, "ASSIGNMENT_TOP_K", 2)
+    team = TEAM + [{"id": "user_3", "name": "Member 3", "skills": ["sql"], "capacity_hours": 40, "assigned_hours": 5}]
+    tasks = [{"title": f"Task {i}", "description": "d", "tags": [["python"], ["sql"]][i % 2]} for i in range(4)]
+    monkeypatch.setattr(ai_agent_server, "assign_one", _no_fallback)
+    outcome = asyncio.run(assign_batch(tasks, team, "Return JSON."))
+    expected = sum(
+        ai_agent_server.estimate_tokens(ai_agent_server.build_assignment_prompt(
+            task, ai_agent_server.format_team_summary(ai_agent_server.select_candidates(task, team, 2)), "Return JSON."
+        ))
+        for task in tasks
+    )
+    assert outcome["prompt_tokens_single"] == expected
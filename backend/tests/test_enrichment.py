@@ -0,0 +1,84 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.models import AIAssignmentResult
+from app.services import enrichment
+from app.services.enrichment import claim_patch, enrich_task
+from app.services.providers import get_firestore_service
+
+CREATED = "2024-01-01T00:00:00"
+
+
+class _StubAgent:
+    """Predicts user_9 for everything; ``during`` runs while the prediction is in flight."""
+
+    def __init__(self, during=None) -> None:
+        self.during = during
+        self.calls = 0
+
+    async def predict_assignment(self, task, team):
+        self.calls += 1
+        if self.during:
+            self.during()
+        return AIAssignmentResult(
+            predicted_hours=5, best_member_id="user_9", priority=1, deadline=None,
+            flowchart_next_step="Review", required_meeting=False, meeting_suggestion=None, reason="stub",
+        )
+
+
+def _pending_task(task_id: str) -> None:
+    get_firestore_service().create_task({
+        "id": task_id, "title": "T", "status": "open", "priority": 3, "created_at": CREATED, "updated_at": CREATED,
+        "ai_status": "pending", "assigned_to": None, "predicted_hours": None,
+    })
+
+
+def _enrich(monkeypatch, task_id: str, agent: _StubAgent):
+    monkeypatch.setattr(enrichment, "get_ai_service", lambda: agent)
+    return asyncio.run(enrich_task(task_id, max_retries=1, retry_backoff=0))
+
+
+def test_enrichment_fills_prediction_and_releases_claim(monkeypatch):
+    _pending_task("enrich-fill")
+    result = _enrich(monkeypatch, "enrich-fill", _StubAgent())
+    assert result["ai_status"] == "complete"
+    assert (result["assigned_to"], result["priority"], result["flowchart_step"]) == ("user_9", 1, "Review")
+    assert result["ai_claim"] is None
+
+
+def test_patch_made_during_enrichment_is_kept(monkeypatch):
+    store = get_firestore_service()
+    _pending_task("enrich-patched")
+    patch = {"assigned_to": "user_1", "priority": 5, "updated_at": "2024-01-01T00:00:05"}
+    result = _enrich(monkeypatch, "enrich-patched", _StubAgent(lambda: store.update_task("enrich-patched", patch)))
+    assert result["ai_status"] == "complete"
+    assert (result["assigned_to"], result["priority"]) == ("user_1", 5)
+    assert result["predicted_hours"] == 5
+
+
+def test_task_deleted_during_enrichment_stays_deleted(monkeypatch):
+    store = get_firestore_service()
+    _pending_task("enrich-deleted")
+    delete = lambda: store._docs(store._tasks_col).pop("enrich-deleted")
+    assert _enrich(monkeypatch, "enrich-deleted", _StubAgent(delete)) is None
+    assert "enrich-deleted" not in store.get_tasks(["enrich-deleted"])
+
+
+def test_claimed_task_is_not_enriched_twice(monkeypatch):
+    store = get_firestore_service()
+    _pending_task("enrich-claimed")
+    assert store.patch_task("enrich-claimed", claim_patch("other-worker", 60)) is not None
+    agent = _StubAgent()
+    assert _enrich(monkeypatch, "enrich-claimed", agent) is None
+    assert agent.calls == 0
+    assert store.get_task("enrich-claimed")["ai_claim"] == "other-worker"
+
+
+def test_expired_claim_can_be_taken_over(monkeypatch):
+    store = get_firestore_service()
+    _pending_task("enrich-expired")
+    store.patch_task("enrich-expired", claim_patch("crashed-worker", 60))
+    expired = (datetime.utcnow() - timedelta(seconds=1)).isoformat()
+    store.update_task("enrich-expired", {"ai_lease_expires_at": expired})
+    result = _enrich(monkeypatch, "enrich-expired", _StubAgent())
+    assert result["ai_status"] == "complete" and result["assigned_to"] == "user_9"
@@ -0,0 +1,41 @@
+import asyncio
+import inspect
+
+import pytest
+
+import app.main as main
+
+
+class _FailingAIService:
+    closed = False
+
+    async def start(self):
+        raise RuntimeError("agent unreachable")
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_failed_startup_cancels_the_key_refresher(monkeypatch):
+    service = _FailingAIService()
+    refreshers = []
+
+    async def wait_forever():
+        await asyncio.Event().wait()
+
+    def refresh_forever():
+        refreshers.append(wait_forever())
+        return refreshers[-1]
+
+    monkeypatch.setattr(main, "refresh_public_keys_forever", refresh_forever)
+    monkeypatch.setattr(main, "get_ai_service", lambda: service)
+
+    async def run():
+        with pytest.raises(RuntimeError, match="agent unreachable"):
+            async with main.lifespan(main.app):
+                pass
+        assert not [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    asyncio.run(run())
+    assert len(refreshers) == 1 and inspect.getcoroutinestate(refreshers[0]) == inspect.CORO_CLOSED
+    assert service.closed
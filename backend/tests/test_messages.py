@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth import AuthUser, get_current_user
+from app.main import app
+from app.services.providers import get_firestore_service
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_current_user] = lambda: AuthUser(uid="test-user")
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+def _add_message(task_id: str, i: int, at: datetime = None, text: str = None) -> None:
+    get_firestore_service().create_message({
+        "task_id": task_id,
+        "sender_id": "user_1",
+        "text": text or f"message {i}",
+        "attachments": [],
+        "created_at": (at or START + timedelta(seconds=i)).isoformat(),
+    })
+
+
+def test_delta_poll_returns_only_new_messages_and_304_when_unchanged(client):
+    task_id = "test-delta"
+    for i in range(5):
+        _add_message(task_id, i)
+    full = client.get(f"/messages/{task_id}")
+    assert full.status_code == 200
+    assert [m["text"] for m in full.json()] == [f"message {i}" for i in range(5)]
+    last_seen = full.json()[-1]["created_at"]
+
+    empty = client.get(f"/messages/{task_id}", params={"since": last_seen})
+    assert empty.status_code == 200 and empty.json() == []
+    etag = empty.headers["ETag"]
+
+    unchanged = client.get(f"/messages/{task_id}", params={"since": last_seen}, headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+
+    _add_message(task_id, 5)
+    fresh = client.get(f"/messages/{task_id}", params={"since": last_seen}, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert [m["text"] for m in fresh.json()] == ["message 5"]
+    assert fresh.headers["ETag"] != etag
+
+
+def test_delta_poll_cost_does_not_grow_with_the_thread(client, monkeypatch):
+    store = get_firestore_service()
+    list_messages = store.list_messages
+    reads = []
+
+    def counting(*args, **kwargs):
+        docs = list_messages(*args, **kwargs)
+        reads.append(len(docs))
+        return docs
+
+    monkeypatch.setattr(store, "list_messages", counting)
+    costs = []
+    for size in (10, 1000):
+        task_id = f"test-delta-cost-{size:04d}"
+        for i in range(size):
+            _add_message(task_id, i)
+        last_seen = store.latest_messages(task_id, 1)[0]["created_at"]
+        _add_message(task_id, size, at=START + timedelta(hours=1), text="new message")
+        reads.clear()
+        response = client.get(f"/messages/{task_id}", params={"since": last_seen})
+        assert [m["text"] for m in response.json()] == ["new message"]
+        costs.append((sum(reads), len(response.content)))
+    assert costs[0] == costs[1]
+
+
+def test_late_message_from_a_slow_clock_is_not_skipped(client):
+    store = get_firestore_service()
+    task_id = "test-delta-skew"
+    store.create_task({"id": task_id, "title": "T", "status": "open", "created_at": START.isoformat()})
+    _add_message(task_id, 0, at=START + timedelta(minutes=5))
+    last_seen = client.get(f"/messages/{task_id}").json()[-1]["created_at"]
+
+    # Another instance whose clock runs a minute behind, then one on the same tick
+    _add_message(task_id, 1, at=START + timedelta(minutes=4))
+    _add_message(task_id, 2, at=START + timedelta(minutes=4))
+    fresh = client.get(f"/messages/{task_id}", params={"since": last_seen}).json()
+    assert [m["text"] for m in fresh] == ["message 1", "message 2"]
+    assert len({m["created_at"] for m in fresh}) == 2
+    assert store.get_task(task_id)["last_message_at"] == fresh[-1]["created_at"]
@@ -0,0 +1,52 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from app.services.memory import InMemoryFirestoreService
+from app.services.user_cache import get_user_cache
+
+
+def _calls(operation: str) -> float:
+    labels = {"dependency": "firestore", "operation": operation}
+    return REGISTRY.get_sample_value("dependency_call_duration_seconds_count", labels) or 0.0
+
+
+def _errors(operation: str) -> float:
+    labels = {"dependency": "firestore", "operation": operation}
+    return REGISTRY.get_sample_value("dependency_call_errors_total", labels) or 0.0
+
+
+def test_cached_user_reads_are_not_timed_as_firestore_calls():
+    get_user_cache().invalidate()
+    store = InMemoryFirestoreService()
+    store.upsert_user("u1", {"id": "u1", "name": "Ada"})
+    before = {operation: _calls(operation) for operation in ("list_users", "load_users", "load_user")}
+
+    store.list_users()
+    store.list_users()
+    store.get_user("u1")
+
+    assert _calls("list_users") == before["list_users"]
+    assert _calls("load_users") == before["load_users"] + 1
+    # The roster fill primed u1, so the profile read never reached the store
+    assert _calls("load_user") == before["load_user"]
+
+
+def test_not_found_is_not_a_dependency_error():
+    store = InMemoryFirestoreService()
+    errors, calls = _errors("get_task"), _calls("get_task")
+
+    with pytest.raises(KeyError):
+        store.get_task("missing")
+
+    assert _errors("get_task") == errors
+    assert _calls("get_task") == calls + 1
+
+
+def test_other_failures_still_count_as_errors():
+    store = InMemoryFirestoreService()
+    errors = _errors("list_messages")
+
+    with pytest.raises(TypeError):
+        store.list_messages()
+
+    assert _errors("list_messages") == errors + 1
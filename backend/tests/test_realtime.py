@@ -0,0 +1,134 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.auth import AuthUser, get_current_user
+from app.main import app
+from app.routers import stream as stream_router
+from app.services.memory import InMemoryFirestoreService
+from app.services.realtime import RealtimeHub
+
+TASK_ID = "realtime-task"
+
+
+def _message(store: InMemoryFirestoreService, text: str) -> None:
+    store.create_message({"task_id": TASK_ID, "sender_id": "u", "text": text})
+
+
+def _drain(subscription) -> list:
+    events = []
+    while not subscription.queue.empty():
+        event = subscription.queue.get_nowait()
+        events.append(event["document"]["text"] if event else None)
+    return events
+
+
+def test_one_listener_fans_out_to_every_subscriber():
+    store = InMemoryFirestoreService()
+
+    async def run():
+        hub = RealtimeHub(store, queue_size=10)
+        subscriptions = [hub.subscribe(["messages"], TASK_ID) for _ in range(5)]
+        other_task = hub.subscribe(["messages"], "other-task")
+        _message(store, "hello")
+        await asyncio.sleep(0)
+        stats = hub.stats()
+        hub.close()
+        return [_drain(s) for s in subscriptions], _drain(other_task), stats
+
+    received, other, stats = asyncio.run(run())
+    assert received == [["hello"]] * 5
+    assert other == []
+    assert stats["listeners"] == ["messages"] and stats["events_received"] == 1
+
+
+def test_full_queue_gets_overflow_sentinel_and_no_more_events():
+    store = InMemoryFirestoreService()
+
+    async def run():
+        hub = RealtimeHub(store, queue_size=2)
+        slow = hub.subscribe(["messages"], TASK_ID)
+        for i in range(4):
+            _message(store, f"m{i}")
+        await asyncio.sleep(0)
+        stats = hub.stats()
+        hub.close()
+        return _drain(slow), stats
+
+    events, stats = asyncio.run(run())
+    assert events == ["m1", None]
+    assert stats["overflows"] == 1
+
+
+def test_stream_ends_with_overflow_event_and_drops_the_connection(monkeypatch):
+    store = InMemoryFirestoreService()
+    app.dependency_overrides[get_current_user] = lambda: AuthUser(uid="test-user")
+
+    async def run():
+        hub = RealtimeHub(store, queue_size=2)
+        monkeypatch.setattr(stream_router, "get_realtime_hub", lambda: hub)
+
+        async def write_when_connected():
+            while hub.stats()["connections"] == 0:
+                await asyncio.sleep(0.001)
+            for i in range(5):
+                _message(store, f"m{i}")
+
+        writer = asyncio.ensure_future(write_when_connected())
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://api") as client:
+            response = await client.get("/stream/", params={"channels": "messages", "task_id": TASK_ID})
+        await writer
+        return response.text, hub.stats()
+
+    try:
+        body, stats = asyncio.run(run())
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+    assert body.startswith("event: ready")
+    assert body.rstrip().splitlines()[-2] == "event: overflow"
+    assert stats["connections"] == 0 and stats["listeners"] == []
+
+
+def test_events_replayed_by_a_reanchored_listener_are_delivered_once():
+    store = InMemoryFirestoreService()
+
+    async def run():
+        hub = RealtimeHub(store, queue_size=10)
+        subscription = hub.subscribe(["messages"], TASK_ID)
+        _message(store, "before")
+        await asyncio.sleep(0)
+        # Written while the old listener's callback is still queued: the new listener replays it too
+        _message(store, "during")
+        hub._reanchor("messages")
+        await asyncio.sleep(0)
+        _message(store, "after")
+        await asyncio.sleep(0)
+        stats = hub.stats()
+        hub.close()
+        return _drain(subscription), stats, len(store._watchers[store._messages_col])
+
+    events, stats, watchers = asyncio.run(run())
+    assert events == ["before", "during", "after"]
+    assert stats["reanchors"] == 1 and stats["duplicates_dropped"] == 1
+    assert watchers == 0
+
+
+@pytest.mark.parametrize("reanchor_seconds", [0.0, 60.0])
+def test_listener_stops_when_the_last_subscriber_leaves(reanchor_seconds):
+    store = InMemoryFirestoreService()
+
+    async def run():
+        hub = RealtimeHub(store, queue_size=10, reanchor_seconds=reanchor_seconds)
+        first = hub.subscribe(["messages", "tasks"], TASK_ID)
+        second = hub.subscribe(["messages"], TASK_ID)
+        hub.unsubscribe(first)
+        still_listening = (hub.stats()["listeners"], len(store._watchers[store._messages_col]))
+        hub.unsubscribe(second)
+        return still_listening, hub.stats(), hub._reanchor_timers
+
+    still_listening, stats, timers = asyncio.run(run())
+    assert still_listening == (["messages"], 1)
+    assert stats["listeners"] == [] and stats["connections"] == 0
+    assert len(store._watchers[store._messages_col]) == 0 and len(store._watchers[store._tasks_col]) == 0
+    assert timers == {}
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth import AuthUser, get_current_user
+from app.config import get_settings
+from app.main import app
+from app.routers import messages as messages_router
+from app.services.providers import get_firestore_service
+
+START = datetime(2024, 1, 1)
+
+
+class _StubSummarizer:
+    def __init__(self) -> None:
+        self.calls = []
+
+    async def summarize_chat(self, messages, previous_summary=None):
+        self.calls.append(([m["text"] for m in messages], previous_summary is not None))
+        return {"bullets": [messages[-1]["text"]], "status": "ok", "next_step": "none", "cache_hit": False}
+
+
+@pytest.fixture
+def summarizer(monkeypatch):
+    stub = _StubSummarizer()
+    monkeypatch.setattr(messages_router, "get_ai_service", lambda: stub)
+    app.dependency_overrides[get_current_user] = lambda: AuthUser(uid="test-user")
+    yield stub
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def _thread(task_id: str, count: int) -> None:
+    store = get_firestore_service()
+    store.create_task({"id": task_id, "title": "T", "status": "open", "created_at": START.isoformat()})
+    _add(task_id, 0, count)
+
+
+def _add(task_id: str, first: int, count: int) -> None:
+    for i in range(first, first + count):
+        get_firestore_service().create_message({
+            "task_id": task_id, "sender_id": "u", "text": f"m{i}",
+            "created_at": (START + timedelta(seconds=i)).isoformat(),
+        })
+
+
+def test_new_messages_are_folded_in_page_by_page(summarizer):
+    page = get_settings().summary_tail_messages
+    _thread("summarize-fold", 3)
+    with TestClient(app) as client:
+        client.post("/messages/summarize-fold/summarize").raise_for_status()
+        _add("summarize-fold", 3, page + 2)
+        summarizer.calls.clear()
+        body = client.post("/messages/summarize-fold/summarize").json()
+    assert body["partial"] is False
+    assert [texts for texts, _ in summarizer.calls] == [
+        [f"m{i}" for i in range(3, 3 + page)], [f"m{i}" for i in range(3 + page, 5 + page)]
+    ]
+    assert all(has_previous for _, has_previous in summarizer.calls)
+
+
+def test_backlog_beyond_the_fold_cap_resummarizes_the_tail(summarizer):
+    settings = get_settings()
+    page = settings.summary_tail_messages
+    backlog = page * settings.summary_max_fold_pages + 1
+    _thread("summarize-capped", 1)
+    with TestClient(app) as client:
+        client.post("/messages/summarize-capped/summarize").raise_for_status()
+        _add("summarize-capped", 1, backlog)
+        summarizer.calls.clear()
+        body = client.post("/messages/summarize-capped/summarize").json()
+        assert body["partial"] is True
+        assert summarizer.calls == [([f"m{i}" for i in range(backlog + 1 - page, backlog + 1)], False)]
+        task = get_firestore_service().get_task("summarize-capped")
+        assert task["chat_summary"]["bullets"] == [f"m{backlog}"]
+
+        summarizer.calls.clear()
+        unchanged = client.post("/messages/summarize-capped/summarize").json()
+    assert unchanged["cache_hit"] is True and summarizer.calls == []
@@ -0,0 +1,68 @@
+from app.services.memory import InMemoryFirestoreService
+from app.services.user_cache import get_user_cache
+
+
+class _CountingStore(InMemoryFirestoreService):
+    """Memory store that counts the loads reaching it through the cache."""
+
+    loads = 0
+
+    def _load_users(self):
+        self.loads += 1
+        return super()._load_users()
+
+    def _load_user(self, user_id):
+        self.loads += 1
+        return super()._load_user(user_id)
+
+
+def _store() -> _CountingStore:
+    get_user_cache().invalidate()
+    store = _CountingStore()
+    store.upsert_user("u1", {"id": "u1", "name": "Ada", "capacity_hours": 40.0})
+    return store
+
+
+def test_repeat_reads_are_served_from_cache():
+    store = _store()
+    store.list_users()
+    store.get_user("u1")
+    loads = store.loads
+    assert store.list_users()[0]["name"] == "Ada"
+    assert store.get_user("u1")["name"] == "Ada"
+    assert store.loads == loads
+
+
+def test_profile_write_is_visible_on_next_read():
+    store = _store()
+    store.list_users()
+    store.get_user("u1")
+    store.upsert_user("u1", {"name": "Ada L."})
+    assert store.list_users()[0]["name"] == "Ada L."
+    assert store.get_user("u1")["name"] == "Ada L."
+
+
+def test_workload_counter_update_is_visible_on_next_read():
+    store = _store()
+    store.list_users()
+    store.get_user("u1")
+    store.create_task({"id": "t1", "title": "T", "status": "open", "created_at": "2024-01-01T00:00:00"})
+    store.update_task("t1", {"assigned_to": "u1", "predicted_hours": 8})
+    assert store.get_user("u1")["assigned_hours"] == 8
+    assert store.list_users()[0]["open_tasks"] == 1
+
+
+def test_load_racing_an_invalidation_is_not_cached():
+    store = _store()
+    cache = get_user_cache()
+    generation = cache.generation
+    stale = store._load_users()
+    cache.invalidate(["u1"])
+    cache.put_roster(stale, generation)
+    assert cache.roster() is None
+
+
+def test_callers_cannot_mutate_cached_entries():
+    store = _store()
+    store.list_users()[0]["name"] = "mutated by caller"
+    assert store.list_users()[0]["name"] == "Ada"
@@ -1,4 +1,4 @@
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 
 import { apiFetch } from "../api/client";
 import { useAuth } from "../context/AuthContext";
@@ -23,6 +23,8 @@ const statusBadges: Record<TaskStatus, string> = {
 const TaskDrawer: React.FC<Props> = ({ task, onClose, onTaskUpdated }) => {
   const { token } = useAuth();
   const [messages, setMessages] = useState<Message[]>([]);
+  // created_at of the newest message loaded, so polls only fetch new ones
+  const lastMessageAt = useRef<string | null>(null);
   const [chatInput, setChatInput] = useState("");
   const [summary, setSummary] = useState("");
   const [aiThinking, setAiThinking] = useState(false);
@@ -62,14 +64,22 @@ const TaskDrawer: React.FC<Props> = ({ task, onClose, onTaskUpdated }) => {
     }
     if (!token) return;
     try {
-      const data = await apiFetch<Message[]>(`/messages/${task.id}`, { token });
-      setMessages(data);
+      const since = lastMessageAt.current;
+      const query = since ? `?since=${encodeURIComponent(since)}` : "";
+      const data = await apiFetch<Message[]>(`/messages/${task.id}${query}`, { token });
+      if (data.length) lastMessageAt.current = data[data.length - 1].created_at;
+      setMessages((prev) => {
+        if (!since) return data;
+        const seen = new Set(prev.map((msg) => msg.id));
+        return [...prev, ...data.filter((msg) => !seen.has(msg.id))];
+      });
     } catch (e) {
       console.error("Failed to load messages:", e);
     }
   };
 
   useEffect(() => {
+    lastMessageAt.current = null;
     if (task.id && (token || USE_MOCK_DATA)) {
       loadMessages();
     }